@@ -3,11 +3,12 @@
 import numpy as np
 import pandas as pd
 import datetime as dt
-import base64
 # Bibliotecas de visualização
 import plotly.express as px
 import streamlit as st
 import warnings
+# Bibliotecas próprias
+from fundeb.utils.pdf_utils import publish_pdf, render_thumbnails, static_url
 # Configurações das bibliotecas
 warnings.filterwarnings('ignore')
 pd.options.display.float_format = '{:,.2f}'.format
@@ -21,21 +22,34 @@ st.logo(r'Dados\Imagens\Logo-CACS-Fundeb.png')
 
 
 # FUNÇÕES
+# O PDF é servido pelo servidor estático do Streamlit (.streamlit/config.toml:
+# server.enableStaticServing): sem base64 no HTML, com ETag/Last-Modified e
+# requisições Range, o navegador baixa só as páginas que exibe.
 def show_pdf(pdf_path, width=700, height=600):
     try:
-        # Lê o conteúdo do PDF como bytes
-        with open(pdf_path, 'rb') as file:
-            pdf_bytes = file.read()
-
-        # Codifica o PDF para base64
-        pdf = base64.b64encode(pdf_bytes).decode('utf-8')
-
-        # Exibe o PDF usando um iframe embutido
-        pdf_display = f'''<iframe src="data:application/pdf;base64,{pdf}" width="{
-            width}" height="{height}" type="application/pdf"></iframe>'''
-        st.markdown(pdf_display, unsafe_allow_html=True)
-    except:
+        published = publish_pdf(pdf_path, subdir='siope')
+    except FileNotFoundError:
         st.error('Arquivo não encontrado.')
+        return None
+    url = static_url(published)
+
+    # Miniaturas renderizadas uma única vez; loading="lazy" só as carrega
+    # quando entram na tela. O clique abre a página no visualizador.
+    thumbnails = render_thumbnails(published)
+    if thumbnails:
+        links = ''.join(
+            f'''<a href="{url}#page={page}" target="pdf-viewer"><img src="{
+                static_url(thumbnail)}" loading="lazy" width="120"
+                title="Página {page}" style="margin: 2px"></a>'''
+            for page, thumbnail in enumerate(thumbnails, start=1))
+        st.markdown(
+            f'<div style="white-space: nowrap; overflow-x: auto">{links}</div>',
+            unsafe_allow_html=True)
+
+    pdf_display = f'''<iframe name="pdf-viewer" src="{url}" width="{
+        width}" height="{height}" type="application/pdf"></iframe>'''
+    st.markdown(pdf_display, unsafe_allow_html=True)
+    return url
 
 
 # SIDEBAR
@@ -53,6 +67,8 @@ path = f'./Dados/SIOPE-RREO/{bimester} Bi/{report}.pdf'
 
 # BODY
 st.write(f'# {report}')
-show_pdf(path, width=1000)
+url = show_pdf(path, width=1000)
 # st.feedback()
-st.download_button(label='Download', data=path)
+if url:
+    # Download direto do servidor estático (não passa pelo websocket)
+    st.link_button(label='Download', url=url)
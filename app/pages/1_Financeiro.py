@@ -1,6 +1,5 @@
 # IMPORTS/CONFIGURAÇÕES
 # Bibliotecas de processamento de dados
-from Scripts.banks_utils import *
 import numpy as np
 import pandas as pd
 import datetime as dt
@@ -10,7 +9,9 @@ import plotly.express as px
 import streamlit as st
 import warnings
 # Bibliotecas próprias
-from Scripts.banks_utils import *
+from fundeb.config.settings import DATA_GOLD_DIR
+from fundeb.utils.disk_cache import disk_cache
+from fundeb.utils.gold import load_gold
 # Configurações das bibliotecas
 warnings.filterwarnings('ignore')
 pd.options.display.float_format = '{:,.2f}'.format
@@ -22,37 +23,72 @@ st.set_page_config(
     layout='wide')
 st.logo(r'Dados\Imagens\Logo-CACS-Fundeb.png')
 
+
+# Dados
+# Agregados mensais materializados ao fim do flow ELT (camada Gold): a página
+# só lê tabelas pequenas, sem recalcular nada a partir dos extratos. As
+# leituras passam pelo cache em disco compartilhado (fundeb.utils.gold).
+try:
+    balance = load_gold('saldo_mensal_uf').set_index('mes_referencia')
+    accounts = load_gold('saldo_mensal_conta')
+    chain = load_gold('cadeia_saldos_conta')
+    daily = load_gold('saldo_diario_conta')
+except FileNotFoundError as e:
+    st.error(f'{e}. Execute o flow ELT.')
+    st.stop()
+
+
+# Cache em disco (compartilhado entre páginas e workers), chaveado pelo
+# conteúdo do parquet de entrada e pelos parâmetros
+@disk_cache(sources=['path'])
+def category_summary(path, uf=None):
+    df = pd.read_parquet(path)
+    if uf:
+        df = df[df.uf == uf]
+    df = df.assign(
+        saldo=df.creditos - df.debitos,
+        mes=pd.to_datetime(df.mes_referencia).dt.strftime('%Y-%m'))
+    return df.pivot_table(
+        index='categoria', columns='mes', values='saldo', aggfunc='sum',
+        fill_value=0)
+
+
 # SIDEBAR
 with st.sidebar:
     st.selectbox(
         'Bimestre',
         options=[str(int(m/2)) for m in range(13) if m % 2 == 0 and m != 0])
-
-
-# Dados
-@st.cache_data
-def load_data(opening_balance=16545059.40, path_banks='./Dados/Originais/Extratos/Conta_corrente', path_applications='./Dados/Originais/Extratos/Rendimentos'):
-    df = banks_consolidation(
-        opening_balance=opening_balance,
-        path_banks=path_banks,
-        path_applications=path_applications,
-        year=2024)
-    return df
-
+    # UFs presentes na camada Gold
+    uf = st.selectbox('UF', options=sorted(balance.uf.unique()))
 
 # BODY
-data = load_data()
-balance = data.resample(rule='me')[['SALDO']].last()
 fig = px.bar(
     title='SALDO FINAL MENSAL',
     data_frame=balance,
-    x=balance.index-pd.DateOffset(months=1),
-    y=balance.SALDO,
+    x=balance.index,
+    y=balance.saldo_final,
+    color=balance.uf,
     text_auto='.4s',
-    hover_data={'SALDO': ":,.2f"}
+    hover_data={'saldo_final': ":,.2f"}
     # labels=['DATA', 'SALDO']
 )
 # fig.update_traces(texttemplate='R$ %{text:,.2f}', textposition='inside')
 st.plotly_chart(fig)
 st.write(balance)
-st.write(data)
+st.write('## Saldo mensal por conta')
+st.write(accounts)
+# Cadeia de saldos (saldo anterior = saldo atual do mês anterior), conferida
+# ao fim do flow (fundeb.transforms.consolidation)
+problems = chain[~chain.status.isin(['inicio', 'ok'])]
+if problems.empty:
+    st.success('Cadeia de saldos íntegra: sem meses ausentes ou quebras.')
+else:
+    st.warning(f'{len(problems)} extrato(s) com a cadeia de saldos comprometida')
+    st.write(problems)
+st.write('## Saldo diário por conta')
+daily = daily[daily.uf == uf]
+st.plotly_chart(px.line(
+    daily, x='data', y='saldo_estimado', color='conta',
+    title='SALDO DIÁRIO (SEM RENDIMENTOS)'))
+st.write('## Movimento mensal por categoria (créditos - débitos)')
+st.write(category_summary(DATA_GOLD_DIR / 'movimento_mensal_categoria.parquet', uf=uf))
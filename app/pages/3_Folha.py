@@ -0,0 +1,97 @@
+# IMPORTS/CONFIGURAÇÕES
+import warnings
+
+# Bibliotecas de processamento de dados
+import pandas as pd
+
+# Bibliotecas de visualização
+import plotly.express as px
+import streamlit as st
+
+# Bibliotecas próprias
+from fundeb.transforms.payroll import employee_history
+from fundeb.utils.gold import load_gold
+
+# Configurações das bibliotecas
+warnings.filterwarnings('ignore')
+pd.options.display.float_format = '{:,.2f}'.format
+pd.options.display.max_rows = None
+pd.options.display.max_colwidth = None
+st.set_page_config(
+    page_title="INFO FUNDEB",
+    page_icon=":material/edit:",
+    layout='wide')
+st.logo(r'Dados\Imagens\Logo-CACS-Fundeb.png')
+
+
+# Dados
+# Agregados mensais da folha materializados ao fim do flow ELT (camada Gold,
+# fundeb.transforms.payroll): a página não relê as rubricas. As leituras
+# passam pelo cache em disco compartilhado (fundeb.utils.gold).
+try:
+    by_source = load_gold('folha_mensal_fonte')
+    by_role = load_gold('folha_mensal_cargo')
+    by_school = load_gold('folha_mensal_escola')
+except FileNotFoundError as e:
+    st.error(f'{e}. Execute o flow ELT.')
+    st.stop()
+
+# SIDEBAR
+with st.sidebar:
+    uf = st.selectbox('UF', options=sorted(by_source.uf.unique()))
+    municipio = st.selectbox(
+        'Município',
+        options=sorted(by_source[by_source.uf == uf].municipio.unique()))
+    matricula = st.text_input('Matrícula')
+
+
+def select(df):
+    return df[(df.uf == uf) & (df.municipio == municipio)]
+
+
+by_source, by_role, by_school = map(select, (by_source, by_role, by_school))
+latest = by_source.competencia.max()
+
+# BODY
+st.write('## Folha de pagamento')
+current = by_source[by_source.competencia == latest]
+col1, col2, col3 = st.columns(3)
+col1.metric('Competência', pd.Timestamp(latest).strftime('%m/%Y'))
+col2.metric('Proventos', f'R$ {current.proventos.sum():,.2f}')
+col3.metric('Líquido', f'R$ {current.liquido.sum():,.2f}')
+
+fig = px.bar(
+    title='PROVENTOS MENSAIS POR FONTE DE RECURSO',
+    data_frame=by_source,
+    x='competencia',
+    y='proventos',
+    color='fonte_recurso',
+    text_auto='.4s',
+    hover_data={'proventos': ":,.2f", 'servidores': True})
+st.plotly_chart(fig)
+st.write(by_source)
+
+st.write('## Por cargo')
+fig = px.line(
+    title='SERVIDORES POR CARGO',
+    data_frame=by_role,
+    x='competencia',
+    y='servidores',
+    color='cargo')
+st.plotly_chart(fig)
+st.write(by_role[by_role.competencia == latest])
+
+st.write('## Por escola')
+st.write(
+    by_school[by_school.competencia == latest]
+    .sort_values('proventos', ascending=False))
+
+# Consulta por servidor direto nas partições da Silver (ordenadas por
+# matrícula: só os blocos do servidor são lidos)
+if matricula:
+    st.write(f'## Servidor {matricula}')
+    history = employee_history(matricula.strip())
+    if history.empty:
+        st.warning('Matrícula não encontrada na folha.')
+    else:
+        st.write(history)
@@ -0,0 +1,83 @@
+# IMPORTS/CONFIGURAÇÕES
+import warnings
+
+# Bibliotecas de processamento de dados
+import pandas as pd
+
+# Bibliotecas de visualização
+import plotly.express as px
+import streamlit as st
+
+# Bibliotecas próprias
+from fundeb.utils.gold import load_gold
+
+# Configurações das bibliotecas
+warnings.filterwarnings('ignore')
+pd.options.display.float_format = '{:,.2f}'.format
+pd.options.display.max_rows = None
+pd.options.display.max_colwidth = None
+st.set_page_config(
+    page_title="INFO FUNDEB",
+    page_icon=":material/edit:",
+    layout='wide')
+st.logo(r'Dados\Imagens\Logo-CACS-Fundeb.png')
+
+
+# Dados
+# Indicadores pré-calculados ao fim do flow ELT (fundeb.transforms.indicators):
+# a página só lê uma tabela pequena, uma linha por UF, mês e indicador,
+# pelo cache em disco compartilhado (fundeb.utils.gold).
+try:
+    indicators = load_gold('indicadores')
+except FileNotFoundError as e:
+    st.error(f'{e}. Execute o flow ELT.')
+    st.stop()
+
+# SIDEBAR
+with st.sidebar:
+    uf = st.selectbox('UF', options=sorted(indicators.uf.unique()))
+    years = sorted(indicators[indicators.uf == uf].ano.unique(), reverse=True)
+    ano = st.selectbox('Exercício', options=years)
+
+indicators = indicators[(indicators.uf == uf) & (indicators.ano == ano)]
+# Medidas acumuladas no exercício: o último mês é a apuração mais recente
+latest = indicators[indicators.mes_referencia == indicators.mes_referencia.max()]
+
+# BODY
+st.write('## Indicadores do FUNDEB')
+month = pd.Timestamp(latest.mes_referencia.max()).strftime('%m/%Y')
+st.caption(
+    f'Acumulado no exercício até {month} '
+    f"({'apuração final' if latest.final.all() else 'apuração parcial'})")
+for column, row in zip(st.columns(len(latest)), latest.itertuples(), strict=True):
+    if pd.isna(row.denominador):
+        value = f'R$ {row.valor:,.2f}' if pd.notna(row.valor) else '-'
+    else:
+        value = f'{row.valor:.1%}' if pd.notna(row.valor) else '-'
+    column.metric(row.descricao, value, help=row.formula)
+    if row.status == 'atendido':
+        column.success('Atendido')
+    elif row.status == 'nao_atendido':
+        column.error('Não atendido')
+    else:
+        column.warning('Sem dados')
+
+# Evolução dos indicadores percentuais ao longo do exercício
+ratios = indicators[indicators.denominador.notna()]
+fig = px.line(
+    title='EVOLUÇÃO NO EXERCÍCIO',
+    data_frame=ratios,
+    x='mes_referencia',
+    y='valor',
+    color='descricao',
+    markers=True)
+fig.update_yaxes(tickformat='.0%')
+for limit in ratios.limite.unique():
+    fig.add_hline(y=limit, line_dash='dot')
+st.plotly_chart(fig)
+
+# Linhagem: fórmula, tabelas de origem, versão das fontes e data do cálculo
+st.write('## Linhagem')
+st.write(indicators[[
+    'mes_referencia', 'indicador', 'numerador', 'denominador', 'valor',
+    'status', 'formula', 'fontes', 'versao_fontes', 'calculado_em']])
@@ -0,0 +1,124 @@
+"""
+Benchmark: CSVExtractor (pandas) x ArrowCSVExtractor nos extratos do BB.
+
+Uso:
+    python benchmarks/bench_csv_extractors.py [--repeat 5] [--dir <pasta>]
+
+Mede extract e extract + gravação do parquet para os dois motores com os
+mesmos parâmetros do extractors.yaml (módulo conta_corrente) e confere se os
+dois produzem os mesmos valores.
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+from fundeb.config.logger import get_logger
+from fundeb.config.settings import DATA_RAW_DIR, EXTRACTORS_CONFIG_PATH
+from fundeb.extractors.arrow_csv_extractor import ArrowCSVExtractor
+from fundeb.extractors.csv_extractor import CSVExtractor
+
+DEFAULT_DIR = DATA_RAW_DIR / "external" / "bb" / "conta_corrente" / "csv"
+
+
+def _timeit(func, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _check_equivalence(pandas_df: pd.DataFrame, arrow_df: pd.DataFrame) -> None:
+    """Garante que os dois motores extraem os mesmos valores."""
+    arrow_as_numpy = arrow_df.astype(
+        {column: pandas_df[column].dtype for column in pandas_df.columns}
+    )
+    pd.testing.assert_frame_equal(
+        pandas_df.reset_index(drop=True),
+        arrow_as_numpy.reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def _load_extractors() -> dict[str, object]:
+    """Os dois motores com os params do módulo conta_corrente"""
+    with open(EXTRACTORS_CONFIG_PATH, encoding="utf-8") as file:
+        params = yaml.safe_load(file)["conta_corrente"]["csv"]["params"]
+    return {
+        "pandas": CSVExtractor(config_params=params),
+        "arrow": ArrowCSVExtractor(config_params=params),
+    }
+
+
+def _run(extractors: dict, files: list[Path], repeat: int) -> dict:
+    """Tempos de extract e extract + gravação por motor"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, extractor in extractors.items():
+
+            def extract_all(extractor=extractor):
+                for path in files:
+                    extractor.extract(path)
+
+            def extract_and_save(extractor=extractor, name=name):
+                for path in files:
+                    extractor.stream_to_parquet(
+                        path, Path(tmpdir) / f"{name}_{path.stem}.parquet"
+                    )
+
+            results[name] = {
+                "extract": _timeit(extract_all, repeat),
+                "extract+save": _timeit(extract_and_save, repeat),
+            }
+    return results
+
+
+def _report(results: dict) -> None:
+    print(f"{'motor':<8} {'etapa':<14} {'mediana (ms)':>13} {'melhor (ms)':>12}")
+    for name, stages in results.items():
+        for stage, timings in stages.items():
+            print(
+                f"{name:<8} {stage:<14} {statistics.median(timings) * 1000:>13.1f} "
+                f"{min(timings) * 1000:>12.1f}"
+            )
+    for stage in ("extract", "extract+save"):
+        speedup = statistics.median(results["pandas"][stage]) / statistics.median(
+            results["arrow"][stage]
+        )
+        print(f"\nSpeedup arrow/pandas ({stage}): {speedup:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dir", type=Path, default=DEFAULT_DIR)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # get_logger() aplica a configuração do logging (preguiçosa): o nível
+    # só pode ser ajustado depois dela
+    get_logger().setLevel(logging.WARNING)
+    extractors = _load_extractors()
+
+    files = sorted(args.dir.glob("*.csv"))
+    if not files:
+        raise SystemExit(f"Nenhum CSV encontrado em {args.dir}")
+    total_mb = sum(path.stat().st_size for path in files) / (1024 * 1024)
+    print(f"{len(files)} arquivos, {total_mb:.2f} MB, {args.repeat} repetições\n")
+
+    for path in files:
+        _check_equivalence(
+            extractors["pandas"].extract(path), extractors["arrow"].extract(path)
+        )
+    _report(_run(extractors, files, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
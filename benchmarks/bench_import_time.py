@@ -0,0 +1,120 @@
+"""
+Orçamento de tempo de importação (cold import) dos módulos do fundeb.
+
+Uso:
+    python benchmarks/bench_import_time.py [--repeat 5]
+
+Para cada módulo, importa-o num interpretador novo com `-X importtime` e
+mede o tempo cumulativo do próprio módulo e a soma do tempo "self" dos
+módulos fundeb.* (o código do projeto, sem pandas/pyarrow). Também confere
+que a importação não tem efeitos colaterais: nenhum handler de logging
+configurado e nenhum diretório de dados criado.
+
+Sai com código 1 se algum orçamento for excedido, para uso em CI.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# Bytecode num diretório próprio (e gravado mesmo com PYTHONDONTWRITEBYTECODE):
+# a partir da 2ª execução mede-se a importação, não a compilação dos fontes
+PYCACHE_DIR = Path(tempfile.gettempdir()) / "fundeb_bench_import_time"
+
+# Orçamentos em milissegundos (melhor de N execuções)
+# "total": tempo cumulativo do módulo (inclui dependências de terceiros)
+# "own": soma do tempo "self" apenas dos módulos fundeb.*
+BUDGETS_MS = {
+    "fundeb.config.settings": {"total": 25, "own": 10},
+    "fundeb.config.logger": {"total": 60, "own": 15},
+    "fundeb.factory.factory": {"total": 1500, "own": 40},
+}
+
+# Executado no interpretador novo: importa o módulo e verifica efeitos colaterais
+PROBE = """
+import json, logging, sys
+from pathlib import Path
+root = Path(sys.argv[2])
+data_dirs = [root / "data" / name for name in ("bronze", "silver", "gold", "logs")]
+before = [d.exists() for d in data_dirs]
+__import__(sys.argv[1])  # import_module não passa pelo -X importtime
+print(json.dumps({
+    "handlers": len(logging.getLogger().handlers),
+    "created_dirs": [str(d) for d, b in zip(data_dirs, before) if not b and d.exists()],
+}))
+"""
+
+
+def measure(module: str) -> dict:
+    """Importa `module` num processo novo e devolve tempos (ms) e efeitos."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(PROJECT_ROOT / "src"),
+        "PYTHONPYCACHEPREFIX": str(PYCACHE_DIR),
+    }
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, module, str(PROJECT_ROOT)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    total_us = own_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue
+        name = name.strip()
+        if name == "fundeb" or name.startswith("fundeb."):
+            own_us += int(self_us)
+        if name == module:
+            total_us = int(cumulative_us)
+    return {
+        "total": total_us / 1000,
+        "own": own_us / 1000,
+        **json.loads(proc.stdout.strip().splitlines()[-1]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    print(
+        f"{'módulo':<26} {'total (ms)':>11} {'orç.':>6} {'fundeb (ms)':>12} {'orç.':>6}"
+    )
+    for module, budget in BUDGETS_MS.items():
+        runs = [measure(module) for _ in range(args.repeat)]
+        total = min(run["total"] for run in runs)
+        own = min(run["own"] for run in runs)
+        print(
+            f"{module:<26} {total:>11.1f} {budget['total']:>6} "
+            f"{own:>12.1f} {budget['own']:>6}"
+        )
+        if total > budget["total"]:
+            failures.append(f"{module}: total {total:.1f} ms > {budget['total']} ms")
+        if own > budget["own"]:
+            failures.append(f"{module}: fundeb.* {own:.1f} ms > {budget['own']} ms")
+        if runs[0]["handlers"]:
+            failures.append(f"{module}: configurou logging na importação")
+        if runs[0]["created_dirs"]:
+            failures.append(f"{module}: criou diretórios {runs[0]['created_dirs']}")
+
+    if failures:
+        print("\nREGRESSÃO:\n  " + "\n  ".join(failures))
+        raise SystemExit(1)
+    print("\nDentro do orçamento.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Benchmark de ingestão ponta a ponta sobre dados sintéticos (ver
+synthetic_data.py), em escalas 1x, 10x, 100x e 1000x a amostra do repo.
+
+Uso:
+    python benchmarks/bench_ingestion.py [--scales 1 10 100] [--output r.json]
+    python benchmarks/bench_ingestion.py --compare antes.json depois.json
+
+Cada etapa roda num processo novo (spawn), para que o pico de memória (RSS)
+seja só dela. Para cada escala e etapa, são medidos:
+- o tempo da etapa e o tempo total do processo (wall);
+- as linhas e os MB processados, com a vazão em linhas/s e MB/s;
+- o pico de RSS e o quanto ele cresceu depois dos imports.
+
+Etapas:
+- bb.*: CSVExtractor.extract, add_metadata, save e stream_to_parquet, um
+  arquivo por vez;
+- bb.extract_many: extração em lote;
+- warehouse.*: carga no DuckDB e modelos Silver/Gold;
+- fnde.*: as mesmas etapas por arquivo, para as transferências;
+- folha.stream_to_parquet: leitura em blocos das folhas de pagamento;
+- flow.batch: descoberta, lote, carga e modelos, como o flow com
+  executor="batch".
+
+O resultado vai para um JSON (commit, máquina, escalas e medições), e
+--compare mostra a razão de tempo entre dois JSONs, etapa a etapa.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+
+from synthetic_data import generate
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+DEFAULT_SCALES = [1, 10, 100, 1000]
+
+
+def _rss_mb() -> float:
+    """Pico de RSS do processo até agora (ru_maxrss: KB no Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _size(paths: list[Path]) -> int:
+    return sum(path.stat().st_size for path in paths)
+
+
+def _per_file(module: str, files: list[Path], work_dir: Path, stage: str) -> dict:
+    """Etapas de um extrator, arquivo a arquivo (só a etapa é cronometrada)"""
+    from fundeb.factory.factory import get_extraction_factory
+
+    extractor = get_extraction_factory().get_extractor(module, "csv")
+    out_dir = work_dir / f"{module}_{stage}"
+    seconds, rows = 0.0, 0
+    for path in files:
+        if stage == "stream_to_parquet":
+            start = time.perf_counter()
+            rows += extractor.stream_to_parquet(path, out_dir / f"{path.stem}.parquet")
+            seconds += time.perf_counter() - start
+            continue
+
+        start = time.perf_counter()
+        df = extractor.extract(path)
+        if stage == "extract":
+            seconds += time.perf_counter() - start
+        rows += len(df)
+        start = time.perf_counter()
+        df = extractor.add_metadata(path, df)
+        if stage == "add_metadata":
+            seconds += time.perf_counter() - start
+        if stage == "save":
+            start = time.perf_counter()
+            extractor.save(df, path, out_dir)
+            seconds += time.perf_counter() - start
+    shutil.rmtree(out_dir, ignore_errors=True)
+    return {"seconds": seconds, "rows": rows, "bytes": _size(files)}
+
+
+def _extract_many(files: list[Path], work_dir: Path) -> dict:
+    from fundeb.factory.factory import get_extraction_factory
+
+    start = time.perf_counter()
+    results = get_extraction_factory().extract_many(
+        "conta_corrente", files, work_dir / "bronze"
+    )
+    seconds = time.perf_counter() - start
+    (work_dir / "extract_many.json").write_text(json.dumps(results, default=str))
+    return {
+        "seconds": seconds,
+        "rows": sum(result.get("rows", 0) for result in results),
+        "bytes": _size(files),
+    }
+
+
+def _load(work_dir: Path) -> dict:
+    from fundeb.loaders.duckdb_loader import DuckDBLoader
+
+    results = json.loads((work_dir / "extract_many.json").read_text())
+    parquets = list((work_dir / "bronze").rglob("*.parquet"))
+    start = time.perf_counter()
+    loaded = DuckDBLoader(work_dir / "warehouse.db", work_dir / "silver").load_results(
+        results
+    )
+    return {
+        "seconds": time.perf_counter() - start,
+        "rows": sum(loaded.values()),
+        "bytes": _size(parquets),
+    }
+
+
+def _transform(work_dir: Path) -> dict:
+    from fundeb.transforms.models import run_models
+
+    start = time.perf_counter()
+    results = run_models(work_dir / "warehouse.db", work_dir / "gold", True)
+    return {
+        "seconds": time.perf_counter() - start,
+        "rows": sum(result.rows or 0 for result in results),
+        "bytes": (work_dir / "warehouse.db").stat().st_size,
+    }
+
+
+def _flow(raw_dir: Path, work_dir: Path) -> dict:
+    """Mesmo caminho do flow com executor='batch' (sem o Prefect)"""
+    from fundeb.factory.factory import get_extraction_factory
+    from fundeb.loaders.duckdb_loader import DuckDBLoader
+    from fundeb.transforms.models import run_models
+    from fundeb.utils.file_discovery import DiscoveryIndex
+
+    flow_dir = work_dir / "flow"
+    start = time.perf_counter()
+    by_module: dict[str, list[Path]] = {}
+    for module, path in DiscoveryIndex(raw_dir).discover():
+        by_module.setdefault(module, []).append(path)
+    results = []
+    for module, paths in by_module.items():
+        results.extend(
+            get_extraction_factory().extract_many(module, paths, flow_dir / "bronze")
+        )
+    DuckDBLoader(flow_dir / "warehouse.db", flow_dir / "silver").load_results(results)
+    run_models(flow_dir / "warehouse.db", flow_dir / "gold")
+    seconds = time.perf_counter() - start
+    files = [path for paths in by_module.values() for path in paths]
+    shutil.rmtree(flow_dir, ignore_errors=True)
+    return {
+        "seconds": seconds,
+        "rows": sum(result.get("rows", 0) for result in results),
+        "bytes": _size(files),
+    }
+
+
+def run_stage(stage: str, raw_dir: str, work_dir: str) -> dict:
+    """Executa uma etapa (no processo filho) e mede tempo, vazão e memória"""
+    wall_start = time.perf_counter()
+    from fundeb.config.logger import get_logger
+
+    get_logger().setLevel(logging.WARNING)
+    raw_dir, work_dir = Path(raw_dir), Path(work_dir)
+    bb_files = sorted((raw_dir / "external" / "bb").rglob("*.csv"))
+    fnde_files = sorted((raw_dir / "external" / "fnde").rglob("*.csv"))
+    payroll_files = sorted((raw_dir / "external" / "prefeitura").rglob("*.csv"))
+    rss_before = _rss_mb()
+
+    group, _, name = stage.partition(".")
+    if group in ("bb", "fnde", "folha") and name != "extract_many":
+        if group == "bb":
+            measured = _per_file("conta_corrente", bb_files, work_dir, name)
+        elif group == "folha":
+            measured = _per_file("folha", payroll_files, work_dir, name)
+        else:
+            measured = _per_file("fnde_repasses", fnde_files, work_dir, name)
+    elif stage == "bb.extract_many":
+        measured = _extract_many(bb_files, work_dir)
+    elif stage == "warehouse.load":
+        measured = _load(work_dir)
+    elif stage == "warehouse.transform":
+        measured = _transform(work_dir)
+    else:
+        measured = _flow(raw_dir, work_dir)
+
+    seconds = measured["seconds"]
+    return {
+        "stage": stage,
+        **measured,
+        "rows_per_s": measured["rows"] / seconds if seconds else None,
+        "mb_per_s": measured["bytes"] / (1024 * 1024) / seconds if seconds else None,
+        "wall_seconds": time.perf_counter() - wall_start,
+        "peak_rss_mb": _rss_mb(),
+        "peak_rss_delta_mb": _rss_mb() - rss_before,
+    }
+
+
+STAGES = [
+    "bb.extract",
+    "bb.add_metadata",
+    "bb.save",
+    "bb.stream_to_parquet",
+    "bb.extract_many",
+    "warehouse.load",
+    "warehouse.transform",
+    "fnde.extract",
+    "fnde.add_metadata",
+    "fnde.save",
+    "folha.stream_to_parquet",
+    "flow.batch",
+]
+
+
+def run_scale(scale: int, stages: list[str], seed: int) -> list[dict]:
+    """Gera os dados de uma escala e executa as etapas, um processo por etapa"""
+    with tempfile.TemporaryDirectory(prefix=f"fundeb_bench_{scale}x_") as tmp:
+        raw_dir, work_dir = Path(tmp) / "raw", Path(tmp) / "work"
+        work_dir.mkdir()
+        start = time.perf_counter()
+        files = generate(raw_dir, scale, seed)
+        generated = time.perf_counter() - start
+        n_files = sum(len(paths) for paths in files.values())
+        print(f"\n{scale}x: {n_files} arquivos gerados em {generated:.1f}s")
+
+        measurements = []
+        for stage in stages:
+            # Um processo novo por etapa: o pico de RSS é só da etapa
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                result = pool.submit(run_stage, stage, str(raw_dir), str(work_dir))
+                measurement = {"scale": scale, **result.result()}
+            measurements.append(measurement)
+            print(
+                f"  {stage:<22} {measurement['seconds']:9.3f}s "
+                f"{measurement['rows']:>10} linhas "
+                f"{measurement['rows_per_s'] or 0:>12,.0f} linhas/s "
+                f"{measurement['mb_per_s'] or 0:>8.2f} MB/s "
+                f"{measurement['peak_rss_mb']:>8.1f} MB RSS"
+            )
+    return measurements
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path: Path, after_path: Path) -> None:
+    """Razão de tempo (depois / antes) por escala e etapa"""
+    before, after = (json.loads(path.read_text()) for path in (before_path, after_path))
+    timings = {(m["scale"], m["stage"]): m["seconds"] for m in before["results"]}
+    print(f"{before['commit']} -> {after['commit']} (razão < 1 = mais rápido)")
+    for measurement in after["results"]:
+        key = (measurement["scale"], measurement["stage"])
+        if timings.get(key):
+            ratio = measurement["seconds"] / timings[key]
+            print(f"  {key[0]:>5}x {key[1]:<22} {ratio:6.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="JSON de saída")
+    parser.add_argument("--compare", type=Path, nargs=2, metavar=("ANTES", "DEPOIS"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scales": args.scales,
+        "results": [],
+    }
+    for scale in args.scales:
+        report["results"].extend(run_scale(scale, args.stages, args.seed))
+
+    output = args.output or RESULTS_DIR / (
+        f"ingestion_{commit or 'local'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResultados gravados em {output}")
+
+
+if __name__ == "__main__":
+    main()
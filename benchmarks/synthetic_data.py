@@ -0,0 +1,452 @@
+"""
+Gerador de dados sintéticos para os benchmarks de ingestão.
+
+Produz, numa árvore igual à de data/raw, extratos de conta corrente do
+Banco do Brasil e transferências por decêndio do FNDE com as mesmas colunas,
+codificação (latin1) e formatos (números "1.473.123,32", datas dd/mm/aaaa,
+valores "-R$912.717,48") dos arquivos de exemplo. A escala 1 tem o tamanho
+da amostra do repositório: 10 extratos mensais (~68 lançamentos cada) e uma
+tabela de 848 transferências; a escala N tem N vezes mais extratos (contas)
+e linhas de transferência.
+
+As folhas de pagamento (sem amostra no repositório) seguem o layout de
+extractors/payroll_extractor.py: na escala 1, a rede de um município com
+200 servidores em MONTHS competências; a escala N tem N municípios.
+
+Os extratos passam no schema do extractors.yaml: os lançamentos ficam
+dentro do período, e a aplicação automática zera o saldo da conta corrente
+ao fim de cada dia. Assim, saldo anterior + lançamentos = saldo atual.
+
+Uso:
+    python benchmarks/synthetic_data.py <pasta> [--scale 10] [--seed 42]
+"""
+
+import argparse
+import calendar
+from pathlib import Path
+
+import numpy as np
+
+# Tamanho da amostra do repositório (escala 1)
+BASE_STATEMENTS = 10
+BASE_TRANSFER_ROWS = 848
+BASE_PAYROLLS = 1  # Redes municipais (uma folha por competência)
+EMPLOYEES = 200  # Servidores por rede
+SCHOOLS = 20  # Escolas por rede
+MONTHS = 10  # Extratos de janeiro a outubro, como na amostra
+YEAR = 2025
+
+BB_COLUMNS = [
+    "BANCO",
+    "AGENCIA",
+    "CONTA",
+    "ENDERECO_AGENCIA",
+    "DT_ABERTURA",
+    "NOME_TITURAL",
+    "CNPJ_TITURAL",
+    "UF",
+    "MUNICIPIO",
+    "NOME_RESPONSAVEL_LEGAL",
+    "CPF_RESPONSAVEL_LEGAL",
+    "DATA_INICIO",
+    "DATA_FIM",
+    "SALDO_ANTERIOR_CC",
+    "SALDO_ANTERIOR_APLICACAO",
+    "SALDO_ANTERIOR_TOTAL",
+    "DT_LANCAMENTO",
+    "NOME_DESTINATARIO_DEPOSITANTE",
+    "CPF_CNPJ",
+    "HISTORICO_FINALIDADE",
+    "VALOR",
+    "D_C",
+    "SALDO_ATUAL_CC",
+    "SALDO_ATUAL_APLICACAO",
+    "SALDO_ATUAL_TOTAL",
+]
+
+# Históricos da amostra, com a frequência observada
+CREDITS = {
+    "FPE/FPM": 120,
+    "IPI/EXPORTACAO": 60,
+    "RECEBIMENTODEICMS": 44,
+    "IPVA-PROPRIEDVEICULOSAUTOMOT": 43,
+    "ITCMD-TRANSMCAUSAMORTISDOAC": 32,
+    "ITR-IMPOSTOTERRITORIALRURAL": 30,
+    "ORDEMBANCCANCELADA": 9,
+    "COTADAF-CREDITO": 3,
+}
+DEBITS = {
+    "FOLHADEPAGAMENTO": 79,
+    "EMISSA ODEORDEMBANCA RIA": 47,
+    "COTADAF-DEBITO": 31,
+    "TARIFASSERVIC OSDIVERSOS": 30,
+    "PROVISA O": 15,
+    "PAGTOVIAAUTO-ATENDIMENTOBB": 12,
+    "TEDTRANSF.ELETR.DISPONIVEL": 10,
+    "IMPOSTOS": 6,
+}
+APPLICATION = "BB-APLICC.PRZ-APL.AUT"  # Sobra do dia vai para a aplicação
+REDEMPTION = "RESGATEAUTOMA TICO"  # Falta do dia sai da aplicação
+
+# UF -> (região, capital)
+UFS = {
+    "AC": ("Norte", "RIO BRANCO"),
+    "AL": ("Nordeste", "MACEIO"),
+    "AM": ("Norte", "MANAUS"),
+    "AP": ("Norte", "MACAPA"),
+    "BA": ("Nordeste", "SALVADOR"),
+    "CE": ("Nordeste", "FORTALEZA"),
+    "DF": ("Centro-Oeste", "BRASILIA"),
+    "ES": ("Sudeste", "VITORIA"),
+    "GO": ("Centro-Oeste", "GOIANIA"),
+    "MA": ("Nordeste", "SAO LUIS"),
+    "MG": ("Sudeste", "BELO HORIZONTE"),
+    "MS": ("Centro-Oeste", "CAMPO GRANDE"),
+    "MT": ("Centro-Oeste", "CUIABA"),
+    "PA": ("Norte", "BELEM"),
+    "PB": ("Nordeste", "JOAO PESSOA"),
+    "PE": ("Nordeste", "RECIFE"),
+    "PI": ("Nordeste", "TERESINA"),
+    "PR": ("Sul", "CURITIBA"),
+    "RJ": ("Sudeste", "RIO DE JANEIRO"),
+    "RN": ("Nordeste", "NATAL"),
+    "RO": ("Norte", "PORTO VELHO"),
+    "RR": ("Norte", "BOA VISTA"),
+    "RS": ("Sul", "PORTO ALEGRE"),
+    "SC": ("Sul", "FLORIANOPOLIS"),
+    "SE": ("Nordeste", "ARACAJU"),
+    "SP": ("Sudeste", "SAO PAULO"),
+    "TO": ("Norte", "PALMAS"),
+}
+
+TRANSFERS = [
+    "AJUSTE FUNDEB/AJUSTE FUNDEB VAAF",
+    "AJUSTE FUNDEB/AJUSTE FUNDEB VAAR",
+    "AJUSTE FUNDEB/COUN",
+    "AJUSTE FUNDEB/FPE",
+    "AJUSTE FUNDEB/FPM",
+    "AJUSTE FUNDEB/ICME",
+    "AJUSTE FUNDEB/IPIE",
+    "AJUSTE FUNDEB/IPVA",
+    "AJUSTE FUNDEB/ITCMD",
+    "AJUSTE FUNDEB/ITR",
+]
+
+PAYROLL_COLUMNS = [
+    "COMPETENCIA",
+    "UF",
+    "MUNICIPIO",
+    "MATRICULA",
+    "CPF",
+    "NOME",
+    "CARGO",
+    "VINCULO",
+    "ESCOLA",
+    "NOME_ESCOLA",
+    "FONTE_RECURSO",
+    "RUBRICA",
+    "DESCRICAO_RUBRICA",
+    "TIPO",
+    "VALOR",
+]
+
+# Cargo -> (peso na rede, vencimento base, fonte de recurso)
+ROLES = {
+    "PROFESSOR": (60, 4580.57, "FUNDEB 70%"),
+    "PEDAGOGO": (5, 5200.00, "FUNDEB 70%"),
+    "DIRETOR ESCOLAR": (5, 6100.00, "FUNDEB 70%"),
+    "MERENDEIRA": (12, 1518.00, "FUNDEB 30%"),
+    "AUXILIAR ADMINISTRATIVO": (10, 1850.00, "FUNDEB 30%"),
+    "VIGIA": (8, 1518.00, "MDE"),
+}
+BONDS = {"EFETIVO": 80, "CONTRATADO": 20}
+SCHOOL_TYPES = ["EMEF", "EMEI", "CMEI"]
+
+# Faixas dos blocos do CNPJ sintético (00.000.000/0001-00)
+CNPJ_PARTS = [(10, 99), (100, 999), (100, 999)]
+
+_TO_BRAZILIAN = str.maketrans(",.", ".,")
+
+
+def brl(value: float) -> str:
+    """1473123.32 -> '1.473.123,32'"""
+    return f"{value:,.2f}".translate(_TO_BRAZILIAN)
+
+
+def currency(value: float) -> str:
+    """-912717.48 -> '-R$912.717,48'"""
+    return f"{'-' if value < 0 else ''}R${brl(abs(value))}"
+
+
+def _choice(rng: np.random.Generator, weights: dict[str, int], size: int) -> list:
+    probabilities = np.array(list(weights.values()), dtype=float)
+    return list(rng.choice(list(weights), size, p=probabilities / probabilities.sum()))
+
+
+def _statement_entries(
+    rng: np.random.Generator, month: int
+) -> tuple[list[tuple[int, str, float, str]], float]:
+    """
+    Lançamentos de um extrato mensal: (dia, histórico, valor, D/C), com a
+    aplicação/resgate automático que zera a conta corrente a cada dia
+    Returns:
+        tuple: (lançamentos, saldo líquido aplicado no mês)
+    """
+    last_day = calendar.monthrange(YEAR, month)[1]
+    entries = []
+    applied = 0.0
+    n_movements = int(rng.integers(40, 70))
+    days = np.sort(rng.integers(1, last_day + 1, n_movements))
+    is_credit = rng.random(n_movements) < 0.55
+    values = np.round(rng.lognormal(11, 1.6, n_movements), 2) + 0.01
+    credits = iter(_choice(rng, CREDITS, n_movements))
+    debits = iter(_choice(rng, DEBITS, n_movements))
+
+    for day in np.unique(days):
+        net = 0.0
+        for index in np.flatnonzero(days == day):
+            value = float(values[index])
+            if is_credit[index]:
+                entries.append((int(day), next(credits), value, "C"))
+                net += value
+            else:
+                entries.append((int(day), next(debits), value, "D"))
+                net -= value
+        net = round(net, 2)
+        if net > 0:
+            entries.append((int(day), APPLICATION, net, "D"))
+        elif net < 0:
+            entries.append((int(day), REDEMPTION, -net, "C"))
+        applied += net
+    return entries, round(applied, 2)
+
+
+def write_bb_statements(raw_dir: Path, n_statements: int, seed: int = 42) -> list[Path]:
+    """
+    Grava extratos sintéticos de conta corrente do BB (um CSV por mês e
+    conta) em raw_dir/external/bb/conta_corrente/csv/
+    Args:
+        raw_dir (Path): Raiz dos arquivos brutos
+        n_statements (int): Número de extratos (contas x MONTHS)
+        seed (int): Semente do gerador
+    Returns:
+        list[Path]: Arquivos gravados
+    """
+    rng = np.random.default_rng(seed)
+    out_dir = raw_dir / "external" / "bb" / "conta_corrente" / "csv"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    header = ";".join(BB_COLUMNS) + "\n"
+    ufs = list(UFS)
+    paths = []
+
+    n_accounts = -(-n_statements // MONTHS)
+    for account in range(n_accounts):
+        uf = "AP" if account == 0 else ufs[account % len(ufs)]
+        capital = UFS[uf][1]
+        # Uma conta do FUNDEB por município (o nome do arquivo não se repete)
+        municipality = capital if account < len(ufs) else f"{capital}{account}"
+        agencia = f"{rng.integers(1000, 9999)}"
+        conta = f"{rng.integers(10000, 99999)}"
+        cnpj = ".".join(str(rng.integers(low, high)) for low, high in CNPJ_PARTS)
+        fixed = [
+            "001",
+            agencia,
+            conta,
+            f"PRAÇA DA INDEPENDÊNCIA, {rng.integers(1, 2000)}       , "
+            f"{municipality:<22}, {uf}",
+            f"{rng.integers(1, 28):02d}/{rng.integers(1, 12):02d}/2018",
+            "SEEDFEB",
+            f"{cnpj}/0001-{rng.integers(10, 99)}",
+            uf,
+            municipality,
+            "JOSÉCONCEIÇÃOSANTOS",
+            f"XXX.{rng.integers(100, 999)}.XXX-{rng.integers(10, 99)}",
+        ]
+        application = round(float(rng.lognormal(16, 1)), 2)
+
+        for month in range(1, MONTHS + 1):
+            if len(paths) == n_statements:
+                break
+            entries, applied = _statement_entries(rng, month)
+            last_day = calendar.monthrange(YEAR, month)[1]
+            income = round(application * 0.008, 2)
+            closing = round(application + applied + income, 2)
+            if closing < 0:  # resgates acima da aplicação: reforça o saldo
+                application, closing = application - closing, 0.0
+            opening_balances = ["0,00", brl(application), brl(application)]
+            closing_balances = ["0,00", brl(closing), brl(closing)]
+            period = [f"01/{month:02d}/{YEAR}", f"{last_day}/{month:02d}/{YEAR}"]
+            prefix = ";".join(fixed + period + opening_balances)
+            suffix = ";".join(closing_balances)
+
+            lines = [header]
+            for day, history, value, d_c in entries:
+                lines.append(
+                    f"{prefix};{day:02d}/{month:02d}/{YEAR};;;{history};"
+                    f"{brl(value)};{d_c};{suffix}\n"
+                )
+            name = f"EXTRATO_BANCARIO_CC_{uf}_{municipality.replace(' ', '')}"
+            path = out_dir / f"{name}_{YEAR}_{month:02d}.csv"
+            path.write_text("".join(lines), encoding="latin1")
+            paths.append(path)
+            application = closing
+    return paths
+
+
+def write_fnde_transfers(raw_dir: Path, n_rows: int, seed: int = 42) -> Path:
+    """
+    Grava uma tabela sintética de ajustes/repasses do FNDE por decêndio em
+    raw_dir/external/fnde/csv/ (Total = soma dos decêndios)
+    Args:
+        raw_dir (Path): Raiz dos arquivos brutos
+        n_rows (int): Número de linhas (UF, ano, mês, transferência)
+        seed (int): Semente do gerador
+    Returns:
+        Path: Arquivo gravado
+    """
+    rng = np.random.default_rng(seed)
+    out_dir = raw_dir / "external" / "fnde" / "csv"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ufs = list(UFS)
+
+    ufs_index = rng.integers(0, len(ufs), n_rows)
+    years = rng.integers(2020, 2026, n_rows)
+    months = rng.integers(1, 13, n_rows)
+    transfers = rng.integers(0, len(TRANSFERS), n_rows)
+    values = np.round(rng.lognormal(12, 2, n_rows), 2) * rng.choice([-1, 1], n_rows)
+    # Como na amostra: quase sempre um único decêndio com valor (82% o 3º)
+    decendios = rng.choice(3, n_rows, p=[0.11, 0.07, 0.82])
+
+    header = (
+        '"Região";"UF";"Ano";"Mês";"Transferência";'
+        '"1º Decêndio";"2º Decêndio";"3º Decêndio";"Total"\n'
+    )
+    lines = [header]
+    zero = currency(0.0)
+    for row in range(n_rows):
+        uf = ufs[ufs_index[row]]
+        value = float(values[row])
+        amounts = [zero, zero, zero]
+        amounts[decendios[row]] = currency(value)
+        fields = [
+            UFS[uf][0],
+            uf,
+            str(years[row]),
+            f"{months[row]:02d}",
+            TRANSFERS[transfers[row]],
+            *amounts,
+            currency(value),
+        ]
+        lines.append(";".join(f'"{field}"' for field in fields) + "\n")
+
+    path = out_dir / "AJUSTES_REPASSES_2025_10_30.csv"
+    path.write_text("".join(lines), encoding="latin1")
+    return path
+
+
+def write_payrolls(raw_dir: Path, n_payrolls: int, seed: int = 42) -> list[Path]:
+    """
+    Grava folhas de pagamento sintéticas (um CSV por rede e competência) em
+    raw_dir/external/prefeitura/folha/csv/
+    Args:
+        raw_dir (Path): Raiz dos arquivos brutos
+        n_payrolls (int): Número de redes municipais
+        seed (int): Semente do gerador
+    Returns:
+        list[Path]: Arquivos gravados
+    """
+    rng = np.random.default_rng(seed)
+    out_dir = raw_dir / "external" / "prefeitura" / "folha" / "csv"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    header = ";".join(PAYROLL_COLUMNS) + "\n"
+    ufs = list(UFS)
+    paths = []
+
+    for network in range(n_payrolls):
+        uf = "AP" if network == 0 else ufs[network % len(ufs)]
+        capital = UFS[uf][1]
+        municipality = capital if network < len(ufs) else f"{capital}{network}"
+        schools = [
+            (
+                f"{rng.integers(10_000_000, 99_999_999)}",
+                f"{SCHOOL_TYPES[school % 3]} {municipality} {school + 1:02d}",
+            )
+            for school in range(SCHOOLS)
+        ]
+        roles = _choice(rng, {role: spec[0] for role, spec in ROLES.items()}, EMPLOYEES)
+        bonds = _choice(rng, BONDS, EMPLOYEES)
+        employees = [
+            (
+                f"{network:04d}{employee:05d}",
+                f"XXX.{rng.integers(100, 999)}.XXX-{rng.integers(10, 99)}",
+                f"SERVIDOR {network}-{employee}",
+                roles[employee],
+                bonds[employee],
+                *schools[rng.integers(0, SCHOOLS)],
+                float(rng.uniform(0, 0.35)),  # adicional por tempo de serviço
+            )
+            for employee in range(EMPLOYEES)
+        ]
+
+        for month in range(1, MONTHS + 1):
+            prefix_month = f"{month:02d}/{YEAR};{uf};{municipality}"
+            lines = [header]
+            for matricula, cpf, nome, cargo, vinculo, inep, escola, ats in employees:
+                base, fonte = ROLES[cargo][1], ROLES[cargo][2]
+                prefix = (
+                    f"{prefix_month};{matricula};{cpf};{nome};{cargo};{vinculo};"
+                    f"{inep};{escola};{fonte}"
+                )
+                items = [("001", "VENCIMENTO BASE", "P", base)]
+                if cargo == "PROFESSOR":
+                    items.append(("010", "GRATIFICACAO DE REGENCIA", "P", base * 0.2))
+                if vinculo == "EFETIVO":
+                    items.append(("020", "ADICIONAL TEMPO SERVICO", "P", base * ats))
+                gross = sum(item[3] for item in items)
+                items.append(("500", "PREVIDENCIA", "D", gross * 0.14))
+                if gross > 2259.20:
+                    items.append(("510", "IRRF", "D", (gross - 2259.20) * 0.15))
+                for code, description, kind, value in items:
+                    lines.append(f"{prefix};{code};{description};{kind};{brl(value)}\n")
+            name = f"FOLHA_{uf}_{municipality.replace(' ', '')}"
+            path = out_dir / f"{name}_{YEAR}_{month:02d}.csv"
+            path.write_text("".join(lines), encoding="latin1")
+            paths.append(path)
+    return paths
+
+
+def generate(raw_dir: Path, scale: int, seed: int = 42) -> dict[str, list[Path]]:
+    """
+    Gera a amostra sintética numa escala (1 = tamanho da amostra do repo)
+    Args:
+        raw_dir (Path): Raiz dos arquivos brutos
+        scale (int): Multiplicador do tamanho da amostra
+        seed (int): Semente do gerador
+    Returns:
+        dict[str, list[Path]]: Arquivos por módulo (conta_corrente,
+            fnde_repasses, folha)
+    """
+    return {
+        "conta_corrente": write_bb_statements(raw_dir, BASE_STATEMENTS * scale, seed),
+        "fnde_repasses": [
+            write_fnde_transfers(raw_dir, BASE_TRANSFER_ROWS * scale, seed)
+        ],
+        "folha": write_payrolls(raw_dir, BASE_PAYROLLS * scale, seed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("raw_dir", type=Path, help="Pasta de saída (raiz raw)")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    files = generate(args.raw_dir, args.scale, args.seed)
+    for module, paths in files.items():
+        size_mb = sum(path.stat().st_size for path in paths) / (1024 * 1024)
+        print(f"{module}: {len(paths)} arquivo(s), {size_mb:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
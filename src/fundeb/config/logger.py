@@ -0,0 +1,82 @@
+"""
+Configuração de logging do projeto, aplicada uma única vez por processo.
+
+O logging.yaml é lido e aplicado (logging.config.dictConfig) na primeira
+chamada de setup_logging()/get_logger(), e não na importação dos módulos.
+Assim o RotatingFileHandler é aberto uma só vez e importar o pacote continua
+barato para workers, testes e reruns do Streamlit.
+"""
+
+import json
+import logging
+import logging.config
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from fundeb.config.settings import LOGGING_CONFIG_PATH, LOGS_PROJECT_DIR
+
+DEFAULT_LOGGER_NAME = "my_module"
+
+_lock = threading.Lock()
+_configured = False
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Uma linha JSON por registro: horário, nível, logger, mensagem e os
+    campos passados em extra={"metrics": {...}} (ver utils/metrics.py).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+            **getattr(record, "metrics", {}),
+        }
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging() -> None:
+    """
+    Aplica o logging.yaml na primeira chamada; as seguintes não fazem nada.
+    Caminhos relativos dos handlers de arquivo são resolvidos a partir de
+    LOGS_PROJECT_DIR (e não do diretório de trabalho atual).
+    """
+    global _configured
+    if _configured:
+        return
+    with _lock:
+        if _configured:
+            return
+        import yaml
+
+        with open(LOGGING_CONFIG_PATH, encoding="utf-8") as file:
+            logging_config = yaml.safe_load(file)
+
+        for handler in logging_config.get("handlers", {}).values():
+            if "filename" in handler:
+                filename = Path(handler["filename"])
+                if not filename.is_absolute():
+                    filename = LOGS_PROJECT_DIR / filename
+                filename.parent.mkdir(parents=True, exist_ok=True)
+                handler["filename"] = str(filename)
+
+        logging.config.dictConfig(logging_config)
+        _configured = True
+
+
+def get_logger(name: str = DEFAULT_LOGGER_NAME) -> logging.Logger:
+    """
+    Retorna um logger com a configuração do projeto já aplicada
+    Args:
+        name (str): Nome do logger (padrão: o logger 'my_module' do logging.yaml)
+    Returns:
+        logging.Logger: Logger configurado
+    """
+    setup_logging()
+    return logging.getLogger(name)
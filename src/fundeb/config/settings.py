@@ -1,8 +1,8 @@
+import threading
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Carrega variáveis de um ficheiro .env na raiz do projeto (se existir)
-load_dotenv()
+# Importar este módulo NÃO tem efeitos colaterais (nem .env, nem diretórios).
+# Pontos de entrada (flows, CLIs, app) chamam init() uma vez por processo.
 
 # --- 1. Caminhos Principais (Core Paths) ---
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
@@ -15,6 +15,9 @@ DATA_LAKE_DIR = PROJECT_ROOT / "data"
 # Onde os ficheiros originais (CSV, PDF) são colocados para ingestão
 DATA_RAW_DIR = DATA_LAKE_DIR / "raw"
 
+# Raiz varrida pela descoberta de ficheiros do flow (DISCOVERY_RULES)
+DATA_SOURCE_DIR = DATA_RAW_DIR
+
 # Camada BRONZE: Dados crus, imutáveis, em formato aberto (Parquet)
 DATA_BRONZE_DIR = DATA_LAKE_DIR / "bronze"
 
@@ -27,11 +30,15 @@ DATA_GOLD_DIR = DATA_LAKE_DIR / "gold"
 
 # --- 3. Caminhos de Fontes e Configurações ---
 
-# Caminho para o projeto dbt que fará as transformações
-DBT_PROJECT_DIR = PROJECT_ROOT / "dbt_transform"
-
-# Caminho para o projeto dbt que fará as transformações
+# Diretório dos logs do projeto
 LOGS_PROJECT_DIR = PROJECT_ROOT / "data" / "logs"
+# Métricas das etapas no formato textfile do node exporter (utils/metrics.py)
+METRICS_TEXTFILE_PATH = LOGS_PROJECT_DIR / "fundeb.prom"
+# Perfis dos arquivos acima de FUNDEB_PROFILE_THRESHOLD segundos
+PROFILES_DIR = LOGS_PROJECT_DIR / "profiles"
+
+# Arquivos servidos pelo Streamlit em app/static/ (server.enableStaticServing)
+APP_STATIC_DIR = PROJECT_ROOT / "app" / "static"
 
 # Caminho para o ficheiro YAML que define OS PARÂMETROS dos extratores
 # A factory.py irá importar esta variável para saber qual ficheiro ler.
@@ -46,6 +53,14 @@ LOGGING_CONFIG_PATH = PROJECT_ROOT / "src" / "fundeb" / "config" / "logging.yaml
 # É uma boa prática colocá-lo dentro do data lake
 DUCKDB_PATH = DATA_LAKE_DIR / "finance_warehouse.db"
 
+# Manifesto de ingestão incremental (arquivos já carregados na camada Bronze)
+INGESTION_MANIFEST_PATH = DATA_BRONZE_DIR / "_manifest.json"
+
+# Cache em disco dos carregadores do app (compartilhado entre workers)
+DATA_CACHE_DIR = DATA_LAKE_DIR / "cache"
+# Tamanho máximo do cache; os resultados menos usados são removidos antes
+DISK_CACHE_MAX_MB = 512
+
 
 # --- 5. Mapeamentos Estáticos do Pipeline ---
 
@@ -60,6 +75,30 @@ FILE_EXTENSION_MAP = {
     ".pdf": "pdf",
 }
 
+# Regras de descoberta: que ficheiros (padrão do nome) pertencem a que módulo
+# do extractors.yml. Usadas pelo flow e pelo modo watch (flows/watch.py).
+# Os ficheiros ficam sob uma pasta com o nome do módulo, ou sob 'folder'.
+DISCOVERY_RULES = [
+    {"module_base": "conta_corrente", "pattern": "EXTRATO_BANCARIO_CC*.csv"},
+    {
+        "module_base": "conta_investimentos",
+        "pattern": "INVEST_MES_*.csv",
+        "folder": "conta_investimento",
+    },
+    {
+        "module_base": "conta_investimentos",
+        "pattern": "EXTRATO_BANCARIO_CI*.pdf",
+        "folder": "conta_investimento",
+    },
+    {
+        "module_base": "fnde_repasses",
+        "pattern": "AJUSTES_REPASSES_*.csv",
+        "folder": "fnde",
+    },
+    {"module_base": "fnde_fundeb", "pattern": "FUNDEB_*.xls", "folder": "fnde"},
+    {"module_base": "folha", "pattern": "FOLHA_*.csv"},
+]
+
 
 # --- 6. Configurações de Ambiente (Exemplos) ---
 
@@ -70,10 +109,8 @@ FILE_EXTENSION_MAP = {
 
 
 # --- 7. Utilitário de Setup ---
-# Garante que os diretórios de dados existam quando este módulo for importado
 def _create_data_dirs():
     """Cria os diretórios da arquitetura Medallion se não existirem."""
-    print("Verificando estrutura de diretórios...")
     for path in [
         DATA_RAW_DIR,
         DATA_BRONZE_DIR,
@@ -84,8 +121,29 @@ def _create_data_dirs():
         path.mkdir(parents=True, exist_ok=True)
 
 
-# Executa a criação dos diretórios na primeira vez que settings.py é importado
-_create_data_dirs()
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def init() -> None:
+    """
+    Inicializa o ambiente do projeto exatamente uma vez por processo:
+    carrega o .env (se existir) e garante os diretórios de dados.
+    Chamadas seguintes não fazem nada.
+    """
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        # Import tardio: só paga o custo quem realmente inicializa
+        from dotenv import load_dotenv
+
+        # Carrega variáveis de um ficheiro .env na raiz do projeto (se existir)
+        load_dotenv()
+        _create_data_dirs()
+        _initialized = True
 
 
 # --- 8. Exportação de Configurações ---
@@ -97,12 +155,17 @@ class Settings:
             "BASE_DIR": PROJECT_ROOT,
             "DATA_LAKE_DIR": DATA_LAKE_DIR,
             "DATA_RAW_DIR": DATA_RAW_DIR,
+            "DATA_SOURCE_DIR": DATA_SOURCE_DIR,
             "DATA_BRONZE_DIR": DATA_BRONZE_DIR,
             "DATA_SILVER_DIR": DATA_SILVER_DIR,
             "DATA_GOLD_DIR": DATA_GOLD_DIR,
-            "DBT_PROJECT_DIR": DBT_PROJECT_DIR,
             "EXTRACTORS_CONFIG_PATH": EXTRACTORS_CONFIG_PATH,
             "DUCKDB_PATH": DUCKDB_PATH,
+            "INGESTION_MANIFEST_PATH": INGESTION_MANIFEST_PATH,
+            "DATA_CACHE_DIR": DATA_CACHE_DIR,
+            "APP_STATIC_DIR": APP_STATIC_DIR,
+            "METRICS_TEXTFILE_PATH": METRICS_TEXTFILE_PATH,
+            "PROFILES_DIR": PROFILES_DIR,
         }
         self.file_extension_map = FILE_EXTENSION_MAP
 
@@ -118,6 +181,7 @@ class Settings:
 settings = Settings()
 
 if __name__ == "__main__":
+    init()
     print("Configurações do Projeto Fundeb Analysis:")
     for key, value in settings.to_dict().items():
         print(f"{key}: {value}")
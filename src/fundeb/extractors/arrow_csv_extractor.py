@@ -0,0 +1,195 @@
+"""
+Extrator CSV baseado no leitor multithread do Apache Arrow
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+from fundeb.extractors.base_extractor import BaseExtractor
+
+# Formatos de data aceitos, conforme o 'dayfirst' dos parâmetros
+DAYFIRST_FORMATS = ["%d/%m/%Y", "%d/%m/%Y %H:%M:%S"]
+MONTHFIRST_FORMATS = ["%m/%d/%Y", "%m/%d/%Y %H:%M:%S"]
+
+
+class ArrowCSVExtractor(BaseExtractor):
+    """
+    Extrator CSV que usa o leitor multithread do Arrow.
+
+    Aceita os mesmos parâmetros (estilo pandas) do CSVExtractor no
+    extractors.yaml — sep, encoding, thousands, decimal, dtype, dayfirst,
+    parse_dates e chunksize —, de modo que trocar de motor é só mudar a
+    chave 'extractor' do módulo. Datas são convertidas pelo próprio leitor e
+    números no formato brasileiro (1.473.123,32) por operações vetorizadas.
+    Retorna DataFrames com colunas Arrow (pd.ArrowDtype), que são gravadas em
+    parquet sem conversão para NumPy.
+    """
+
+    def __init__(
+        self,
+        config_params: dict[str, Any],
+    ):
+        super().__init__()
+        self.logger.debug("Inicializando ArrowCSVExtractor...")
+        params = dict(config_params)
+
+        self.chunksize = params.pop("chunksize", None)
+        self.thousands = params.pop("thousands", None)
+        self.decimal = params.pop("decimal", ".")
+        self.string_columns = [
+            column
+            for column, dtype in (params.pop("dtype", None) or {}).items()
+            if dtype in ("str", "string", "object")
+        ]
+        self.date_columns = list(params.pop("parse_dates", None) or [])
+        dayfirst = params.pop("dayfirst", False)
+
+        self.read_options = pv.ReadOptions(
+            encoding=params.pop("encoding", "utf8"), use_threads=True
+        )
+        self.parse_options = pv.ParseOptions(delimiter=params.pop("sep", ","))
+        self.convert_options = pv.ConvertOptions(
+            # Colunas de texto e numéricas são lidas como texto; as numéricas
+            # são convertidas depois, já que o Arrow não conhece 'thousands'
+            column_types={
+                **{column: pa.string() for column in self.string_columns},
+                **{column: pa.timestamp("s") for column in self.date_columns},
+            },
+            timestamp_parsers=DAYFIRST_FORMATS if dayfirst else MONTHFIRST_FORMATS,
+            strings_can_be_null=True,
+            auto_dict_encode=False,
+        )
+        if params:
+            self.logger.warning(
+                f"Parâmetros ignorados pelo ArrowCSVExtractor: {params}"
+            )
+
+        # Padrão de número brasileiro: sinal, milhares e decimal opcionais
+        integer = (
+            rf"(\d{{1,3}}(\{self.thousands}\d{{3}})+|\d+)" if self.thousands else r"\d+"
+        )
+        self._number_pattern = rf"^-?{integer}(\{self.decimal}\d+)?$"
+        self.logger.debug("ArrowCSVExtractor inicializado.")
+
+    def _numeric_columns(self, table: pa.Table) -> list[str]:
+        """Colunas de texto cujos valores (não nulos) são todos números"""
+        numeric = []
+        for field in table.schema:
+            if field.name in self.string_columns or field.name in self.date_columns:
+                continue
+            if not pa.types.is_string(field.type) and not pa.types.is_large_string(
+                field.type
+            ):
+                continue
+            valid = table.column(field.name).drop_null()
+            if (
+                len(valid) > 0
+                and pc.all(
+                    pc.match_substring_regex(valid, self._number_pattern)
+                ).as_py()
+            ):
+                numeric.append(field.name)
+        return numeric
+
+    def _convert_numbers(
+        self, table: pa.Table, numeric_columns: list[str] | None = None
+    ) -> pa.Table:
+        """
+        Converte, de forma vetorizada, as colunas numéricas de texto
+        Args:
+            table (pa.Table): Tabela lida do CSV
+            numeric_columns (list[str] | None): Colunas a converter (se None,
+                detectadas na própria tabela)
+        Returns:
+            pa.Table: Tabela com as colunas numéricas em float64
+        """
+        if numeric_columns is None:
+            numeric_columns = self._numeric_columns(table)
+        for name in numeric_columns:
+            index = table.schema.get_field_index(name)
+            column = table.column(index)
+            if self.thousands:
+                column = pc.replace_substring(column, self.thousands, "")
+            if self.decimal != ".":
+                column = pc.replace_substring(column, self.decimal, ".")
+            table = table.set_column(index, name, pc.cast(column, pa.float64()))
+        return table
+
+    def _to_pandas(self, table: pa.Table) -> pd.DataFrame:
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def extract_table(self, file_path: str | Path) -> pa.Table:
+        """Extrai o CSV inteiro como tabela Arrow"""
+        table = pv.read_csv(
+            file_path,
+            read_options=self.read_options,
+            parse_options=self.parse_options,
+            convert_options=self.convert_options,
+        )
+        return self._convert_numbers(table)
+
+    def extract(self, file_path) -> pd.DataFrame:
+        """Extrai dados do CSV"""
+        self.logger.info(f"Iniciando extração (Arrow): {file_path}...")
+
+        try:
+            df = self._to_pandas(self.extract_table(file_path))
+
+            self.logger.info(
+                f"Arquivo extraído com sucesso! "
+                f"{len(df)} linhas, {len(df.columns)} colunas"
+            )
+            return df
+
+        except Exception as e:
+            msg = f"Erro ao extrair CSV {file_path}: {e}"
+            self.logger.error(msg)
+            raise
+
+    def extract_chunks(self, file_path) -> Iterator[pd.DataFrame]:
+        """Extrai dados do CSV em blocos de aproximadamente `chunksize` linhas"""
+        if not self.chunksize:
+            yield self.extract(file_path)
+            return
+
+        self.logger.info(
+            f"Iniciando extração (Arrow) em blocos de {self.chunksize} linhas: "
+            f"{file_path}..."
+        )
+        try:
+            reader = pv.open_csv(
+                file_path,
+                read_options=self.read_options,
+                parse_options=self.parse_options,
+                convert_options=self.convert_options,
+            )
+            # Colunas numéricas detectadas uma vez, no primeiro bloco, e
+            # reaproveitadas: todos os blocos saem com o mesmo schema
+            numeric_columns = None
+            for table in self._read_tables(reader):
+                if numeric_columns is None:
+                    numeric_columns = self._numeric_columns(table)
+                yield self._to_pandas(self._convert_numbers(table, numeric_columns))
+        except Exception as e:
+            msg = f"Erro ao extrair CSV {file_path}: {e}"
+            self.logger.error(msg)
+            raise
+
+    def _read_tables(self, reader: pv.CSVStreamingReader) -> Iterator[pa.Table]:
+        """Agrupa os lotes do leitor em tabelas de ~`chunksize` linhas"""
+        batches = []
+        rows = 0
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= self.chunksize:
+                yield pa.Table.from_batches(batches)
+                batches, rows = [], 0
+        if batches:
+            yield pa.Table.from_batches(batches)
@@ -3,18 +3,24 @@ Interface base para extractors (Strategy Pattern)
 """
 
 import logging
+import os
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
-import yaml
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-from fundeb.config.settings import LOGGING_CONFIG_PATH
+from fundeb.config.logger import get_logger
+from fundeb.utils.metrics import StageParts, profile_file, stage, stage_parts
+from fundeb.utils.schema_validator import SchemaValidator, ValidationReport
+from fundeb.utils.storage_layout import StorageLayout
 
-with open(LOGGING_CONFIG_PATH, encoding="utf-8") as file:
-    logging_config = yaml.safe_load(file)
-logging.config.dictConfig(logging_config)
+# Etapas de stream_to_parquet, cronometradas bloco a bloco (mesmos nomes do
+# run_flow e do save)
+STREAM_STAGES = ["validate_file", "extract", "validate_schema", "add_metadata", "save"]
 
 
 class BaseExtractor(ABC):
@@ -22,7 +28,14 @@ class BaseExtractor(ABC):
 
     # Lógica de inicialização compartilhada (logger)
     def __init__(self):
-        self.logger = logging.getLogger("my_module")
+        # A configuração de logging é aplicada na 1ª instância, não no import
+        self.logger = get_logger()
+        # Módulo do extractors.yaml (atribuído pela fábrica; rótulo das métricas)
+        self.module_name: str | None = None
+        # Schema declarado no extractors.yaml (atribuído pela fábrica)
+        self.schema: SchemaValidator | None = None
+        # Layout dimensão + fatos do extractors.yaml (atribuído pela fábrica)
+        self.layout: StorageLayout | None = None
         self.logger.debug("Extrator para criado.")
 
     # Validação de entrada do arquivo
@@ -72,7 +85,6 @@ class BaseExtractor(ABC):
         """
         pass
 
-    @abstractmethod
     def validate_schema(self, df: pd.DataFrame) -> bool:
         """
         Valida se o DataFrame está com o schema esperado
@@ -83,7 +95,21 @@ class BaseExtractor(ABC):
         Raises:
             ValueError: Se o schema não estiver conforme esperado
         """
-        pass
+        if self.schema is None:
+            return True
+        return self._handle_report(self.schema.validate(df))
+
+    def _handle_report(self, report: ValidationReport) -> bool:
+        """Loga o relatório e, se on_violation = 'raise', interrompe a extração"""
+        if report.ok:
+            self.logger.debug(str(report))
+            return True
+        msg = f"Schema inválido: {report}"
+        if self.schema.on_violation == "raise":
+            self.logger.error(msg)
+            raise ValueError(msg)
+        self.logger.warning(msg)
+        return False
 
     # Adição de metadados
     def add_metadata(self, file_path: str | Path, df: pd.DataFrame) -> pd.DataFrame:
@@ -98,6 +124,7 @@ class BaseExtractor(ABC):
         """
         logging.debug("Iniciando extração de metadados")
 
+        file_path = Path(file_path)
         stat = file_path.stat()
 
         logging.debug("Iniciando adição de metadados")
@@ -124,7 +151,166 @@ class BaseExtractor(ABC):
         """
         destiny_dir = Path(destiny_dir)
         destiny_dir.mkdir(parents=True, exist_ok=True)
-        df.to_parquet(destiny_dir / f"{file_path.stem}.parquet")
+        output_path = destiny_dir / f"{Path(file_path).stem}.parquet"
+        with stage("save", self.module_name, file_path) as current:
+            df.to_parquet(output_path)
+            current.rows, current.bytes = len(df), output_path.stat().st_size
+
+    # Extração em blocos (modo streaming)
+    def extract_chunks(self, file_path: str | Path) -> Iterator[pd.DataFrame]:
+        """
+        Extrai dados do arquivo em blocos. Por padrão, um único bloco com o
+        resultado de `extract`; extratores com leitura incremental sobrescrevem.
+        Args:
+            file_path (str | Path): Caminho completo do arquivo a ser extraído
+        Yields:
+            pd.DataFrame: Blocos consecutivos dos dados extraídos
+        """
+        yield self.extract(file_path)
+
+    @staticmethod
+    def _conform_table(table: pa.Table, schema: pa.Schema) -> pa.Table:
+        """Ajusta um bloco ao schema do primeiro bloco gravado no parquet."""
+        if table.schema.equals(schema):
+            return table
+        columns = []
+        for field in schema:
+            column = table.column(field.name)
+            if column.null_count == len(column):
+                column = pa.nulls(len(table), type=field.type)
+            elif column.type != field.type:
+                column = column.cast(field.type)
+            columns.append(column)
+        return pa.Table.from_arrays(columns, schema=schema)
+
+    def _chunk_to_table(
+        self,
+        file_path: Path,
+        chunk: pd.DataFrame,
+        dimension_parts: list[pd.DataFrame],
+    ) -> pa.Table:
+        """Adiciona metadados a um bloco e aplica o layout (se houver)"""
+        chunk = self.add_metadata(file_path, chunk)
+        if self.layout is None:
+            return pa.Table.from_pandas(chunk, preserve_index=False)
+        chunk, dimension = self.layout.split(chunk)
+        dimension_parts.append(dimension)
+        return self.layout.encode(pa.Table.from_pandas(chunk, preserve_index=False))
+
+    @staticmethod
+    def _timed_chunks(
+        chunks: Iterator[pd.DataFrame], parts: StageParts
+    ) -> Iterator[pd.DataFrame]:
+        """Blocos do gerador, cronometrando cada leitura (o next) na etapa"""
+        while True:
+            with parts.part() as current:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    current.rows += len(chunk)
+            if chunk is None:
+                return
+            yield chunk
+
+    def _write_table(
+        self, writer: pq.ParquetWriter | None, tmp_path: Path, table: pa.Table
+    ) -> pq.ParquetWriter:
+        """Anexa um bloco ao parquet, abrindo o writer no primeiro bloco"""
+        if writer is None:
+            # Colunas totalmente nulas no 1º bloco viram texto
+            schema = pa.schema(
+                field.with_type(pa.string())
+                if table.column(field.name).null_count == len(table)
+                else field
+                for field in table.schema
+            )
+            writer = pq.ParquetWriter(tmp_path, schema)
+        writer.write_table(self._conform_table(table, writer.schema))
+        return writer
+
+    def stream_to_parquet(self, file_path: str | Path, output_path: str | Path) -> int:
+        """
+        Executa o mini fluxo bloco a bloco, anexando cada bloco como um
+        row group de um único parquet. O pico de memória fica limitado ao
+        tamanho do bloco, independentemente do tamanho do arquivo. Com um
+        layout, grava também o parquet da dimensão (layout.dimension_path).
+        Args:
+            file_path (str | Path): Caminho do arquivo a ser processado
+            output_path (str | Path): Caminho do parquet de destino
+        Returns:
+            int: Número total de linhas gravadas
+        """
+        file_path = Path(file_path)
+        with (
+            profile_file(file_path, self.module_name),
+            stage("stream_to_parquet", self.module_name, file_path) as current,
+        ):
+            current.rows = self._stream_to_parquet(file_path, Path(output_path))
+            current.bytes = file_path.stat().st_size
+        return current.rows
+
+    def _stream_to_parquet(self, file_path: Path, output_path: Path) -> int:
+        """
+        Corpo de stream_to_parquet. As etapas (STREAM_STAGES) são
+        cronometradas dentro do laço de blocos e cada uma é registrada uma
+        vez por arquivo, com o tempo somado dos blocos
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Grava em arquivo temporário para nunca expor um parquet parcial
+        tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+
+        with stage_parts(STREAM_STAGES, self.module_name, file_path) as stages:
+            with stages["validate_file"].part() as current:
+                self.validate_file(file_path)
+                current.bytes = file_path.stat().st_size
+
+            writer = None
+            rows = 0
+            dimension_parts: list[pd.DataFrame] = []
+            if self.schema is not None:
+                self.schema.begin()
+            try:
+                chunks = self.extract_chunks(file_path)
+                for chunk in self._timed_chunks(chunks, stages["extract"]):
+                    with stages["validate_schema"].part() as current:
+                        # Regras de coluna bloco a bloco; a de saldo soma os blocos
+                        if self.schema is not None:
+                            self.schema.check(chunk)
+                        current.rows += len(chunk)
+                    with stages["add_metadata"].part() as current:
+                        table = self._chunk_to_table(file_path, chunk, dimension_parts)
+                        current.rows += len(table)
+                    with stages["save"].part() as current:
+                        writer = self._write_table(writer, tmp_path, table)
+                        current.rows += len(table)
+                    rows += len(table)
+                    self.logger.debug(
+                        f"Bloco gravado: {len(table)} linhas ({rows} total)"
+                    )
+                # Valida antes de publicar: um arquivo inválido nunca chega à Bronze
+                if self.schema is not None:
+                    with stages["validate_schema"].part():
+                        self._handle_report(self.schema.end())
+                if dimension_parts:
+                    with stages["save"].part():
+                        dimension_path = self.layout.dimension_path(output_path)
+                        self.layout.write_dimension(dimension_parts, dimension_path)
+            except Exception:
+                if writer is not None:
+                    writer.close()
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+            if writer is None:
+                msg = f"Nenhum dado extraído de {file_path}"
+                self.logger.error(msg)
+                raise ValueError(msg)
+            with stages["save"].part() as current:
+                writer.close()
+                os.replace(tmp_path, output_path)
+                current.bytes = output_path.stat().st_size
+
+        self.logger.info(f"{rows} linhas gravadas em {output_path.name}")
+        return rows
 
     # Execução do mini fluxo completo
     def run_flow(self, file_path: str | Path) -> pd.DataFrame:
@@ -135,10 +321,26 @@ class BaseExtractor(ABC):
         Returns:
             pd.DataFrame: DataFrame processado e validado com metadados
         """
-        self.validate_file(file_path)
-        df = self.extract(file_path)
-        self.validate_schema(df)
-        df = self.add_metadata(file_path, df)
+        file_path = Path(file_path)
+        module = self.module_name
+        # Cada etapa é cronometrada (utils/metrics.py); o arquivo inteiro é
+        # perfilado se passar de FUNDEB_PROFILE_THRESHOLD
+        with profile_file(file_path, module):
+            with stage("validate_file", module, file_path) as current:
+                self.validate_file(file_path)
+                current.bytes = file_path.stat().st_size
+            with stage("extract", module, file_path) as current:
+                df = self.extract(file_path)
+                current.rows, current.bytes = len(df), file_path.stat().st_size
+            with stage("validate_schema", module, file_path) as current:
+                self.validate_schema(df)
+                current.rows = len(df)
+            with stage("add_metadata", module, file_path) as current:
+                df = self.add_metadata(file_path, df)
+                if self.layout is not None:
+                    # Colunas repetidas como categóricas: ocupam só os códigos
+                    df = self.layout.categorize(df)
+                current.rows = len(df)
         return df
 
 
@@ -2,6 +2,7 @@
 Extrator para arquivos CSV de conta corrente
 """
 
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
@@ -19,7 +20,9 @@ class CSVExtractor(BaseExtractor):
     ):
         super().__init__()
         self.logger.debug("Inicializando CSVExtractor...")
-        self.read_kwargs = config_params
+        self.read_kwargs = dict(config_params)
+        # 'chunksize' ativa o modo streaming (ver extract_chunks)
+        self.chunksize = self.read_kwargs.pop("chunksize", None)
         self.logger.debug(f"CSVExtractor inicializado com params: {self.read_kwargs}]")
 
     def extract(self, file_path) -> pd.DataFrame:
@@ -40,32 +43,35 @@ class CSVExtractor(BaseExtractor):
             self.logger.error(msg)
             raise
 
-    def validate_schema(self, df: pd.DataFrame) -> bool:
-        """
-        Valida se o DataFrame está com o schema esperado
-        Args:
-            df (pd.DataFrame): DataFrame a ser validado
-        Returns:
-            bool: True se o schema estiver correto, False caso contrário
-        Raises:
-            ValueError: Se o schema não estiver conforme esperado
-        """
-        pass
+    def extract_chunks(self, file_path) -> Iterator[pd.DataFrame]:
+        """Extrai dados do CSV em blocos de `chunksize` linhas"""
+        if not self.chunksize:
+            yield self.extract(file_path)
+            return
+
+        self.logger.info(
+            f"Iniciando extração em blocos de {self.chunksize} linhas: {file_path}..."
+        )
+        try:
+            with pd.read_csv(
+                file_path, chunksize=self.chunksize, **self.read_kwargs
+            ) as reader:
+                yield from reader
+        except Exception as e:
+            msg = f"Erro ao extrair CSV {file_path}: {e}"
+            self.logger.error(msg)
+            raise
 
 
 # --- O BLOCO DE TESTE (SMOKE TEST) ---
 if __name__ == "__main__":
-    import logging
-
     import yaml
 
-    from fundeb.config.settings import EXTRACTORS_CONFIG_PATH, LOGGING_CONFIG_PATH
+    from fundeb.config.logger import get_logger
+    from fundeb.config.settings import EXTRACTORS_CONFIG_PATH
 
-    # Carrega a configuração do arquivo YAML de logging
-    with open(LOGGING_CONFIG_PATH) as file:
-        logging_config = yaml.safe_load(file)
-    logging.config.dictConfig(logging_config)
-    logger = logging.getLogger("my_module")
+    # Aplica a configuração do arquivo YAML de logging
+    logger = get_logger()
 
     # Carrega a configuração do arquivo YAML de extractors
     logger.debug("Iniciando teste do CSVExtractor...")
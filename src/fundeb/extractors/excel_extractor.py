@@ -0,0 +1,224 @@
+"""
+Extrator para pastas de trabalho Excel (.xls/.xlsx), ex: FUNDEB_*.xls do FNDE/STN
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from fundeb.extractors.base_extractor import STREAM_STAGES, BaseExtractor
+from fundeb.utils.excel_utils import list_sheet_names, open_workbook
+from fundeb.utils.metrics import Stage, StageParts, stage_parts
+from fundeb.utils.schema_validator import SchemaValidator
+from fundeb.utils.storage_layout import StorageLayout
+
+
+def _sheets_to_parquet(
+    config_params: dict[str, Any],
+    schema: SchemaValidator | None,
+    layout: StorageLayout | None,
+    file_path: str,
+    sheet_names: list[str],
+    output_paths: list[str],
+) -> tuple[list[int], dict[str, StageParts]]:
+    """
+    Worker: abre a pasta de trabalho uma vez (sob demanda), lê as planilhas
+    do seu lote e grava um parquet por planilha. Cada planilha é validada
+    (schema do módulo) e gravada em .<planilha>.parquet.tmp antes de ser
+    publicada. Recebe só parâmetros simples (sem DataFrames), para que a
+    comunicação entre processos seja desprezível; devolve as linhas por
+    planilha e o tempo das etapas, somado no processo principal.
+    """
+    extractor = ExcelExtractor(config_params=config_params)
+    extractor.schema, extractor.layout = schema, layout
+    stages = {name: StageParts(Stage(name)) for name in STREAM_STAGES}
+    rows = []
+    with open_workbook(file_path) as book:
+        for sheet_name, output_path in zip(sheet_names, output_paths, strict=True):
+            with stages["extract"].part() as current:
+                df = extractor._read_sheet(book, sheet_name)
+                current.rows += len(df)
+            with stages["validate_schema"].part() as current:
+                extractor.validate_schema(df)
+                current.rows += len(df)
+            with stages["add_metadata"].part() as current:
+                df = extractor.add_metadata(file_path, df)
+                if extractor.layout is not None:
+                    df = extractor.layout.categorize(df)
+                current.rows += len(df)
+            with stages["save"].part() as current:
+                # Grava ao lado e renomeia: nunca expõe um parquet parcial
+                target = Path(output_path)
+                tmp_path = target.with_name(f".{target.name}.tmp")
+                try:
+                    df.to_parquet(tmp_path, index=False)
+                    os.replace(tmp_path, target)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+                current.rows += len(df)
+                current.bytes += target.stat().st_size
+            rows.append(len(df))
+    return rows, stages
+
+
+class ExcelExtractor(BaseExtractor):
+    """
+    Extrator para pastas de trabalho Excel.
+
+    A pasta de trabalho é aberta uma única vez e as planilhas são carregadas
+    sob demanda (xlrd on_demand / openpyxl read_only): só as planilhas
+    configuradas em 'sheets' ou 'sheet_pattern' são lidas. Os demais params
+    do extractors.yaml (header, usecols, nrows, ...) vão para pd.read_excel.
+    """
+
+    def __init__(
+        self,
+        config_params: dict[str, Any],
+    ):
+        super().__init__()
+        self.logger.debug("Inicializando ExcelExtractor...")
+        self.config_params = dict(config_params)
+        params = dict(config_params)
+
+        # Seleção de planilhas: lista explícita e/ou expressão regular
+        self.sheets = params.pop("sheets", None)
+        self.sheet_pattern = params.pop("sheet_pattern", None)
+        # Linhas sem valor nestas colunas (brancos, totais) são descartadas
+        self.required_columns = params.pop("required_columns", None)
+        # Processos para extrair as planilhas em paralelo (1 = sequencial)
+        self.max_workers = params.pop("max_workers", None)
+        self.read_kwargs = params
+        self.logger.debug(f"ExcelExtractor inicializado com params: {self.read_kwargs}")
+
+    def select_sheets(self, file_path: str | Path) -> list[str]:
+        """
+        Lista as planilhas a extrair, sem carregar dados das células
+        Args:
+            file_path (str | Path): Caminho da pasta de trabalho
+        Returns:
+            list[str]: Nomes das planilhas configuradas, na ordem do arquivo
+        """
+        available = list_sheet_names(file_path)
+        selected = available
+        if self.sheets:
+            missing = set(self.sheets) - set(available)
+            if missing:
+                msg = f"Planilhas não encontradas em {Path(file_path).name}: {missing}"
+                self.logger.error(msg)
+                raise ValueError(msg)
+            selected = [name for name in available if name in self.sheets]
+        if self.sheet_pattern:
+            selected = [
+                name for name in selected if re.search(self.sheet_pattern, name)
+            ]
+        return selected
+
+    def _read_sheet(self, book: Any, sheet_name: str) -> pd.DataFrame:
+        """Lê uma planilha de uma pasta de trabalho já aberta"""
+        df = pd.read_excel(book, sheet_name=sheet_name, **self.read_kwargs)
+        if self.required_columns:
+            df = df.dropna(subset=self.required_columns)
+        df.insert(0, "sheet_name", sheet_name)
+        return df.reset_index(drop=True)
+
+    def extract_sheets(self, file_path: str | Path) -> dict[str, pd.DataFrame]:
+        """
+        Extrai as planilhas configuradas, abrindo a pasta de trabalho uma vez
+        Args:
+            file_path (str | Path): Caminho da pasta de trabalho
+        Returns:
+            dict[str, pd.DataFrame]: Um DataFrame por planilha
+        """
+        sheets = self.select_sheets(file_path)
+        with open_workbook(file_path) as book:
+            return {name: self._read_sheet(book, name) for name in sheets}
+
+    def extract(self, file_path) -> pd.DataFrame:
+        """Extrai as planilhas configuradas num único DataFrame (coluna sheet_name)"""
+        self.logger.info(f"Iniciando extração: {file_path}...")
+
+        try:
+            df = pd.concat(self.extract_sheets(file_path).values(), ignore_index=True)
+
+            self.logger.info(
+                f"Arquivo extraído com sucesso! "
+                f"{len(df)} linhas, {len(df.columns)} colunas"
+            )
+            return df
+
+        except Exception as e:
+            msg = f"Erro ao extrair Excel {file_path}: {e}"
+            self.logger.error(msg)
+            raise
+
+    def _stream_to_parquet(self, file_path: Path, output_path: Path) -> int:
+        """
+        Extrai cada planilha para um parquet próprio, em paralelo
+        (lotes de planilhas distribuídos em até 'max_workers' processos).
+        `output_path` vira um diretório de dataset: <output_path>/<planilha>.parquet
+        Chamado (e cronometrado) por BaseExtractor.stream_to_parquet; as
+        etapas (STREAM_STAGES) dos lotes são somadas numa observação por
+        arquivo, como no laço de blocos da classe base.
+        Args:
+            file_path (Path): Caminho da pasta de trabalho
+            output_path (Path): Diretório de destino das planilhas
+        Returns:
+            int: Número total de linhas gravadas
+        """
+        output_dir = output_path
+        with stage_parts(STREAM_STAGES, self.module_name, file_path) as stages:
+            with stages["validate_file"].part() as current:
+                self.validate_file(file_path)
+                current.bytes = file_path.stat().st_size
+
+            sheets = self.select_sheets(file_path)
+            if not sheets:
+                msg = f"Nenhuma planilha selecionada em {file_path.name}"
+                self.logger.error(msg)
+                raise ValueError(msg)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            targets = [str(output_dir / f"{name}.parquet") for name in sheets]
+
+            # Um lote de planilhas por processo; cada um abre o arquivo uma vez
+            max_workers = min(self.max_workers or os.cpu_count() or 1, len(sheets))
+            batches = [
+                (
+                    self.config_params,
+                    self.schema,
+                    self.layout,
+                    str(file_path),
+                    sheets[i::max_workers],
+                    targets[i::max_workers],
+                )
+                for i in range(max_workers)
+            ]
+            if max_workers > 1:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(_sheets_to_parquet, *batch)
+                        for batch in batches
+                    ]
+                    outcomes = [future.result() for future in futures]
+            else:
+                outcomes = [_sheets_to_parquet(*batches[0])]
+
+            # Uma observação por etapa no arquivo, somando os lotes
+            rows = []
+            for batch_rows, batch_stages in outcomes:
+                rows.extend(batch_rows)
+                for name, parts in batch_stages.items():
+                    stages[name].merge(parts)
+
+        # Remove planilhas de extrações anteriores que não foram selecionadas agora
+        for stale in set(output_dir.glob("*.parquet")) - {Path(t) for t in targets}:
+            stale.unlink()
+
+        total = sum(rows)
+        self.logger.info(
+            f"{len(sheets)} planilhas, {total} linhas gravadas em {output_dir.name}"
+        )
+        return total
@@ -0,0 +1,125 @@
+"""
+Extrator para as tabelas de transferências por decêndio do FNDE
+(ex: AJUSTES_REPASSES_*.csv)
+"""
+
+import unicodedata
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from fundeb.extractors.base_extractor import BaseExtractor
+from fundeb.utils.formatters import parse_currency
+
+# Cabeçalhos do arquivo já normalizados (sem acentos, minúsculos)
+ID_COLUMNS = ["regiao", "uf", "ano", "mes", "transferencia"]
+DECENDIO_COLUMNS = {"1o decendio": 1, "2o decendio": 2, "3o decendio": 3}
+TOTAL_COLUMN = "total"
+
+
+def _normalize(name: str) -> str:
+    """'1º Decêndio' -> '1o decendio'"""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore")
+    return ascii_name.decode().strip().lower()
+
+
+class FNDETransfersExtractor(BaseExtractor):
+    """
+    Extrator para as transferências do FNDE por decêndio.
+
+    Converte os valores monetários ("-R$912.717,48") com operações
+    vetorizadas de texto, confere se 'Total' é a soma dos três decêndios e
+    devolve uma tabela longa e tipada: regiao, uf, ano, mes, decendio,
+    transferencia, valor.
+    """
+
+    def __init__(
+        self,
+        config_params: dict[str, Any],
+    ):
+        super().__init__()
+        self.logger.debug("Inicializando FNDETransfersExtractor...")
+        params = dict(config_params)
+        # Diferença máxima (R$) aceita entre 'Total' e a soma dos decêndios
+        self.tolerance = params.pop("tolerance", 0.01)
+        # Se True, divergências no 'Total' interrompem a extração
+        self.strict = params.pop("strict", True)
+        self.read_kwargs = {**params, "dtype": str, "keep_default_na": False}
+        self.logger.debug(
+            f"FNDETransfersExtractor inicializado com params: {self.read_kwargs}"
+        )
+
+    def _to_wide(self, raw: pd.DataFrame) -> pd.DataFrame:
+        """Padroniza os nomes das colunas e converte os tipos (tabela larga)"""
+        raw = raw.rename(columns=_normalize)
+        expected = [*ID_COLUMNS, *DECENDIO_COLUMNS, TOTAL_COLUMN]
+        missing = [column for column in expected if column not in raw.columns]
+        if missing:
+            msg = f"Colunas ausentes no arquivo de transferências: {missing}"
+            self.logger.error(msg)
+            raise ValueError(msg)
+
+        wide = pd.DataFrame(
+            {
+                "regiao": raw["regiao"].astype("category"),
+                "uf": raw["uf"].astype("category"),
+                "ano": pd.to_numeric(raw["ano"]).astype("int16"),
+                "mes": pd.to_numeric(raw["mes"]).astype("int8"),
+                "transferencia": raw["transferencia"].astype("category"),
+            }
+        )
+        for column in [*DECENDIO_COLUMNS, TOTAL_COLUMN]:
+            wide[column] = parse_currency(raw[column])
+        return wide
+
+    def _check_totals(self, wide: pd.DataFrame) -> None:
+        """Confere, linha a linha e sem loops, se Total = soma dos decêndios"""
+        decendios = wide[list(DECENDIO_COLUMNS)].to_numpy()
+        difference = np.abs(decendios.sum(axis=1) - wide[TOTAL_COLUMN].to_numpy())
+        divergent = difference > self.tolerance
+        if not divergent.any():
+            return
+
+        sample = wide.loc[divergent, ["uf", "ano", "mes", "transferencia"]].head(5)
+        msg = (
+            f"{int(divergent.sum())} linha(s) com 'Total' diferente da soma dos "
+            f"decêndios (tolerância R$ {self.tolerance}). Exemplos:\n{sample}"
+        )
+        if self.strict:
+            self.logger.error(msg)
+            raise ValueError(msg)
+        self.logger.warning(msg)
+
+    def _to_long(self, wide: pd.DataFrame) -> pd.DataFrame:
+        """Uma linha por (UF, ano, mês, decêndio, transferência)"""
+        n_decendios = len(DECENDIO_COLUMNS)
+        long = wide[ID_COLUMNS].iloc[np.repeat(np.arange(len(wide)), n_decendios)]
+        long = long.reset_index(drop=True)
+        long.insert(
+            4,
+            "decendio",
+            np.tile(np.array(list(DECENDIO_COLUMNS.values()), dtype="int8"), len(wide)),
+        )
+        long["valor"] = wide[list(DECENDIO_COLUMNS)].to_numpy().ravel()
+        return long
+
+    def extract(self, file_path) -> pd.DataFrame:
+        """Extrai as transferências em formato longo e tipado"""
+        self.logger.info(f"Iniciando extração: {file_path}...")
+
+        try:
+            wide = self._to_wide(pd.read_csv(file_path, **self.read_kwargs))
+            self._check_totals(wide)
+            df = self._to_long(wide)
+
+            self.logger.info(
+                f"Arquivo extraído com sucesso! "
+                f"{len(wide)} linhas -> {len(df)} linhas por decêndio"
+            )
+            return df
+
+        except Exception as e:
+            msg = f"Erro ao extrair transferências {file_path}: {e}"
+            self.logger.error(msg)
+            raise
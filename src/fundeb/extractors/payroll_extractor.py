@@ -0,0 +1,68 @@
+"""
+Extrator para as folhas de pagamento (ex: FOLHA_AP_MACAPA_2025_01.csv)
+
+Uma linha por rubrica paga a um servidor numa competência, no layout:
+
+    COMPETENCIA;UF;MUNICIPIO;MATRICULA;CPF;NOME;CARGO;VINCULO;ESCOLA;
+    NOME_ESCOLA;FONTE_RECURSO;RUBRICA;DESCRICAO_RUBRICA;TIPO;VALOR
+
+com a competência em mm/aaaa, TIPO 'P' (provento) ou 'D' (desconto) e o
+valor em formato brasileiro ("1.234,56").
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+import pandas as pd
+
+from fundeb.extractors.csv_extractor import CSVExtractor
+
+# Ordem das linhas gravadas: competência e servidor (ver PayrollExtractor)
+SORT_COLUMNS = ["competencia", "matricula", "rubrica"]
+
+
+class PayrollExtractor(CSVExtractor):
+    """
+    Extrator para as folhas de pagamento.
+
+    Lê o CSV (em blocos, com 'chunksize') com os mesmos params do
+    CSVExtractor, padroniza os nomes das colunas (minúsculos), converte a
+    competência no primeiro dia do mês e ordena cada bloco por competência
+    e matrícula: os row groups do parquet ficam com faixas estreitas de
+    matrícula, e as consultas por servidor leem só os blocos que o contêm.
+    """
+
+    def __init__(
+        self,
+        config_params: dict[str, Any],
+    ):
+        params = dict(config_params)
+        # Formato da competência no arquivo (strftime)
+        self.competencia_format = params.pop("competencia_format", "%m/%Y")
+        super().__init__(params)
+
+    def _normalize(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Nomes em minúsculas, competência como data e linhas ordenadas"""
+        chunk = chunk.rename(columns=lambda name: name.strip().lower())
+        if "competencia" not in chunk.columns:
+            msg = "Coluna 'COMPETENCIA' ausente na folha de pagamento"
+            self.logger.error(msg)
+            raise ValueError(msg)
+        chunk["competencia"] = pd.to_datetime(
+            chunk["competencia"].astype(str).str.strip(),
+            format=self.competencia_format,
+        )
+        keys = [column for column in SORT_COLUMNS if column in chunk.columns]
+        return chunk.sort_values(keys, kind="stable", ignore_index=True)
+
+    def extract(self, file_path) -> pd.DataFrame:
+        """Extrai a folha de pagamento, padronizada e ordenada"""
+        return self._normalize(super().extract(file_path))
+
+    def extract_chunks(self, file_path) -> Iterator[pd.DataFrame]:
+        """Extrai a folha de pagamento em blocos padronizados e ordenados"""
+        if not self.chunksize:
+            yield self.extract(file_path)
+            return
+        for chunk in super().extract_chunks(file_path):
+            yield self._normalize(chunk)
@@ -0,0 +1,176 @@
+"""
+Extrator de tabelas em PDF com camelot (ex: extratos de investimento do BB,
+relatórios do SIOPE)
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from fundeb.config.settings import DATA_CACHE_DIR
+from fundeb.extractors.base_extractor import BaseExtractor
+from fundeb.utils.manifest import file_sha256
+
+# Cache por página: <PDF_PAGE_CACHE_DIR>/<hash>.parquet
+PDF_PAGE_CACHE_DIR = DATA_CACHE_DIR / "pdf_pages"
+
+
+def parse_pages(pages: str, page_count: int) -> list[int]:
+    """
+    Converte a especificação de páginas do camelot em números de página
+    Args:
+        pages (str): Ex: '1', '1-3', '1,4-end', 'all'
+        page_count (int): Número de páginas do PDF
+    Returns:
+        list[int]: Páginas (1 = primeira), sem repetições e na ordem dada
+    Raises:
+        ValueError: Nenhuma página da especificação existe no PDF
+    """
+    if str(pages).strip().lower() == "all":
+        return list(range(1, page_count + 1))
+
+    selected: dict[int, None] = {}
+    for part in str(pages).split(","):
+        start, _, end = part.strip().partition("-")
+        first = int(start)
+        last = page_count if end == "end" else int(end or start)
+        for page in range(first, min(last, page_count) + 1):
+            selected[page] = None
+    if not selected:
+        raise ValueError(
+            f"Nenhuma página selecionada por pages='{pages}' "
+            f"num PDF de {page_count} página(s)"
+        )
+    return list(selected)
+
+
+def _extract_pages(
+    read_kwargs: dict[str, Any],
+    file_path: str,
+    pages: list[int],
+    cache_paths: list[str],
+) -> list[int]:
+    """
+    Worker: lê um lote de páginas com o camelot e grava, para cada página,
+    as suas tabelas num parquet do cache. Devolve as linhas por página.
+    """
+    import camelot
+
+    tables = camelot.read_pdf(file_path, pages=",".join(map(str, pages)), **read_kwargs)
+    by_page: dict[int, list[pd.DataFrame]] = {page: [] for page in pages}
+    for table in tables:
+        df = table.df
+        df.columns = [str(column) for column in df.columns]
+        by_page[int(table.page)].append(
+            df.assign(table_index=len(by_page[int(table.page)]))
+        )
+
+    rows = []
+    for page, cache_path in zip(pages, cache_paths, strict=True):
+        frames = by_page[page]
+        df = (
+            pd.concat(frames, ignore_index=True)
+            if frames
+            else pd.DataFrame({"table_index": pd.Series(dtype="int64")})
+        )
+        df.insert(0, "page", page)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+        rows.append(len(df))
+    return rows
+
+
+class PDFExtractor(BaseExtractor):
+    """
+    Extrator de tabelas em PDF (camelot).
+
+    As páginas configuradas em 'pages' são divididas entre até 'max_workers'
+    processos. O resultado de cada página é guardado em cache, com chave
+    (hash do PDF, página, params): reexecuções só processam páginas novas.
+    Os demais params (flavor, table_areas, ...) vão para camelot.read_pdf.
+    """
+
+    def __init__(
+        self,
+        config_params: dict[str, Any],
+    ):
+        super().__init__()
+        self.logger.debug("Inicializando PDFExtractor...")
+        params = dict(config_params)
+        self.pages = str(params.pop("pages", "1"))
+        # Processos para extrair as páginas em paralelo (1 = sequencial)
+        self.max_workers = params.pop("max_workers", None)
+        self.cache_dir = Path(params.pop("cache_dir", PDF_PAGE_CACHE_DIR))
+        self.read_kwargs = params
+        self.logger.debug(f"PDFExtractor inicializado com params: {self.read_kwargs}")
+
+    def _cache_path(self, pdf_hash: str, page: int) -> Path:
+        """Parquet do cache de uma página (hash do PDF + página + params)"""
+        params = json.dumps(self.read_kwargs, sort_keys=True, default=str)
+        key = hashlib.sha256(f"{pdf_hash}|{page}|{params}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.parquet"
+
+    def extract(self, file_path) -> pd.DataFrame:
+        """Extrai as tabelas das páginas configuradas num único DataFrame"""
+        self.logger.info(f"Iniciando extração: {file_path}...")
+
+        try:
+            import pypdfium2 as pdfium
+
+            file_path = Path(file_path)
+            pdf = pdfium.PdfDocument(str(file_path))
+            page_count = len(pdf)
+            pdf.close()
+            pages = parse_pages(self.pages, page_count)
+
+            pdf_hash = file_sha256(file_path)
+            cache_paths = {page: self._cache_path(pdf_hash, page) for page in pages}
+            missing = [page for page in pages if not cache_paths[page].exists()]
+            self.logger.info(
+                f"{len(pages)} páginas selecionadas, "
+                f"{len(pages) - len(missing)} já em cache"
+            )
+
+            if missing:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                max_workers = min(self.max_workers or os.cpu_count() or 1, len(missing))
+                batches = [
+                    (
+                        self.read_kwargs,
+                        str(file_path),
+                        missing[i::max_workers],
+                        [str(cache_paths[page]) for page in missing[i::max_workers]],
+                    )
+                    for i in range(max_workers)
+                ]
+                if max_workers > 1:
+                    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                        futures = [
+                            executor.submit(_extract_pages, *batch) for batch in batches
+                        ]
+                        for future in futures:
+                            future.result()
+                else:
+                    _extract_pages(*batches[0])
+
+            df = pd.concat(
+                [pd.read_parquet(cache_paths[page]) for page in pages],
+                ignore_index=True,
+            )
+
+            self.logger.info(
+                f"Arquivo extraído com sucesso! "
+                f"{len(df)} linhas, {len(df.columns)} colunas, {len(pages)} páginas"
+            )
+            return df
+
+        except Exception as e:
+            msg = f"Erro ao extrair PDF {file_path}: {e}"
+            self.logger.error(msg)
+            raise
@@ -1,31 +1,44 @@
-import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
+import pandas as pd
+import pyarrow as pa
 import yaml
 
 # 1. IMPORTAR AS DEPENDÊNCIAS DE CONFIGURAÇÃO E ESTRATÉGIAS
-from fundeb.config.settings import EXTRACTORS_CONFIG_PATH, LOGGING_CONFIG_PATH
+from fundeb.config.logger import get_logger
+from fundeb.config.settings import (
+    DATA_BRONZE_DIR,
+    EXTRACTORS_CONFIG_PATH,
+    FILE_EXTENSION_MAP,
+)
+from fundeb.extractors.arrow_csv_extractor import ArrowCSVExtractor
 from fundeb.extractors.base_extractor import BaseExtractor
 from fundeb.extractors.csv_extractor import CSVExtractor
-
-# from fundeb_analysis.extractors.pdf_extractor import PDFExtractor
-# from fundeb_analysis.extractors.excel_extractor import ExcelExtractor
-
-# Carrega a configuração do arquivo YAML de logging
-with open(LOGGING_CONFIG_PATH) as file:
-    logging_config = yaml.safe_load(file)
-    logging.config.dictConfig(logging_config)
-    logger = logging.getLogger("my_module")
-
+from fundeb.extractors.excel_extractor import ExcelExtractor
+from fundeb.extractors.fnde_transfers_extractor import FNDETransfersExtractor
+from fundeb.extractors.payroll_extractor import PayrollExtractor
+from fundeb.extractors.pdf_extractor import PDFExtractor
+from fundeb.utils.datasets import concat_tables, write_dataset
+from fundeb.utils.manifest import file_sha256
+from fundeb.utils.metrics import stage
+from fundeb.utils.schema_validator import SchemaValidator
+from fundeb.utils.storage_layout import StorageLayout
 
 # 2. O PADRÃO REGISTRY
 # ----------------------------------------
 EXTRACTOR_REGISTRY: dict[str, BaseExtractor] = {
     "csv": CSVExtractor,
+    "arrow_csv": ArrowCSVExtractor,
     # "txt": CSVExtractor,
-    # "xls": ExcelExtractor,
-    # "xlsx": ExcelExtractor,
-    # "pdf": PDFExtractor,
+    "excel": ExcelExtractor,
+    "fnde_transfers": FNDETransfersExtractor,
+    "payroll": PayrollExtractor,
+    "pdf": PDFExtractor,
 }
 
 
@@ -50,6 +63,9 @@ class ExtractionFactory:
         """
         self.config = config
         self.registry = registry
+        # Extratores reaproveitados em lote: um por (módulo, tipo)
+        self._extractors: dict[tuple[str, str], BaseExtractor] = {}
+        self._extractors_lock = threading.Lock()
         print("ExtractionFactory (Hierárquica) inicializada com sucesso.")
 
     def create_extractor(self, module_name: str, extractor_type: str) -> BaseExtractor:
@@ -79,12 +95,15 @@ class ExtractionFactory:
             ) from err
 
         # Etapa 3: Encontrar a Classe de Extrator correspondente no nosso Registo
+        # A chave opcional 'extractor' permite trocar a implementação de um
+        # tipo (ex: 'csv' lido pelo 'arrow_csv') sem mudar o FILE_EXTENSION_MAP.
+        registry_key = type_config.get("extractor", extractor_type)
         try:
-            ExtractorClass = self.registry[extractor_type]
+            ExtractorClass = self.registry[registry_key]
         except KeyError as err:
             # Erro claro se o tipo (ex: 'pdf') estiver no YAML mas não no REGISTRY
             raise ValueError(
-                f"Tipo de extrator desconhecido: '{extractor_type}'. "
+                f"Tipo de extrator desconhecido: '{registry_key}'. "
                 f"Ele está no YAML, mas não foi adicionado ao EXTRACTOR_REGISTRY em factory.py."
             ) from err
 
@@ -95,7 +114,7 @@ class ExtractionFactory:
         # A MÁGICA: Passamos os parâmetros do YAML diretamente para o
         # construtor da classe de extração.
         try:
-            return ExtractorClass(config_params=config_params)
+            extractor = ExtractorClass(config_params=config_params)
         except TypeError as e:
             # Erro comum se o __init__ do extrator não aceitar 'config_params'
             print(f"Erro ao instanciar {ExtractorClass.__name__}: {e}")
@@ -107,6 +126,214 @@ class ExtractionFactory:
             print(f"Erro inesperado ao criar o extrator {ExtractorClass.__name__}: {e}")
             raise
 
+        # Rótulo das métricas das etapas do extrator (utils/metrics.py)
+        extractor.module_name = module_name
+
+        # Etapa 6: Anexar o schema declarado do módulo (chave 'schema' no YAML),
+        # avaliado pelo validate_schema do extrator
+        schema = module_config.get("schema")
+        if schema:
+            extractor.schema = SchemaValidator(schema)
+
+        # Etapa 7: Anexar o layout de armazenamento (chave 'layout' no YAML):
+        # dimensão do extrato + fatos estreitos, com colunas de dicionário
+        layout = module_config.get("layout")
+        if layout:
+            extractor.layout = StorageLayout(layout)
+        return extractor
+
+    def get_extractor(self, module_name: str, extractor_type: str) -> BaseExtractor:
+        """
+        Devolve o extrator de um módulo e tipo, criado só na primeira chamada
+        Args:
+            module_name (str): Módulo do extractors.yaml (ex: 'conta_corrente')
+            extractor_type (str): Tipo de extrator (ex: 'csv')
+        Returns:
+            BaseExtractor: A mesma instância a cada chamada
+        """
+        key = (module_name, extractor_type)
+        with self._extractors_lock:
+            if key not in self._extractors:
+                self._extractors[key] = self.create_extractor(
+                    module_name, extractor_type
+                )
+            return self._extractors[key]
+
+    def _read_file(self, module_name: str, file_path: Path) -> dict[str, Any]:
+        """Lê um arquivo (executado nas threads de extract_many)"""
+        start = time.perf_counter()
+        summary = {
+            "module_base": module_name,
+            "file": file_path.name,
+            "file_path": str(file_path),
+            "pid": os.getpid(),
+        }
+        try:
+            extractor_type = FILE_EXTENSION_MAP.get(file_path.suffix.lower())
+            if not extractor_type:
+                raise ValueError(
+                    f"Extensão '{file_path.suffix}' não mapeada em FILE_EXTENSION_MAP."
+                )
+            extractor = self.get_extractor(module_name, extractor_type)
+            with stage("factory.read_file", module_name, file_path) as current:
+                stat = file_path.stat()
+                sha256 = file_sha256(file_path)
+                extractor.validate_file(file_path)
+                df = extractor.extract(file_path)
+                current.rows, current.bytes = len(df), stat.st_size
+        except Exception as e:
+            return {**summary, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+        return {
+            **summary,
+            "status": "success",
+            "rows": len(df),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+            "extract_seconds": round(time.perf_counter() - start, 4),
+            "_extractor": extractor,
+            "_df": df,
+        }
+
+    def _to_tables(
+        self, extractor: BaseExtractor, reads: list[dict[str, Any]]
+    ) -> tuple[pa.Table | None, pd.DataFrame | None]:
+        """
+        Concatena os arquivos lidos por um extrator, valida o schema numa
+        única passada vetorizada e aplica o layout (se houver). Se o lote
+        for inválido, valida arquivo a arquivo para isolar os inválidos.
+        """
+        module = extractor.module_name
+        with stage("factory.add_metadata", module) as current:
+            frames = [
+                extractor.add_metadata(Path(read["file_path"]), read.pop("_df"))
+                for read in reads
+            ]
+            current.rows = sum(len(frame) for frame in frames)
+        try:
+            with stage("factory.validate_schema", module) as current:
+                current.rows = sum(len(frame) for frame in frames)
+                extractor.validate_schema(pd.concat(frames, ignore_index=True))
+        except ValueError:
+            valid = []
+            for read, frame in zip(reads, frames, strict=True):
+                try:
+                    extractor.validate_schema(frame)
+                    valid.append(frame)
+                except ValueError as e:
+                    read.update(status="error", error=f"{type(e).__name__}: {e}")
+            frames = valid
+        if not frames:
+            return None, None
+
+        df = pd.concat(frames, ignore_index=True)
+        if extractor.layout is None:
+            return pa.Table.from_pandas(df, preserve_index=False), None
+        df, dimension = extractor.layout.split(df)
+        table = extractor.layout.encode(pa.Table.from_pandas(df, preserve_index=False))
+        return table, dimension
+
+    def extract_many(
+        self,
+        module_name: str,
+        paths: list[str | Path],
+        destiny_dir: str | Path = DATA_BRONZE_DIR,
+        max_workers: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Extrai vários arquivos de um módulo e grava um único dataset
+        particionado (<destiny_dir>/<módulo>/, ver utils/datasets.py), em vez
+        de um parquet por arquivo. Reaproveita um extrator por (módulo, tipo)
+        e lê os arquivos em paralelo; os leitores do pandas/Arrow liberam o
+        GIL durante o parsing.
+        Args:
+            module_name (str): Módulo do extractors.yaml (ex: 'conta_corrente')
+            paths (list[str | Path]): Arquivos de origem
+            destiny_dir (str | Path): Diretório da camada Bronze
+            max_workers (int | None): Threads de leitura (padrão do Python)
+        Returns:
+            list[dict[str, Any]]: Um resumo por arquivo, na ordem de 'paths',
+                no formato de process_pool.extract_file ('output_files' lista
+                os parquets do lote); falhas vêm com status 'error'
+        """
+        with stage("factory.extract_many", module_name) as current:
+            results = self._extract_many(module_name, paths, destiny_dir, max_workers)
+            loaded = [result for result in results if result["status"] == "success"]
+            current.rows = sum(result["rows"] for result in loaded)
+            current.bytes = sum(result["size"] for result in loaded)
+        return results
+
+    def _extract_many(
+        self,
+        module_name: str,
+        paths: list[str | Path],
+        destiny_dir: str | Path,
+        max_workers: int | None,
+    ) -> list[dict[str, Any]]:
+        """Corpo de extract_many (cronometrado como uma etapa só)"""
+        start = time.perf_counter()
+        paths = [Path(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(lambda path: self._read_file(module_name, path), paths)
+            )
+
+        # Validação e metadados no thread principal (o schema guarda estado),
+        # uma vez por extrator (ex: csv e pdf do mesmo módulo)
+        by_extractor: dict[int, list[dict[str, Any]]] = {}
+        for result in results:
+            if result["status"] == "success":
+                by_extractor.setdefault(id(result["_extractor"]), []).append(result)
+        tables, dimensions = [], []
+        for reads in by_extractor.values():
+            extractor = reads[0]["_extractor"]
+            for read in reads:
+                del read["_extractor"]
+            table, dimension = self._to_tables(extractor, reads)
+            if table is not None:
+                tables.append(table)
+            if dimension is not None:
+                dimensions.append(pa.Table.from_pandas(dimension, preserve_index=False))
+        loaded = [result for result in results if result["status"] == "success"]
+        if not tables:
+            return results
+
+        # Uma única gravação para todos os arquivos do lote
+        module_config = self.config.get(module_name, {})
+        dataset_dir = Path(destiny_dir) / module_name
+        with stage("factory.save", module_name) as current:
+            table = concat_tables(tables)
+            output_files = write_dataset(
+                table,
+                dataset_dir,
+                module_config.get("warehouse", {}).get("partition_by"),
+            )
+            current.rows = table.num_rows
+            current.bytes = sum(Path(path).stat().st_size for path in output_files)
+        layout = module_config.get("layout")
+        dimension_path = None
+        if dimensions:
+            (dimension_path,) = write_dataset(
+                concat_tables(dimensions), Path(destiny_dir) / layout["dimension"]
+            )
+
+        elapsed = round(time.perf_counter() - start, 4)
+        for result in loaded:
+            result.update(
+                output_path=str(dataset_dir),
+                output_files=output_files,
+                dimension=layout["dimension"] if dimensions else None,
+                dimension_path=dimension_path,
+                total_seconds=elapsed,
+            )
+        get_logger().info(
+            f"{len(loaded)} arquivos de '{module_name}' em {elapsed:.2f}s: "
+            f"{sum(result['rows'] for result in loaded)} linhas, "
+            f"{len(output_files)} parquet(s) em {dataset_dir}"
+        )
+        return results
+
 
 # 4. O PADRÃO SINGLETON (A FUNÇÃO PÚBLICA)
 # ----------------------------------------
@@ -128,6 +355,9 @@ def get_extraction_factory() -> ExtractionFactory:
         return _factory_instance
 
     # --- Primeira execução (Caso instância for None) ---
+    # O logging é configurado aqui (uma vez), e não na importação do módulo
+    logger = get_logger()
+
     # 1. Carregar a configuração do ficheiro YAML
     logger.debug("Criando nova instância da ExtractionFactory (Singleton)...")
     try:
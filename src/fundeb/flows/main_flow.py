@@ -1,56 +1,56 @@
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Any
-import subprocess  # Para executar o dbt
+from typing import Any
 
 # --- 1. Importações do Prefect ---
 from prefect import flow, task
-from prefect.tasks import task_input_hash  # Para cache
-from datetime import timedelta
 
 # --- 2. Importar os nossos Módulos Internos ---
 # (Nada muda aqui)
-from src.factory.factory import get_extraction_factory
-from src.config.settings import (
+from fundeb.config.settings import (
     DATA_SOURCE_DIR,
-    DATA_BRONZE_DIR,
-    FILE_EXTENSION_MAP,
-    DBT_PROJECT_DIR,
+    INGESTION_MANIFEST_PATH,
+    init,
 )
-from src.utils.file_discovery import find_files_by_pattern
+from fundeb.factory.factory import get_extraction_factory
+from fundeb.flows.process_pool import extract_file, record_results, run_process_pool
+from fundeb.loaders.duckdb_loader import DuckDBLoader
+from fundeb.transforms.forecasting import run_forecasts
+from fundeb.transforms.indicators import run_indicators
+from fundeb.transforms.models import format_timings, run_models
+from fundeb.transforms.reconciliation import run_reconciliation
+from fundeb.utils.file_discovery import get_discovery_index
+from fundeb.utils.manifest import IngestionManifest
+from fundeb.utils.metrics import stage, write_prometheus
 
 # --- 3. Definição das Regras de Descoberta ---
-# (Nada muda aqui)
-DISCOVERY_RULES = [
-    # ... (as mesmas regras de antes) ...
-    {"module_base": "conta_corrente", "pattern": "EXTRATO_BANCARIO_CC*.csv"},
-    {"module_base": "conta_investimentos", "pattern": "INVEST_MES_*.csv"},
-]
+# As regras (DISCOVERY_RULES) ficam em settings.py: o modo watch
+# (flows/watch.py) usa as mesmas regras sem importar o Prefect, e o índice de
+# descoberta (utils/file_discovery.py) aplica todas numa única varredura.
 
 # --- 4. Transformar Funções em Tasks ---
 
 
 # A nossa função de descoberta agora é uma "Task" do Prefect.
-# Usamos 'cache_key_fn' para que ela só re-execute se as regras mudarem.
-@task(
-    name="1. Gerar Lista de Tarefas",
-    cache_key_fn=task_input_hash,
-    cache_expiration=timedelta(minutes=10),
-)
-def generate_task_list() -> List[Dict[str, Any]]:
-    """Gera dinamicamente a lista de tarefas de ficheiros a processar."""
+# Não usamos cache do Prefect aqui: quem decide o que re-executar é o
+# manifesto de ingestão (apenas ficheiros novos ou alterados).
+@task(name="1. Gerar Lista de Tarefas")
+def generate_task_list() -> list[dict[str, Any]]:
+    """
+    Gera dinamicamente a lista de tarefas de ficheiros a processar,
+    ignorando os ficheiros já ingeridos e inalterados segundo o manifesto.
+    """
     print("Iniciando descoberta dinâmica de arquivos...")
-    tasks_to_run = []
-
-    for rule in DISCOVERY_RULES:
-        module = rule["module_base"]
-        pattern = rule["pattern"]
-
-        files = find_files_by_pattern(
-            base_dir=DATA_SOURCE_DIR, module_name=module, file_pattern=pattern
-        )
-
-        for file_path in files:
+    with stage("flow.discovery") as current:
+        manifest = IngestionManifest(INGESTION_MANIFEST_PATH)
+        tasks_to_run = []
+        skipped = 0
+
+        # Uma única varredura (incremental) responde a todas as DISCOVERY_RULES
+        for module, file_path in get_discovery_index(DATA_SOURCE_DIR).discover():
+            if manifest.is_unchanged(file_path):
+                skipped += 1
+                continue
             task = {
                 "module_base": module,
                 "file_path": file_path,
@@ -58,7 +58,13 @@ def generate_task_list() -> List[Dict[str, Any]]:
             }
             tasks_to_run.append(task)
 
-    print(f"Descoberta concluída. {len(tasks_to_run)} arquivos encontrados.")
+        # Persiste eventuais atualizações de mtime (ficheiros tocados mas inalterados)
+        manifest.save()
+        current.rows = len(tasks_to_run)
+    print(
+        f"Descoberta concluída. {len(tasks_to_run)} arquivos novos/alterados, "
+        f"{skipped} inalterados ignorados."
+    )
     return tasks_to_run
 
 
@@ -69,7 +75,7 @@ def generate_task_list() -> List[Dict[str, Any]]:
     retries=2,  # <--- MÁGICA: Tenta novamente 2x se falhar
     retry_delay_seconds=10,
 )
-def process_file_task(task_info: Dict[str, Any]):
+def process_file_task(task_info: dict[str, Any]):
     """
     Task para executar o Extract-Load (EL) de um único ficheiro
     para a camada Bronze.
@@ -81,99 +87,230 @@ def process_file_task(task_info: Dict[str, Any]):
     print(f"\n--- Processando: {filename} (Módulo: {module_name}) ---")
 
     try:
-        # 1. Obter a Fábrica (Singleton, seguro para tasks paralelas)
-        factory = get_extraction_factory()
+        # Extrai em blocos e salva na Camada Bronze (ver process_pool.extract_file)
+        result = extract_file(module_name=module_name, file_path=file_path)
+        print(f"  -> SUCESSO! {result['rows']} linhas salvas em {result['file']}")
+        return result
 
-        # 2. Determinar tipo de extrator
-        file_extension = file_path.suffix.lower()
-        extractor_type = FILE_EXTENSION_MAP.get(file_extension)
+    except Exception as e:
+        print(f"  -> FALHA ao processar {filename}: {e}")
+        # Levanta a exceção para que o Prefect saiba que falhou (e pode tentar de novo)
+        raise
+
+
+# Alternativa ao .map(): um pool de PROCESSOS, sem o GIL no parsing dos CSVs.
+@task(name="2. Processar Ficheiros (Pool de Processos)")
+def process_files_in_pool_task(
+    tasks_info: list[dict[str, Any]], max_workers: int | None = None
+) -> list[dict[str, Any]]:
+    """
+    Task para executar o Extract-Load (EL) de vários ficheiros em paralelo,
+    um processo por núcleo, para a camada Bronze.
+    """
+    print(f"\n--- Processando {len(tasks_info)} ficheiros em pool de processos ---")
+    return run_process_pool(tasks_info, max_workers=max_workers)
 
-        if not extractor_type:
-            raise ValueError(
-                f"Extensão '{file_extension}' não mapeada em FILE_EXTENSION_MAP."
-            )
 
-        # 3. (E)xtract - Construir e executar o extrator
-        extractor = factory.create_extractor(
-            module_name=module_name, extractor_type=extractor_type
+# Alternativa para muitos ficheiros pequenos: um extrator e UMA gravação por
+# módulo (dataset particionado), em vez de um parquet por ficheiro.
+@task(name="2. Processar Ficheiros (Lote por Módulo)")
+def process_files_in_batch_task(
+    tasks_info: list[dict[str, Any]], max_workers: int | None = None
+) -> list[dict[str, Any]]:
+    """
+    Task para executar o Extract-Load (EL) dos ficheiros agrupados por
+    módulo, com ExtractionFactory.extract_many, para a camada Bronze.
+    """
+    by_module: dict[str, list[Path]] = {}
+    for task_info in tasks_info:
+        by_module.setdefault(task_info["module_base"], []).append(
+            task_info["file_path"]
         )
-        data = extractor.extract(str(file_path))
 
-        # 4. (L)oad - Salvar na Camada Bronze
-        output_filename = f"{module_name}_{file_path.stem}.parquet"
-        output_path = DATA_BRONZE_DIR / output_filename
+    factory = get_extraction_factory()
+    results = []
+    for module_name, paths in by_module.items():
+        print(f"\n--- Processando {len(paths)} ficheiros de '{module_name}' (lote) ---")
+        results.extend(
+            factory.extract_many(module_name, paths, max_workers=max_workers)
+        )
+    for result in results:
+        if result["status"] != "success":
+            print(f"  -> FALHA ao processar {result['file']}: {result['error']}")
+    return results
 
-        data.to_parquet(output_path, index=False, engine="pyarrow")
 
-        print(f"  -> SUCESSO! {len(data)} linhas salvas em {output_path.name}")
-        return {"status": "success", "file": filename, "rows": len(data)}
+@task(name="3. Carregar no Data Warehouse (DuckDB)")
+def load_warehouse_task(results: list[dict[str, Any]]) -> dict[str, int]:
+    """
+    Task para carregar (upsert por ficheiro) os parquets da camada Bronze
+    no DuckDB e atualizar as partições hive da camada Silver.
+    """
+    print("\n--- Carregando a camada Bronze no DuckDB ---")
+    with stage("flow.load") as current:
+        loaded = DuckDBLoader().load_results(results)
+        current.rows = sum(loaded.values())
+    for module, rows in loaded.items():
+        print(f"  -> bronze.{module}: {rows} linhas carregadas")
+    return loaded
 
-    except Exception as e:
-        print(f"  -> FALHA ao processar {filename}: {e}")
-        # Levanta a exceção para que o Prefect saiba que falhou (e pode tentar de novo)
-        raise
 
+@task(name="4. Executar Transformações (Silver/Gold)")
+def run_transformations_task(full_refresh: bool = False) -> list[dict[str, Any]]:
+    """
+    Task para executar os modelos Silver/Gold em processo, no DuckDB (sem
+    dbt): só os modelos que dependem de tabelas da Bronze carregadas desde a
+    última execução são recalculados, incluindo os agregados lidos pelo app.
+    """
+    print("\n--- Executando transformações (Silver/Gold) ---")
+    with stage("flow.transform") as current:
+        results = run_models(full_refresh=full_refresh)
+        current.rows = sum(result.rows or 0 for result in results)
+    print(format_timings(results))
+    return [vars(result) for result in results]
 
-@task(name="3. Executar Transformação (dbt)")
-def run_dbt_transformation():
+
+@task(name="5. Atualizar Previsões (Gold)")
+def run_forecasts_task(full_refresh: bool = False) -> dict[str, Any]:
     """
-    Task para disparar o dbt build, transformando
-    Bronze -> Silver -> Gold.
+    Task para atualizar as previsões de 12 meses dos repasses: só as séries
+    cujos dados mudaram são reajustadas (ver transforms/forecasting.py).
     """
-    print("\n--- Iniciando transformação dbt ---")
-    try:
-        # Executa o 'dbt build' dentro do diretório do projeto dbt
-        result = subprocess.run(
-            ["dbt", "build"],
-            cwd=DBT_PROJECT_DIR,  # <--- Importante: define o diretório de trabalho
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-        print("Saída do dbt:\n", result.stdout)
-        print("--- Transformação dbt concluída com sucesso ---")
-        return {"status": "success"}
-    except subprocess.CalledProcessError as e:
-        print("--- FALHA NA TRANSFORMAÇÃO DBT ---")
-        print("Erro:\n", e.stderr)
-        raise
-    except FileNotFoundError:
-        print("--- FALHA NA TRANSFORMAÇÃO DBT ---")
-        print("Erro: 'dbt' não encontrado. Está instalado e no PATH?")
-        raise
+    print("\n--- Atualizando previsões dos repasses ---")
+    summary = run_forecasts(full_refresh=full_refresh)
+    print(summary)
+    return vars(summary)
+
+
+@task(name="6. Conciliar Repasses (Gold)")
+def run_reconciliation_task() -> dict[str, Any]:
+    """
+    Task para conciliar os repasses do FNDE, decêndio a decêndio, com os
+    lançamentos dos extratos (ver transforms/reconciliation.py).
+    """
+    print("\n--- Conciliando repasses com os extratos ---")
+    summary = run_reconciliation()
+    print(summary)
+    return vars(summary)
+
+
+@task(name="7. Calcular Indicadores (Gold)")
+def run_indicators_task(full_refresh: bool = False) -> dict[str, Any]:
+    """
+    Task para calcular os indicadores legais do FUNDEB (70%, 90%, superávit
+    e VAAR) de todos os períodos: só as linhas com entradas novas ou
+    alteradas são recalculadas (ver transforms/indicators.py).
+    """
+    print("\n--- Calculando os indicadores ---")
+    summary = run_indicators(full_refresh=full_refresh)
+    print(summary)
+    return vars(summary)
 
 
 # --- 5. O Flow (O Orquestrador) ---
 # Esta função substitui o nosso 'main()'
-@flow(name="Pipeline ELT Financeiro (Bronze & dbt)")
-def financial_elt_flow():
+@flow(name="Pipeline ELT Financeiro (Bronze, Silver & Gold)")
+def financial_elt_flow(
+    executor: str = "prefect",
+    max_workers: int | None = None,
+    full_refresh: bool = False,
+):
     """
     Orquestra o pipeline completo:
     1. Descobre os ficheiros a processar.
     2. Executa a extração e carga (EL) para a camada Bronze EM PARALELO.
-    3. Após SUCESSO, dispara a transformação (T) com dbt.
+    3. Carrega a camada Bronze no Data Warehouse (DuckDB).
+    4. Após SUCESSO, executa as transformações (T) Silver/Gold no DuckDB,
+       só nos modelos afetados pelas novas cargas.
+    5. Atualiza as previsões de 12 meses das séries alteradas.
+    6. Concilia os repasses do FNDE com os lançamentos dos extratos.
+    7. Calcula os indicadores legais com as tabelas Gold atualizadas.
+
+    Args:
+        executor: "prefect" (task runner do Prefect, uma task por ficheiro),
+            "process_pool" (pool de processos, indicado para backlogs
+            grandes, já que o parsing é CPU-bound) ou "batch" (um dataset
+            por módulo, indicado para muitos ficheiros pequenos)
+        max_workers: Número de processos do pool (padrão: os.cpu_count())
+            ou de threads de leitura do lote
+        full_refresh: Reexecuta todos os modelos Silver/Gold
     """
     print("Iniciando o Flow 'Pipeline ELT Financeiro'...")
+    init()
+
+    try:
+        # Etapa 1: Descobrir ficheiros
+        tasks_to_process = generate_task_list()
+
+        if not tasks_to_process:
+            print("Nenhum ficheiro novo encontrado. Flow concluído.")
+            if not full_refresh:
+                return None
+            model_results = run_transformations_task(full_refresh)
+            run_forecasts_task(full_refresh)
+            run_reconciliation_task()
+            run_indicators_task(full_refresh)
+            return model_results
+
+        # Etapa 2: Processar ficheiros
+        if executor == "process_pool":
+            # Um único task do Prefect que distribui os ficheiros por processos
+            results = process_files_in_pool_task(tasks_to_process, max_workers)
+        elif executor == "batch":
+            # Um extrator e uma gravação por módulo
+            results = process_files_in_batch_task(tasks_to_process, max_workers)
+        else:
+            # .map() executa a 'process_file_task' para CADA item na lista.
+            # O Prefect irá executá-los EM PARALELO (conforme os limites do worker)
+            extraction_results = process_file_task.map(tasks_to_process)
+            results = []
+            for future, task_info in zip(
+                extraction_results, tasks_to_process, strict=True
+            ):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(
+                        {
+                            "status": "error",
+                            "file": task_info["filename"],
+                            "error": str(e),
+                        }
+                    )
+
+        # Etapa 3: Carregar os parquets extraídos no Data Warehouse (DuckDB).
+        # Vem antes do manifesto: se a carga falhar, os ficheiros são reprocessados.
+        load_warehouse_task(results)
+
+        # Etapa 3.1: Registrar no manifesto os ficheiros ingeridos com sucesso,
+        # para que as próximas execuções os ignorem enquanto não mudarem.
+        # Falhas não impedem o registro dos sucessos; são reportadas depois.
+        failures = record_results(results)
+        if failures:
+            raise RuntimeError(
+                f"{len(failures)} ficheiro(s) falharam: "
+                + ", ".join(failure["file"] for failure in failures)
+            )
 
-    # Etapa 1: Descobrir ficheiros
-    tasks_to_process = generate_task_list()
+        # Etapa 4: Executar as transformações Silver/Gold (inclui os agregados
+        # usados pelo app). Esta task só começa DEPOIS que todas as extrações
+        # terminaram com sucesso (os resultados já foram coletados e registrados)
+        model_results = run_transformations_task(full_refresh)
 
-    if not tasks_to_process:
-        print("Nenhum ficheiro novo encontrado. Flow concluído.")
-        return
+        # Etapa 5: Previsões de 12 meses (só as séries com dados novos)
+        run_forecasts_task(full_refresh)
 
-    # Etapa 2: Processar ficheiros
-    # .map() executa a 'process_file_task' para CADA item na lista.
-    # O Prefect irá executá-los EM PARALELO (conforme os limites do seu worker)
-    extraction_results = process_file_task.map(tasks_to_process)
+        # Etapa 6: Conciliação dos repasses por decêndio
+        run_reconciliation_task()
 
-    # Etapa 3: Executar dbt
-    # Esta task só começa DEPOIS que todas as tasks de 'extraction_results'
-    # terminarem com sucesso (gestão de dependências!)
-    dbt_results = run_dbt_transformation(wait_for=[extraction_results])
+        # Etapa 7: Indicadores legais (só as linhas com entradas novas)
+        run_indicators_task(full_refresh)
 
-    print("--- Flow 'Pipeline ELT Financeiro' concluído ---")
-    return dbt_results
+        print("--- Flow 'Pipeline ELT Financeiro' concluído ---")
+        return model_results
+    finally:
+        # Métricas das etapas para o node exporter, com sucesso ou falha
+        write_prometheus()
 
 
 # --- Ponto de Entrada para Execução ---
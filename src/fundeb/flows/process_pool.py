@@ -0,0 +1,243 @@
+"""
+Extração paralela para a camada Bronze com um pool de processos.
+
+O parsing de CSV é CPU-bound e, em threads, fica serializado pelo GIL. Aqui
+cada worker é um processo que recebe apenas (módulo, caminho do arquivo),
+constrói o seu próprio extrator via get_extraction_factory e devolve um
+resumo (linhas, tempos, impressão digital do arquivo). Pode ser usado pelo
+flow do Prefect ou diretamente pela linha de comando:
+
+    python -m fundeb.flows.process_pool conta_corrente data/raw/... -w 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from fundeb.config.settings import (
+    DATA_BRONZE_DIR,
+    FILE_EXTENSION_MAP,
+    INGESTION_MANIFEST_PATH,
+    init,
+)
+from fundeb.factory.factory import get_extraction_factory
+from fundeb.loaders.duckdb_loader import DuckDBLoader
+from fundeb.utils.manifest import IngestionManifest, file_sha256
+from fundeb.utils.metrics import get_metrics, stage, write_prometheus
+
+
+def extract_file(
+    module_name: str, file_path: str | Path, destiny_dir: str | Path = DATA_BRONZE_DIR
+) -> dict[str, Any]:
+    """
+    Executa o Extract-Load (EL) de um único arquivo para a camada Bronze
+    Args:
+        module_name (str): Módulo do extractors.yaml (ex: 'conta_corrente')
+        file_path (str | Path): Caminho do arquivo de origem
+        destiny_dir (str | Path): Diretório de destino dos parquets
+    Returns:
+        dict[str, Any]: Resumo da execução (linhas, tempos, impressão digital)
+    Raises:
+        ValueError: Extensão não mapeada em FILE_EXTENSION_MAP
+    """
+    start = time.perf_counter()
+    file_path = Path(file_path)
+
+    # Captura a "impressão digital" do arquivo ANTES da leitura.
+    # Se ele mudar durante a extração, a próxima execução o reprocessa.
+    with stage("fingerprint", module_name, file_path) as current:
+        stat = file_path.stat()
+        sha256 = file_sha256(file_path)
+        current.bytes = stat.st_size
+
+    file_extension = file_path.suffix.lower()
+    extractor_type = FILE_EXTENSION_MAP.get(file_extension)
+    if not extractor_type:
+        raise ValueError(
+            f"Extensão '{file_extension}' não mapeada em FILE_EXTENSION_MAP."
+        )
+
+    # Fábrica singleton: uma por processo
+    extractor = get_extraction_factory().create_extractor(
+        module_name=module_name, extractor_type=extractor_type
+    )
+
+    output_path = Path(destiny_dir) / f"{module_name}_{file_path.stem}.parquet"
+    extract_start = time.perf_counter()
+    rows = extractor.stream_to_parquet(file_path, output_path)
+    end = time.perf_counter()
+    # Layout dimensão + fatos: parquet da dimensão gravado ao lado
+    layout = extractor.layout
+
+    return {
+        "status": "success",
+        "module_base": module_name,
+        "file": file_path.name,
+        "file_path": str(file_path),
+        "rows": rows,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256,
+        "output_path": str(output_path),
+        "dimension": layout.dimension if layout else None,
+        "dimension_path": str(layout.dimension_path(output_path)) if layout else None,
+        "extract_seconds": round(end - extract_start, 4),
+        "total_seconds": round(end - start, 4),
+        "pid": os.getpid(),
+    }
+
+
+def _extract_file_safe(
+    module_name: str, file_path: str, destiny_dir: str
+) -> dict[str, Any]:
+    """
+    Versão do extract_file que devolve o erro em vez de lançá-lo. As
+    métricas do worker voltam junto ('metrics') e são somadas no processo
+    principal por run_process_pool.
+    """
+    try:
+        result = extract_file(module_name, file_path, destiny_dir)
+    except Exception as e:
+        result = {
+            "status": "error",
+            "module_base": module_name,
+            "file": Path(file_path).name,
+            "file_path": str(file_path),
+            "error": f"{type(e).__name__}: {e}",
+            "pid": os.getpid(),
+        }
+    result["metrics"] = get_metrics().collect(reset=True)
+    return result
+
+
+def run_process_pool(
+    tasks: list[dict[str, Any]],
+    max_workers: int | None = None,
+    destiny_dir: str | Path = DATA_BRONZE_DIR,
+) -> list[dict[str, Any]]:
+    """
+    Extrai vários arquivos em paralelo, um processo por núcleo
+    Args:
+        tasks (list[dict]): Itens com 'module_base' e 'file_path'
+            (o mesmo formato gerado por generate_task_list)
+        max_workers (int | None): Número de processos (padrão: os.cpu_count())
+        destiny_dir (str | Path): Diretório de destino dos parquets
+    Returns:
+        list[dict[str, Any]]: Um resumo por arquivo, na ordem de 'tasks';
+            falhas vêm com status 'error' e a mensagem em 'error'
+    """
+    if not tasks:
+        return []
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    start = time.perf_counter()
+    results: list[dict[str, Any] | None] = [None] * len(tasks)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _extract_file_safe,
+                task["module_base"],
+                str(task["file_path"]),
+                str(destiny_dir),
+            ): index
+            for index, task in enumerate(tasks)
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            get_metrics().merge(result.pop("metrics"))
+            results[futures[future]] = result
+            if result["status"] == "success":
+                print(
+                    f"  -> SUCESSO! {result['file']}: {result['rows']} linhas "
+                    f"em {result['total_seconds']:.2f}s (pid {result['pid']})"
+                )
+            else:
+                print(f"  -> FALHA ao processar {result['file']}: {result['error']}")
+
+    elapsed = time.perf_counter() - start
+    rows = sum(result.get("rows", 0) for result in results)
+    print(
+        f"Pool concluído: {len(tasks)} arquivos, {rows} linhas em {elapsed:.2f}s "
+        f"com {max_workers} processos ({len(tasks) / elapsed:.1f} arquivos/s)."
+    )
+    return results
+
+
+def record_results(
+    results: list[dict[str, Any]], manifest_path: str | Path = INGESTION_MANIFEST_PATH
+) -> list[dict[str, Any]]:
+    """
+    Registra no manifesto de ingestão os arquivos processados com sucesso
+    Args:
+        results (list[dict]): Resumos devolvidos por extract_file
+        manifest_path (str | Path): Caminho do manifesto
+    Returns:
+        list[dict[str, Any]]: Resumos das falhas (não registradas)
+    """
+    manifest = IngestionManifest(manifest_path)
+    failures = []
+    for result in results:
+        if result["status"] != "success":
+            failures.append(result)
+            continue
+        manifest.record(
+            file_path=result["file_path"],
+            size=result["size"],
+            mtime_ns=result["mtime_ns"],
+            sha256=result["sha256"],
+            rows=result["rows"],
+            output_path=result["output_path"],
+        )
+    manifest.save()
+    return failures
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Extração paralela (multiprocessos) para a camada Bronze."
+    )
+    parser.add_argument("module_name", help="Módulo do extractors.yaml")
+    parser.add_argument(
+        "paths", nargs="+", type=Path, help="Arquivos ou diretórios de origem"
+    )
+    parser.add_argument("-p", "--pattern", default="*", help="Padrão nos diretórios")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument(
+        "-o", "--output-dir", type=Path, default=DATA_BRONZE_DIR, help="Destino"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Ignora o manifesto de ingestão"
+    )
+    args = parser.parse_args()
+    init()
+
+    files = []
+    for path in args.paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob(args.pattern) if p.is_file()))
+        else:
+            files.append(path)
+    if not args.force:
+        files = IngestionManifest(INGESTION_MANIFEST_PATH).filter_changed(files)
+    if not files:
+        print("Nenhum arquivo novo ou alterado.")
+        return
+
+    tasks = [{"module_base": args.module_name, "file_path": path} for path in files]
+    results = run_process_pool(tasks, args.workers, args.output_dir)
+    # Mesma ordem do flow: warehouse antes do manifesto, para que uma carga
+    # que falhe seja refeita na próxima execução
+    DuckDBLoader().load_results(results)
+    failures = record_results(results)
+    write_prometheus()
+    if failures:
+        raise SystemExit(f"{len(failures)} arquivo(s) falharam.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Modo watch: ingestão contínua a partir de eventos do sistema de arquivos.
+
+Em vez de varrer DATA_RAW_DIR a cada execução do flow, um processo de longa
+duração assina os eventos do sistema de arquivos (inotify no Linux, via
+watchdog) e ingere só os arquivos que chegaram. Cada arquivo só é
+processado depois de um período sem eventos (debounce), para não ler uma
+cópia pela metade. Os arquivos liberados são casados com DISCOVERY_RULES e
+filtrados pelo manifesto de ingestão. Depois, a cada rajada:
+- extração em lote por módulo (ExtractionFactory.extract_many);
+- carga no DuckDB;
+- registro no manifesto;
+- modelos Silver/Gold afetados (inclui os agregados lidos pelo app);
+- previsões das séries alteradas;
+- conciliação dos repasses com os extratos;
+- indicadores legais dos períodos com dados novos.
+
+    python -m fundeb.flows.watch --debounce 2
+
+Requer o pacote opcional watchdog (uv pip install .[watch]).
+"""
+
+import argparse
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from fundeb.config.logger import get_logger
+from fundeb.config.settings import (
+    DATA_BRONZE_DIR,
+    DATA_RAW_DIR,
+    DISCOVERY_RULES,
+    INGESTION_MANIFEST_PATH,
+    init,
+)
+from fundeb.factory.factory import get_extraction_factory
+from fundeb.flows.process_pool import record_results
+from fundeb.loaders.duckdb_loader import DuckDBLoader
+from fundeb.transforms.forecasting import run_forecasts
+from fundeb.transforms.indicators import run_indicators
+from fundeb.transforms.models import run_models
+from fundeb.transforms.reconciliation import run_reconciliation
+from fundeb.utils.file_discovery import match_module
+from fundeb.utils.manifest import IngestionManifest
+from fundeb.utils.metrics import write_prometheus
+
+# Arquivos ainda sendo escritos/baixados por outros programas
+TEMPORARY_SUFFIXES = (".tmp", ".part", ".partial", ".crdownload", ".swp")
+
+
+def match_rule(
+    file_path: str | Path,
+    rules: list[dict[str, str]] = DISCOVERY_RULES,
+    base_dir: str | Path = DATA_RAW_DIR,
+) -> str | None:
+    """
+    Módulo do primeiro DISCOVERY_RULES que casa com um arquivo
+    Args:
+        file_path (str | Path): Arquivo sob base_dir
+        rules (list[dict]): Regras com 'module_base', 'pattern' e,
+            opcionalmente, 'folder' (padrão: o próprio módulo)
+        base_dir (str | Path): Raiz dos arquivos brutos
+    Returns:
+        str | None: Módulo (ex: 'conta_corrente') ou None se nenhuma casar
+    """
+    file_path = Path(file_path)
+    try:
+        folders = file_path.parent.relative_to(base_dir).parts
+    except ValueError:
+        return None
+    # Mesmo critério do índice de descoberta usado pelo flow
+    return match_module(folders, file_path.name, rules)
+
+
+class PendingFiles:
+    """
+    Arquivos com eventos recentes. Um arquivo é liberado quando fica
+    'debounce' segundos sem novos eventos (cópia ou download concluído).
+    """
+
+    def __init__(self, debounce: float):
+        self.debounce = debounce
+        self._last_event: dict[Path, float] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, file_path: Path) -> None:
+        """Registra (ou adia) um arquivo a cada evento"""
+        with self._lock:
+            self._last_event[file_path] = time.monotonic()
+
+    def ready(self) -> list[Path]:
+        """Retira e devolve os arquivos sem eventos há 'debounce' segundos"""
+        now = time.monotonic()
+        with self._lock:
+            ready = [
+                path
+                for path, last_event in self._last_event.items()
+                if now - last_event >= self.debounce
+            ]
+            for path in ready:
+                del self._last_event[path]
+        return sorted(ready)
+
+
+class RawFileHandler:
+    """
+    Recebe os eventos do watchdog (método dispatch) e marca como pendentes
+    os arquivos criados, alterados, fechados ou movidos para DATA_RAW_DIR.
+    """
+
+    EVENT_TYPES = {"created", "modified", "closed", "moved"}
+
+    def __init__(self, pending: PendingFiles):
+        self.pending = pending
+
+    def dispatch(self, event: Any) -> None:
+        if event.is_directory or event.event_type not in self.EVENT_TYPES:
+            return
+        path = Path(getattr(event, "dest_path", "") or event.src_path)
+        if path.name.startswith((".", "~")) or path.name.endswith(TEMPORARY_SUFFIXES):
+            return
+        self.pending.touch(path)
+
+
+def ingest(
+    file_paths: list[Path],
+    raw_dir: str | Path = DATA_RAW_DIR,
+    destiny_dir: str | Path = DATA_BRONZE_DIR,
+) -> list[dict[str, Any]]:
+    """
+    Ingere os arquivos liberados pelo debounce: descoberta, extração em lote
+    por módulo, carga no DuckDB, manifesto, modelos Silver/Gold, previsões,
+    conciliação e indicadores
+    Args:
+        file_paths (list[Path]): Arquivos que receberam eventos
+        raw_dir (str | Path): Raiz dos arquivos brutos (DISCOVERY_RULES)
+        destiny_dir (str | Path): Diretório da camada Bronze
+    Returns:
+        list[dict[str, Any]]: Resumos de extract_many ([] se nada a ingerir)
+    """
+    logger = get_logger()
+    manifest = IngestionManifest(INGESTION_MANIFEST_PATH)
+    by_module: dict[str, list[Path]] = {}
+    for file_path in file_paths:
+        if not file_path.is_file():  # removido ou renomeado depois do evento
+            continue
+        module_name = match_rule(file_path, base_dir=raw_dir)
+        if module_name is None or manifest.is_unchanged(file_path):
+            continue
+        by_module.setdefault(module_name, []).append(file_path)
+    manifest.save()
+    if not by_module:
+        return []
+
+    factory = get_extraction_factory()
+    results = []
+    for module_name, paths in by_module.items():
+        logger.info(f"Ingerindo {len(paths)} arquivo(s) novos de '{module_name}'")
+        results.extend(factory.extract_many(module_name, paths, destiny_dir))
+
+    # Mesma ordem do flow: warehouse antes do manifesto
+    DuckDBLoader().load_results(results)
+    failures = record_results(results, INGESTION_MANIFEST_PATH)
+    for failure in failures:
+        logger.error(f"Falha ao ingerir {failure['file']}: {failure['error']}")
+    if len(failures) < len(results):
+        run_models()
+        run_forecasts()
+        run_reconciliation()
+        run_indicators()
+    return results
+
+
+def watch(
+    raw_dir: str | Path = DATA_RAW_DIR,
+    debounce: float = 2.0,
+    poll_interval: float = 0.5,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Observa raw_dir (recursivamente) e ingere os arquivos novos até 'stop'
+    Args:
+        raw_dir (str | Path): Diretório observado
+        debounce (float): Segundos sem eventos para liberar um arquivo
+        poll_interval (float): Intervalo de verificação dos pendentes
+        stop (threading.Event | None): Evento de parada (padrão: Ctrl+C)
+    Raises:
+        ImportError: watchdog não instalado
+    """
+    logger = get_logger()
+    try:
+        from watchdog.observers import Observer
+    except ImportError as err:
+        msg = "Modo watch requer o pacote watchdog (uv pip install .[watch])"
+        logger.error(msg)
+        raise ImportError(msg) from err
+
+    raw_dir = Path(raw_dir)
+    stop = stop or threading.Event()
+    pending = PendingFiles(debounce)
+    observer = Observer()
+    observer.schedule(RawFileHandler(pending), str(raw_dir), recursive=True)
+    observer.start()
+    logger.info(f"Observando {raw_dir} (debounce de {debounce:.1f}s)...")
+
+    try:
+        while not stop.wait(poll_interval):
+            ready = pending.ready()
+            if not ready:
+                continue
+            try:
+                ingest(ready, raw_dir=raw_dir)
+            except Exception as e:
+                # O daemon continua: os arquivos falhos não entram no
+                # manifesto e voltam a ser ingeridos no próximo evento
+                logger.error(f"Erro ao ingerir {len(ready)} arquivo(s): {e}")
+            # Métricas acumuladas desde o início do daemon (node exporter)
+            write_prometheus()
+    except KeyboardInterrupt:
+        logger.info("Modo watch interrompido.")
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Ingestão contínua (modo watch) dos arquivos brutos."
+    )
+    parser.add_argument("--raw-dir", type=Path, default=DATA_RAW_DIR)
+    parser.add_argument(
+        "--debounce", type=float, default=2.0, help="Segundos sem eventos"
+    )
+    args = parser.parse_args()
+    init()
+    watch(args.raw_dir, args.debounce)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+"""
+Carga da camada Bronze no Data Warehouse (DuckDB).
+
+Os parquets gerados pelos extratores (um por arquivo de origem) são
+carregados com um único INSERT ... SELECT sobre read_parquet, sem inserções
+linha a linha, na tabela bronze.<módulo> do DUCKDB_PATH. Cada linha recebe a
+chave (file_name, line_number): recarregar um arquivo (ex: o extrato de um
+mês reprocessado) substitui todas as suas linhas numa única transação.
+
+Cada carga fica registrada em meta.loads (id crescente, tabela e partições
+tocadas): as transformações (fundeb.transforms.runner) reexecutam só os
+modelos que dependem de tabelas carregadas depois da sua última execução.
+
+Em seguida, as partições afetadas são exportadas em diretórios estilo hive
+(<DATA_SILVER_DIR>/<módulo>/uf=AP/ano=2025/mes=1/) e expostas como a view
+silver.<módulo>, para que dashboards e previsões consultem o warehouse em
+vez de reler os arquivos brutos. São afetadas as partições dos arquivos
+antes e depois da carga: uma partição que o arquivo deixou de ocupar é
+regravada sem as linhas antigas (ou removida, se ficou vazia):
+
+    python -m fundeb.loaders.duckdb_loader conta_corrente data/bronze/*.parquet
+"""
+
+import argparse
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+import duckdb
+
+from fundeb.config.logger import get_logger
+from fundeb.config.settings import DATA_SILVER_DIR, DUCKDB_PATH, init
+from fundeb.factory.factory import get_extraction_factory
+
+# Chave natural de cada linha carregada: arquivo de origem + linha no arquivo
+KEY_COLUMNS = ["file_name", "line_number"]
+
+# Registro das cargas (uma linha por carga, com id crescente)
+LOADS_TABLE = "meta.loads"
+
+# Valor de uma partição nula nos diretórios hive (o mesmo do COPY do DuckDB)
+HIVE_NULL = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _parquet_files(paths: list[str | Path]) -> list[str]:
+    """
+    Expande diretórios de dataset (ex: ExcelExtractor, extract_many) nos
+    seus parquets, inclusive em subdiretórios de partição
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(str(p) for p in sorted(path.rglob("*.parquet")))
+        else:
+            files.append(str(path))
+    return files
+
+
+def _quote(identifier: str) -> str:
+    """Identificador SQL entre aspas duplas"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def partition_filter(
+    expressions: list[str], partitions: list[dict[str, Any]]
+) -> tuple[str, list[Any]]:
+    """
+    Condição SQL que seleciona as linhas das partições informadas
+    (IS NOT DISTINCT FROM: partições com chave nula também casam)
+    Args:
+        expressions (list[str]): Expressão SQL de cada coluna de partição, na
+            ordem das chaves das partições
+        partitions (list[dict[str, Any]]): Partições (coluna -> valor)
+    Returns:
+        tuple[str, list[Any]]: Condição (com parâmetros ?) e os parâmetros
+    """
+    if not partitions:
+        return "FALSE", []
+    match = " AND ".join(f"{expr} IS NOT DISTINCT FROM ?" for expr in expressions)
+    condition = " OR ".join(f"({match})" for _ in partitions)
+    return condition, [value for p in partitions for value in p.values()]
+
+
+def _hive_path(partition: dict[str, Any]) -> Path:
+    """Diretório relativo de uma partição (ex: uf=AP/ano=2025/mes=1)"""
+    return Path(
+        *(
+            f"{name}={HIVE_NULL if value is None else quote(str(value), safe='')}"
+            for name, value in partition.items()
+        )
+    )
+
+
+class DuckDBLoader:
+    """
+    Carrega parquets da camada Bronze no DuckDB e mantém as partições hive.
+
+    As colunas de partição de cada módulo vêm da chave 'warehouse' do
+    extractors.yaml (nome -> expressão SQL sobre as colunas do parquet).
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = DUCKDB_PATH,
+        partitions_dir: str | Path = DATA_SILVER_DIR,
+    ):
+        self.logger = get_logger()
+        self.db_path = Path(db_path)
+        self.partitions_dir = Path(partitions_dir)
+
+    def partition_columns(self, module_name: str) -> dict[str, str]:
+        """
+        Lê as colunas de partição do módulo no extractors.yaml
+        Args:
+            module_name (str): Módulo do extractors.yaml (ex: 'conta_corrente')
+        Returns:
+            dict[str, str]: Nome da coluna de partição -> expressão SQL
+        """
+        module_config = get_extraction_factory().config.get(module_name, {})
+        return dict(module_config.get("warehouse", {}).get("partition_by", {}))
+
+    def sort_columns(self, module_name: str) -> list[str]:
+        """
+        Ordem das linhas nas partições hive: a chave 'sort_by' do módulo no
+        extractors.yaml, seguida de KEY_COLUMNS
+        Args:
+            module_name (str): Módulo do extractors.yaml (ex: 'folha')
+        Returns:
+            list[str]: Colunas do ORDER BY
+        """
+        module_config = get_extraction_factory().config.get(module_name, {})
+        sort_by = list(module_config.get("warehouse", {}).get("sort_by", []))
+        return list(dict.fromkeys([*sort_by, *KEY_COLUMNS]))
+
+    @staticmethod
+    def _select_sql(partition_by: dict[str, str], columns: list[str]) -> str:
+        """SELECT sobre os parquets (parâmetro ?) com chave e partições"""
+        # Partições que já são colunas do parquet (ex: uf: UF) não são
+        # repetidas: identificadores no DuckDB não diferenciam maiúsculas
+        derived = {
+            name: expression
+            for name, expression in partition_by.items()
+            if expression.lower() != name.lower()
+        }
+        partitions = "".join(
+            f", {expression} AS {_quote(name)}" for name, expression in derived.items()
+        )
+        # Datasets de extract_many já trazem as partições: são recalculadas
+        present = {column.lower() for column in columns}
+        excluded = ["filename", "file_row_number"] + [
+            _quote(name) for name in derived if name.lower() in present
+        ]
+        # line_number: posição da linha no arquivo de origem (1 = 1ª linha de
+        # dados). Um arquivo pode ocupar vários parquets (uma planilha cada).
+        return (
+            f"SELECT * EXCLUDE ({', '.join(excluded)}), "
+            "row_number() OVER (PARTITION BY file_name "
+            "ORDER BY filename, file_row_number) AS line_number"
+            f"{partitions} "
+            "FROM read_parquet(?, filename = true, file_row_number = true, "
+            "union_by_name = true, hive_partitioning = false)"
+        )
+
+    def load(
+        self,
+        module_name: str,
+        parquet_paths: list[str | Path],
+        partition_by: dict[str, str] | None = None,
+    ) -> int:
+        """
+        Carrega (ou recarrega) parquets da camada Bronze em bronze.<módulo>
+        Args:
+            module_name (str): Módulo do extractors.yaml (nome da tabela)
+            parquet_paths (list[str | Path]): Parquets (ou diretórios de
+                dataset) gerados pelos extratores
+            partition_by (dict[str, str] | None): Colunas de partição
+                (padrão: a chave 'warehouse' do módulo no extractors.yaml)
+        Returns:
+            int: Número de linhas carregadas
+        Raises:
+            ValueError: Nenhum parquet informado
+        """
+        files = _parquet_files(parquet_paths)
+        if not files:
+            msg = f"Nenhum parquet para carregar no módulo '{module_name}'"
+            self.logger.error(msg)
+            raise ValueError(msg)
+        if partition_by is None:
+            partition_by = self.partition_columns(module_name)
+
+        table = f"bronze.{_quote(module_name)}"
+        incoming = (
+            "SELECT DISTINCT file_name FROM read_parquet(?, hive_partitioning = false)"
+        )
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with duckdb.connect(str(self.db_path)) as con:
+            columns = [
+                row[0]
+                for row in con.execute(
+                    "DESCRIBE SELECT * FROM read_parquet(?, union_by_name = true, "
+                    "hive_partitioning = false)",
+                    [files],
+                ).fetchall()
+            ]
+            select = self._select_sql(partition_by, columns)
+            con.execute("CREATE SCHEMA IF NOT EXISTS bronze")
+            con.execute("BEGIN TRANSACTION")
+            try:
+                con.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} AS {select} LIMIT 0", [files]
+                )
+                # Partições ocupadas pelos arquivos antes da carga: as que eles
+                # deixarem de ocupar também são regravadas
+                previous = self._file_partitions(con, table, partition_by, files)
+                # Upsert por arquivo: as linhas antigas dos mesmos arquivos
+                # saem e as novas entram na mesma transação
+                deleted = con.execute(
+                    f"DELETE FROM {table} WHERE file_name IN ({incoming})", [files]
+                ).fetchone()[0]
+                rows = con.execute(
+                    f"INSERT INTO {table} BY NAME {select}", [files]
+                ).fetchone()[0]
+                current = self._file_partitions(con, table, partition_by, files)
+                partitions = sorted(
+                    {tuple(p.items()): p for p in previous + current}.values(),
+                    key=lambda p: [(value is None, str(value)) for value in p.values()],
+                )
+                self._record_load(con, module_name, files, rows, partitions)
+                con.execute("COMMIT")
+            except Exception:
+                con.execute("ROLLBACK")
+                raise
+
+            self.logger.info(
+                f"{table}: {rows} linhas carregadas de {len(files)} parquet(s) "
+                f"({deleted} substituídas)"
+            )
+            self.export_partitions(con, module_name, partition_by, partitions)
+        return rows
+
+    @staticmethod
+    def _file_partitions(
+        con: duckdb.DuckDBPyConnection,
+        table: str,
+        partition_by: dict[str, str],
+        files: list[str],
+    ) -> list[dict[str, Any]]:
+        """Partições das linhas dos arquivos da carga presentes em 'table'"""
+        if not partition_by:
+            return []
+        columns = ", ".join(map(_quote, partition_by))
+        cursor = con.execute(
+            f"SELECT DISTINCT {columns} FROM {table} WHERE file_name IN "
+            "(SELECT DISTINCT file_name FROM read_parquet(?, "
+            "hive_partitioning = false))",
+            [files],
+        )
+        # Chaves com os nomes de partition_by (a coluna pode ser ex: 'UF')
+        return [
+            dict(zip(partition_by, row, strict=True)) for row in cursor.fetchall()
+        ]
+
+    def _record_load(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        module_name: str,
+        files: list[str],
+        rows: int,
+        partitions: list[dict[str, Any]],
+    ) -> None:
+        """Registra a carga (e as partições tocadas) em meta.loads"""
+        con.execute("CREATE SCHEMA IF NOT EXISTS meta")
+        con.execute("CREATE SEQUENCE IF NOT EXISTS meta.load_id")
+        con.execute(
+            f"CREATE TABLE IF NOT EXISTS {LOADS_TABLE} (load_id BIGINT, "
+            "table_name VARCHAR, files INTEGER, rows BIGINT, partitions JSON, "
+            "loaded_at TIMESTAMP)"
+        )
+        con.execute(
+            f"INSERT INTO {LOADS_TABLE} VALUES "
+            "(nextval('meta.load_id'), ?, ?, ?, ?, now()::TIMESTAMP)",
+            [
+                f"bronze.{module_name}",
+                len(files),
+                rows,
+                json.dumps(partitions, default=str),
+            ],
+        )
+
+    def export_partitions(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        module_name: str,
+        partition_by: dict[str, str],
+        partitions: list[dict[str, Any]],
+    ) -> None:
+        """
+        Regrava, em diretórios estilo hive, as partições tocadas pela carga
+        (ordenadas por sort_columns), remove as que ficaram vazias e (re)cria
+        a view silver.<módulo> sobre elas
+        Args:
+            con (duckdb.DuckDBPyConnection): Conexão aberta com o warehouse
+            module_name (str): Módulo (nome da tabela)
+            partition_by (dict[str, str]): Colunas de partição
+            partitions (list[dict[str, Any]]): Partições tocadas (coluna ->
+                valor, None para nulo), antes e depois da carga
+        """
+        table = f"bronze.{_quote(module_name)}"
+        order_by = ", ".join(map(_quote, self.sort_columns(module_name)))
+        module_dir = self.partitions_dir / module_name
+        # Grava ao lado e troca diretório a diretório: leitores nunca veem
+        # uma partição pela metade
+        staging_dir = self.partitions_dir / f".{module_name}.tmp"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+
+        try:
+            if partition_by and partitions:
+                columns = ", ".join(map(_quote, partition_by))
+                touched, params = partition_filter(
+                    [_quote(name) for name in partition_by],
+                    partitions,
+                )
+                con.execute(
+                    f"COPY (SELECT * FROM {table} WHERE {touched} "
+                    f"ORDER BY {order_by}) "
+                    f"TO '{staging_dir}' (FORMAT parquet, PARTITION_BY ({columns}))",
+                    params,
+                )
+            elif not partition_by:
+                con.execute(
+                    f"COPY {table} TO '{staging_dir / 'data_0.parquet'}' "
+                    "(FORMAT parquet)"
+                )
+
+            module_dir.mkdir(parents=True, exist_ok=True)
+            leaf_dirs = {
+                data_file.parent.relative_to(staging_dir)
+                for data_file in staging_dir.rglob("*.parquet")
+            }
+            for leaf_dir in sorted(leaf_dirs):
+                target_dir = module_dir / leaf_dir
+                shutil.rmtree(target_dir, ignore_errors=True)
+                target_dir.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(staging_dir / leaf_dir, target_dir)
+            # Partições sem linhas após a carga: o diretório (e os pais que
+            # ficarem vazios) sai
+            # Nomes dos diretórios: os das colunas da tabela (ex: 'UF')
+            names = []
+            if partition_by:
+                columns = ", ".join(map(_quote, partition_by))
+                cursor = con.execute(f"SELECT {columns} FROM {table} LIMIT 0")
+                names = [column[0] for column in cursor.description]
+            empty_dirs = {
+                _hive_path(dict(zip(names, partition.values(), strict=True)))
+                for partition in partitions
+            } - leaf_dirs
+            for leaf_dir in sorted(empty_dirs):
+                target_dir = module_dir / leaf_dir
+                shutil.rmtree(target_dir, ignore_errors=True)
+                for parent in target_dir.parents:
+                    if parent == module_dir or not parent.is_dir() or any(
+                        parent.iterdir()
+                    ):
+                        break
+                    parent.rmdir()
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        con.execute("CREATE SCHEMA IF NOT EXISTS silver")
+        con.execute(
+            f"CREATE OR REPLACE VIEW silver.{_quote(module_name)} AS SELECT * FROM "
+            f"read_parquet('{module_dir}/**/*.parquet', hive_partitioning = true)"
+        )
+        self.logger.info(f"Partições de '{module_name}' atualizadas em {module_dir}")
+
+    def load_results(self, results: list[dict[str, Any]]) -> dict[str, int]:
+        """
+        Carrega os parquets dos resumos de extract_file, agrupados por módulo
+        (as dimensões do layout compacto vão para bronze.<dimensão>)
+        Args:
+            results (list[dict]): Resumos com status 'success'
+        Returns:
+            dict[str, int]: Linhas carregadas por módulo (e por dimensão)
+        """
+        # Dicionários como conjuntos ordenados: num lote de extract_many,
+        # todos os arquivos compartilham os mesmos parquets
+        by_module: dict[str, dict[str, None]] = {}
+        for result in results:
+            if result["status"] != "success":
+                continue
+            outputs = result.get("output_files") or [result["output_path"]]
+            by_module.setdefault(result["module_base"], {}).update(
+                dict.fromkeys(outputs)
+            )
+            if result.get("dimension_path"):
+                by_module.setdefault(result["dimension"], {})[
+                    result["dimension_path"]
+                ] = None
+        return {
+            module: self.load(module, list(paths))
+            for module, paths in by_module.items()
+        }
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Carga da camada Bronze no Data Warehouse (DuckDB)."
+    )
+    parser.add_argument("module_name", help="Módulo do extractors.yaml")
+    parser.add_argument("paths", nargs="+", type=Path, help="Parquets da Bronze")
+    parser.add_argument("--db", type=Path, default=DUCKDB_PATH, help="Warehouse")
+    args = parser.parse_args()
+    init()
+
+    rows = DuckDBLoader(db_path=args.db).load(args.module_name, args.paths)
+    print(f"{rows} linhas carregadas em bronze.{args.module_name}.")
+
+
+if __name__ == "__main__":
+    main()
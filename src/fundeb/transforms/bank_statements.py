@@ -0,0 +1,154 @@
+"""
+Modelos dos extratos bancários: lançamentos (Silver) e agregados mensais
+(Gold).
+
+Calculados ao fim do flow (ver fundeb.transforms.runner), a partir de
+bronze.conta_corrente (lançamentos) e bronze.conta_corrente_extratos
+(saldos) no DuckDB. Cada agregado vira a tabela gold.<nome> do warehouse e
+um parquet pequeno em DATA_GOLD_DIR, lido diretamente pelo app
+(app/pages/1_Financeiro.py) sem recalcular nada a partir dos extratos:
+
+    python -m fundeb.transforms.bank_statements
+"""
+
+from pathlib import Path
+
+from fundeb.config.settings import DATA_GOLD_DIR, DUCKDB_PATH, init
+from fundeb.transforms.runner import Model, ModelRunner
+
+SOURCE_TABLE = "bronze.conta_corrente"
+# Dimensão do layout compacto: uma linha por extrato, com os saldos
+STATEMENTS_TABLE = "bronze.conta_corrente_extratos"
+STATEMENT_KEY = "UF, BANCO, AGENCIA, CONTA, DATA_INICIO"
+
+# Lançamentos normalizados: nomes em minúsculas, mês de referência do
+# extrato e valor com sinal (créditos positivos, débitos negativos)
+ENTRIES_MODEL = Model(
+    "silver.lancamentos_conta_corrente",
+    f"""
+        SELECT
+            UF AS uf,
+            BANCO AS banco,
+            AGENCIA AS agencia,
+            CONTA AS conta,
+            date_trunc('month', DATA_INICIO)::DATE AS mes_referencia,
+            DT_LANCAMENTO::DATE AS data_lancamento,
+            HISTORICO_FINALIDADE AS categoria,
+            NOME_DESTINATARIO_DEPOSITANTE AS contraparte,
+            CPF_CNPJ AS cpf_cnpj,
+            D_C AS d_c,
+            VALOR AS valor,
+            CASE D_C WHEN 'D' THEN -VALOR ELSE VALOR END AS valor_assinado,
+            file_name,
+            line_number
+        FROM {SOURCE_TABLE}
+    """,
+    # Partições de bronze.conta_corrente (extractors.yaml): novas cargas só
+    # regravam os meses dos extratos carregados
+    partition_by={
+        "uf": "uf",
+        "ano": "year(mes_referencia)",
+        "mes": "month(mes_referencia)",
+    },
+)
+
+# Um extrato por conta e mês: os saldos anterior/atual vêm da dimensão e os
+# lançamentos somam créditos (C) e débitos (D).
+MONTHLY_AGGREGATES = {
+    # Saldo inicial, créditos, débitos e saldo final por conta e mês
+    "saldo_mensal_conta": f"""
+        WITH movimento AS (
+            SELECT
+                {STATEMENT_KEY},
+                coalesce(sum(VALOR) FILTER (D_C = 'C'), 0) AS creditos,
+                coalesce(sum(VALOR) FILTER (D_C = 'D'), 0) AS debitos,
+                count(*) AS lancamentos
+            FROM {SOURCE_TABLE}
+            GROUP BY ALL
+        )
+        SELECT
+            UF AS uf,
+            BANCO AS banco,
+            AGENCIA AS agencia,
+            CONTA AS conta,
+            date_trunc('month', DATA_INICIO)::DATE AS mes_referencia,
+            any_value(e.SALDO_ANTERIOR_TOTAL) AS saldo_inicial,
+            coalesce(any_value(m.creditos), 0) AS creditos,
+            coalesce(any_value(m.debitos), 0) AS debitos,
+            any_value(e.SALDO_ATUAL_TOTAL) AS saldo_final,
+            coalesce(any_value(m.lancamentos), 0) AS lancamentos
+        FROM {STATEMENTS_TABLE} AS e
+        LEFT JOIN movimento AS m USING ({STATEMENT_KEY})
+        GROUP BY ALL
+        ORDER BY ALL
+    """,
+    # O mesmo resumo consolidado por UF (soma das contas)
+    "saldo_mensal_uf": """
+        SELECT
+            uf,
+            mes_referencia,
+            sum(saldo_inicial) AS saldo_inicial,
+            sum(creditos) AS creditos,
+            sum(debitos) AS debitos,
+            sum(saldo_final) AS saldo_final,
+            sum(lancamentos) AS lancamentos,
+            count(*) AS contas
+        FROM gold.saldo_mensal_conta
+        GROUP BY ALL
+        ORDER BY ALL
+    """,
+    # Créditos e débitos por categoria (HISTORICO_FINALIDADE), conta e mês
+    "movimento_mensal_categoria": f"""
+        SELECT
+            uf,
+            banco,
+            agencia,
+            conta,
+            mes_referencia,
+            categoria,
+            coalesce(sum(valor) FILTER (d_c = 'C'), 0) AS creditos,
+            coalesce(sum(valor) FILTER (d_c = 'D'), 0) AS debitos,
+            count(*) AS lancamentos
+        FROM {ENTRIES_MODEL.name}
+        GROUP BY ALL
+        ORDER BY ALL
+    """,
+}
+
+MODELS = [
+    ENTRIES_MODEL,
+    *(
+        Model(f"gold.{name}", query, export=True)
+        for name, query in MONTHLY_AGGREGATES.items()
+    ),
+]
+
+
+def materialize_monthly_aggregates(
+    db_path: str | Path = DUCKDB_PATH,
+    gold_dir: str | Path = DATA_GOLD_DIR,
+    full_refresh: bool = False,
+) -> dict[str, int]:
+    """
+    Atualiza os agregados mensais no warehouse e exporta-os para a Gold
+    (só os desatualizados, salvo full_refresh)
+    Args:
+        db_path (str | Path): Caminho do DuckDB (com bronze.conta_corrente
+            e bronze.conta_corrente_extratos)
+        gold_dir (str | Path): Diretório dos parquets da camada Gold
+        full_refresh (bool): Recalcula todos os modelos
+    Returns:
+        dict[str, int]: Linhas por agregado (nome -> linhas)
+    """
+    results = ModelRunner(MODELS, db_path, gold_dir).run(full_refresh)
+    return {
+        result.model.removeprefix("gold."): result.rows
+        for result in results
+        if result.model.startswith("gold.") and result.rows is not None
+    }
+
+
+if __name__ == "__main__":
+    init()
+    for name, count in materialize_monthly_aggregates(full_refresh=True).items():
+        print(f"gold.{name}: {count} linhas")
@@ -0,0 +1,222 @@
+"""
+Consolidação dos saldos das contas: encadeamento mensal e saldo diário.
+
+Substitui o encadeamento mês a mês a partir de um saldo inicial fixo: os
+saldos saem dos próprios extratos (bronze.conta_corrente_extratos) e dos
+lançamentos (silver.lancamentos_conta_corrente), com somas acumuladas com
+sinal (funções de janela do DuckDB) sobre todas as contas e meses de uma
+vez. Dois modelos Gold, executados pelo ModelRunner:
+
+- gold.cadeia_saldos_conta: um extrato por linha, com o status da cadeia:
+  - inicio: primeiro extrato da conta;
+  - mes_ausente: há meses sem extrato antes deste ('meses_ausentes');
+  - duplicado: mais de um extrato no mesmo mês;
+  - quebra: o saldo anterior não é o saldo atual do extrato anterior
+    (diferença em 'quebra');
+  - divergente: saldo anterior da conta corrente + lançamentos não dá o
+    saldo atual (diferença em 'diferenca_cc');
+  - ok.
+  O 'rendimento' é a parte da variação do saldo total (conta corrente +
+  aplicação) que os lançamentos não explicam.
+- gold.saldo_diario_conta: um dia por linha, do início ao fim de cada
+  extrato, com os créditos e débitos do dia, o saldo da conta corrente e o
+  saldo total estimado (sem o rendimento, que não aparece nos lançamentos).
+  Cada extrato parte do seu próprio saldo anterior: com a cadeia íntegra,
+  é o mesmo que acumular desde o primeiro extrato, e uma quebra aparece na
+  cadeia em vez de contaminar os meses seguintes.
+
+    python -m fundeb.transforms.consolidation
+"""
+
+import argparse
+from pathlib import Path
+
+import duckdb
+
+from fundeb.config.settings import DATA_GOLD_DIR, DUCKDB_PATH, init
+from fundeb.transforms.bank_statements import ENTRIES_MODEL, STATEMENTS_TABLE
+from fundeb.transforms.runner import Model, ModelRunner
+
+# Aplicação e resgate automáticos: só movem dinheiro entre a conta corrente
+# e a aplicação, sem alterar o saldo total
+SWEEP_CATEGORIES = ("RESGATEAUTOMA TICO", "BB-APLICC.PRZ-APL.AUT")
+# Diferença (R$) a partir da qual dois saldos são considerados diferentes
+BALANCE_TOLERANCE = 0.01
+
+ACCOUNT_KEY = "uf, banco, agencia, conta"
+_SWEEPS = ", ".join(f"'{category}'" for category in SWEEP_CATEGORIES)
+
+CHAIN_MODEL = Model(
+    "gold.cadeia_saldos_conta",
+    f"""
+        WITH extratos AS (
+            SELECT
+                UF AS uf,
+                BANCO AS banco,
+                AGENCIA AS agencia,
+                CONTA AS conta,
+                date_trunc('month', DATA_INICIO)::DATE AS mes_referencia,
+                SALDO_ANTERIOR_TOTAL AS saldo_inicial,
+                SALDO_ATUAL_TOTAL AS saldo_final,
+                SALDO_ANTERIOR_CC AS saldo_inicial_cc,
+                SALDO_ATUAL_CC AS saldo_final_cc,
+                file_name
+            FROM {STATEMENTS_TABLE}
+        ),
+        movimento AS (
+            SELECT
+                {ACCOUNT_KEY},
+                mes_referencia,
+                sum(valor_assinado) AS movimento_cc,
+                coalesce(
+                    sum(valor_assinado) FILTER (categoria NOT IN ({_SWEEPS})), 0
+                ) AS movimento
+            FROM {ENTRIES_MODEL.name}
+            GROUP BY ALL
+        ),
+        cadeia AS (
+            SELECT
+                e.*,
+                coalesce(m.movimento, 0) AS movimento,
+                coalesce(m.movimento_cc, 0) AS movimento_cc,
+                date_diff(
+                    'month', lag(e.mes_referencia) OVER conta, e.mes_referencia
+                ) AS meses,
+                e.saldo_inicial - lag(e.saldo_final) OVER conta AS quebra,
+                e.saldo_inicial_cc + coalesce(m.movimento_cc, 0)
+                    - e.saldo_final_cc AS diferenca_cc
+            FROM extratos AS e
+            LEFT JOIN movimento AS m USING ({ACCOUNT_KEY}, mes_referencia)
+            WINDOW conta AS (PARTITION BY {ACCOUNT_KEY} ORDER BY e.mes_referencia)
+        )
+        SELECT
+            {ACCOUNT_KEY},
+            mes_referencia,
+            CASE
+                WHEN meses IS NULL THEN 'inicio'
+                WHEN meses = 0 THEN 'duplicado'
+                WHEN meses > 1 THEN 'mes_ausente'
+                WHEN abs(quebra) >= {BALANCE_TOLERANCE} THEN 'quebra'
+                WHEN abs(diferenca_cc) >= {BALANCE_TOLERANCE} THEN 'divergente'
+                ELSE 'ok'
+            END AS status,
+            greatest(coalesce(meses, 1) - 1, 0) AS meses_ausentes,
+            round(coalesce(quebra, 0), 2) AS quebra,
+            round(diferenca_cc, 2) AS diferenca_cc,
+            saldo_inicial,
+            round(movimento, 2) AS movimento,
+            round(saldo_final - saldo_inicial - movimento, 2) AS rendimento,
+            saldo_final,
+            saldo_inicial_cc,
+            round(movimento_cc, 2) AS movimento_cc,
+            saldo_final_cc,
+            file_name
+        FROM cadeia
+        ORDER BY ALL
+    """,
+    export=True,
+)
+
+DAILY_MODEL = Model(
+    "gold.saldo_diario_conta",
+    f"""
+        WITH dias AS (
+            SELECT
+                UF AS uf,
+                BANCO AS banco,
+                AGENCIA AS agencia,
+                CONTA AS conta,
+                date_trunc('month', DATA_INICIO)::DATE AS mes_referencia,
+                unnest(
+                    generate_series(DATA_INICIO::DATE, DATA_FIM::DATE, INTERVAL 1 DAY)
+                )::DATE AS data,
+                SALDO_ANTERIOR_TOTAL AS saldo_inicial,
+                SALDO_ANTERIOR_CC AS saldo_inicial_cc
+            FROM {STATEMENTS_TABLE}
+        ),
+        movimento AS (
+            SELECT
+                {ACCOUNT_KEY},
+                mes_referencia,
+                data_lancamento AS data,
+                coalesce(sum(valor) FILTER (d_c = 'C'), 0) AS creditos,
+                coalesce(sum(valor) FILTER (d_c = 'D'), 0) AS debitos,
+                sum(valor_assinado) AS movimento_cc,
+                coalesce(
+                    sum(valor_assinado) FILTER (categoria NOT IN ({_SWEEPS})), 0
+                ) AS movimento
+            FROM {ENTRIES_MODEL.name}
+            GROUP BY ALL
+        )
+        SELECT
+            {ACCOUNT_KEY},
+            d.data,
+            coalesce(m.creditos, 0) AS creditos,
+            coalesce(m.debitos, 0) AS debitos,
+            round(
+                d.saldo_inicial_cc + sum(coalesce(m.movimento_cc, 0)) OVER extrato, 2
+            ) AS saldo_cc,
+            round(
+                d.saldo_inicial + sum(coalesce(m.movimento, 0)) OVER extrato, 2
+            ) AS saldo_estimado
+        FROM dias AS d
+        LEFT JOIN movimento AS m USING ({ACCOUNT_KEY}, mes_referencia, data)
+        WINDOW extrato AS (
+            PARTITION BY {ACCOUNT_KEY}, mes_referencia
+            ORDER BY d.data
+            ROWS UNBOUNDED PRECEDING
+        )
+        ORDER BY ALL
+    """,
+    export=True,
+)
+
+MODELS = [CHAIN_MODEL, DAILY_MODEL]
+
+
+def chain_problems(db_path: str | Path = DUCKDB_PATH) -> list[tuple]:
+    """
+    Extratos com a cadeia de saldos comprometida
+    Args:
+        db_path (str | Path): Caminho do DuckDB (com gold.cadeia_saldos_conta)
+    Returns:
+        list[tuple]: (uf, banco, agencia, conta, mes_referencia, status,
+            meses_ausentes, quebra, diferenca_cc) de cada extrato com status
+            diferente de 'inicio' e 'ok'
+    """
+    with duckdb.connect(str(db_path), read_only=True) as con:
+        return con.execute(
+            f"""
+            SELECT {ACCOUNT_KEY}, mes_referencia, status, meses_ausentes,
+                quebra, diferenca_cc
+            FROM {CHAIN_MODEL.name}
+            WHERE status NOT IN ('inicio', 'ok')
+            ORDER BY ALL
+            """
+        ).fetchall()
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Consolidação e conferência dos saldos das contas."
+    )
+    parser.add_argument("--db", type=Path, default=DUCKDB_PATH, help="Warehouse")
+    parser.add_argument("--gold-dir", type=Path, default=DATA_GOLD_DIR)
+    parser.add_argument(
+        "--full-refresh", action="store_true", help="Reexecuta os modelos"
+    )
+    args = parser.parse_args()
+    init()
+    for result in ModelRunner([ENTRIES_MODEL, *MODELS], args.db, args.gold_dir).run(
+        args.full_refresh
+    ):
+        print(result)
+    problems = chain_problems(args.db)
+    for problem in problems:
+        print(" ".join(str(value) for value in problem))
+    print(f"{len(problems)} extrato(s) com a cadeia de saldos comprometida")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""
+Previsão dos repasses do FUNDEB para os próximos 12 meses.
+
+As séries mensais vêm de dois modelos Silver (executados pelo ModelRunner):
+- silver.serie_mensal_repasses_fnde: transferências do FNDE por UF e tipo
+  (ex: AJUSTE FUNDEB/AJUSTE FUNDEB VAAF), somando os decêndios;
+- silver.serie_mensal_creditos_bancarios: créditos (D_C = 'C') dos extratos
+  por UF e categoria (ex: RECEBIMENTODEICMS, FPE/FPM).
+
+run_forecasts() ajusta milhares de séries de uma vez: as séries com o mesmo
+comprimento formam uma matriz (séries x meses) e cada modelo é calculado de
+forma vetorizada sobre a matriz inteira (NumPy), em lotes distribuídos por
+um pool de processos. Os modelos candidatos são:
+- ingenuo: último valor;
+- media_12: média dos últimos 12 meses;
+- deriva: último valor + tendência média da série;
+- suavizacao: suavização exponencial simples (alfa escolhido por série);
+- sazonal_ingenuo: o mesmo mês do ano anterior;
+- sazonal_tendencia: tendência linear + índices sazonais mensais.
+Cada série fica com o modelo de menor erro absoluto médio numa validação
+com os últimos meses (até 12).
+
+Todo modelo é guardado na mesma forma, nível + inclinação x h + sazonal[h],
+em meta.forecast_params, com o hash dos dados da série. Só as séries cujos
+dados mudaram são reajustadas; as previsões de todas são recalculadas a
+partir dos parâmetros e gravadas em gold.previsao_repasses (e no parquet
+da Gold lido pelo app):
+
+    python -m fundeb.transforms.forecasting [--full-refresh] [-w 4]
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from fundeb.config.logger import get_logger
+from fundeb.config.settings import DATA_GOLD_DIR, DUCKDB_PATH, init
+from fundeb.transforms.bank_statements import ENTRIES_MODEL
+from fundeb.transforms.runner import Model
+from fundeb.utils.metrics import stage
+
+HORIZON = 12  # Meses previstos
+SEASON = 12  # Período sazonal (meses)
+BATCH_SIZE = 1024  # Séries por lote (uma matriz por lote)
+# Grade do alfa da suavização exponencial (avaliada em todas as séries)
+SMOOTHING_ALPHAS = np.linspace(0.05, 0.95, 19)
+# Quantil normal do intervalo de previsão (95%)
+INTERVAL_Z = 1.96
+
+PARAMS_TABLE = "meta.forecast_params"
+FORECASTS_TABLE = "gold.previsao_repasses"
+SERIES_KEY = ["fonte", "uf", "tipo"]
+
+SERIES_MODELS = [
+    Model(
+        "silver.serie_mensal_repasses_fnde",
+        """
+            SELECT
+                'fnde' AS fonte,
+                uf,
+                transferencia AS tipo,
+                make_date(ano, mes, 1) AS mes_referencia,
+                sum(valor) AS valor
+            FROM bronze.fnde_repasses
+            GROUP BY ALL
+            ORDER BY ALL
+        """,
+    ),
+    Model(
+        "silver.serie_mensal_creditos_bancarios",
+        f"""
+            SELECT
+                'extrato' AS fonte,
+                uf,
+                categoria AS tipo,
+                date_trunc('month', data_lancamento)::DATE AS mes_referencia,
+                sum(valor) AS valor
+            FROM {ENTRIES_MODEL.name}
+            WHERE d_c = 'C'
+            GROUP BY ALL
+            ORDER BY ALL
+        """,
+    ),
+]
+
+
+# --- Modelos (vetorizados: y tem uma série por linha) ---
+# Cada ajuste devolve (nível, inclinação, sazonal[SEASON]); a previsão do
+# passo h (1..H) é nível + inclinação * h + sazonal[(h - 1) % SEASON].
+
+
+def _no_trend(level: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n = len(level)
+    return level, np.zeros(n), np.zeros((n, SEASON))
+
+
+def _fit_naive(y: np.ndarray):
+    return _no_trend(y[:, -1])
+
+
+def _fit_mean(y: np.ndarray):
+    return _no_trend(y[:, -SEASON:].mean(axis=1))
+
+
+def _fit_drift(y: np.ndarray):
+    level, slope, seasonal = _no_trend(y[:, -1])
+    slope = (y[:, -1] - y[:, 0]) / (y.shape[1] - 1)
+    return level, slope, seasonal
+
+
+def _fit_smoothing(y: np.ndarray):
+    """Suavização exponencial simples, com o alfa de menor erro por série"""
+    n_series, length = y.shape
+    level = np.repeat(y[:, :1], len(SMOOTHING_ALPHAS), axis=1)
+    sse = np.zeros_like(level)
+    # Laço no tempo; séries e alfas são vetorizados
+    for t in range(1, length):
+        error = y[:, t, None] - level
+        sse += error**2
+        level += SMOOTHING_ALPHAS * error
+    best = sse.argmin(axis=1)
+    return _no_trend(level[np.arange(n_series), best])
+
+
+def _fit_seasonal_naive(y: np.ndarray):
+    level, slope, _ = _no_trend(np.zeros(len(y)))
+    return level, slope, y[:, -SEASON:].copy()
+
+
+def _fit_seasonal_trend(y: np.ndarray):
+    """Tendência linear (mínimos quadrados) + índice sazonal dos resíduos"""
+    length = y.shape[1]
+    t = np.arange(length)
+    t_centered = t - t.mean()
+    slope = (y - y.mean(axis=1, keepdims=True)) @ t_centered / (t_centered @ t_centered)
+    intercept = y.mean(axis=1) - slope * t.mean()
+    residuals = y - intercept[:, None] - slope[:, None] * t
+    # Média dos resíduos por posição no ano (matriz indicadora: sem laços)
+    positions = np.eye(SEASON)[t % SEASON]
+    index = residuals @ positions / positions.sum(axis=0)
+    index -= index.mean(axis=1, keepdims=True)
+    level = intercept + slope * (length - 1)
+    seasonal = index[:, (length + np.arange(SEASON)) % SEASON]
+    return level, slope, seasonal
+
+
+# Nome -> (ajuste, meses mínimos de histórico)
+MODELS = {
+    "ingenuo": (_fit_naive, 1),
+    "media_12": (_fit_mean, 1),
+    "deriva": (_fit_drift, 2),
+    "suavizacao": (_fit_smoothing, 2),
+    "sazonal_ingenuo": (_fit_seasonal_naive, SEASON),
+    "sazonal_tendencia": (_fit_seasonal_trend, 2 * SEASON),
+}
+
+
+def forecast(
+    level: np.ndarray, slope: np.ndarray, seasonal: np.ndarray, horizon: int
+) -> np.ndarray:
+    """Previsões (séries x horizonte) a partir dos parâmetros"""
+    steps = np.arange(1, horizon + 1)
+    return level[:, None] + slope[:, None] * steps + seasonal[:, (steps - 1) % SEASON]
+
+
+def fit_batch(y: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Escolhe e ajusta o modelo de cada série de um lote (executado nos
+    processos do pool)
+    Args:
+        y (np.ndarray): Séries do lote, uma por linha, todas com o mesmo
+            número de meses
+    Returns:
+        dict[str, np.ndarray]: modelo, nivel, inclinacao, sazonal, mae e
+            rmse (validação) de cada série
+    """
+    n_series, length = y.shape
+    holdout = min(HORIZON, length // 3)
+    train = length - holdout
+    candidates = [
+        name
+        for name, (_, min_length) in MODELS.items()
+        if min_length <= (train if holdout else length)
+    ]
+
+    if holdout:
+        # Validação: ajusta sem os últimos meses e compara com eles
+        actual = y[:, train:]
+        errors = np.stack(
+            [
+                forecast(*MODELS[name][0](y[:, :train]), holdout) - actual
+                for name in candidates
+            ]
+        )
+        mae = np.abs(errors).mean(axis=2)
+        best = mae.argmin(axis=0)
+        rows = np.arange(n_series)
+        best_mae = mae[best, rows]
+        best_rmse = np.sqrt((errors[best, rows] ** 2).mean(axis=1))
+    else:
+        # Histórico curto demais para validar: último valor
+        candidates, best = ["ingenuo"], np.zeros(n_series, dtype=int)
+        best_mae = best_rmse = np.full(n_series, np.nan)
+
+    # Reajuste com o histórico completo, só dos modelos escolhidos
+    level = np.empty(n_series)
+    slope = np.empty(n_series)
+    seasonal = np.empty((n_series, SEASON))
+    for index, name in enumerate(candidates):
+        chosen = best == index
+        if chosen.any():
+            fitted = MODELS[name][0](y[chosen])
+            level[chosen], slope[chosen], seasonal[chosen] = fitted
+    return {
+        "modelo": np.array(candidates)[best],
+        "nivel": level,
+        "inclinacao": slope,
+        "sazonal": seasonal,
+        "mae": best_mae,
+        "rmse": best_rmse,
+    }
+
+
+@dataclass
+class ForecastSummary:
+    """Resultado de uma execução de run_forecasts."""
+
+    series: int = 0
+    refitted: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{FORECASTS_TABLE}: {self.series} séries ({self.refitted} "
+            f"reajustadas), {self.rows} linhas em {self.seconds:.3f}s"
+        )
+
+
+def _month_index(dates: pd.Series) -> np.ndarray:
+    """Meses como inteiros consecutivos (ano * 12 + mês - 1)"""
+    dates = pd.to_datetime(dates)
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy()
+
+
+def _month_date(month_index: np.ndarray) -> pd.Series:
+    """Inverso de _month_index: primeiro dia do mês"""
+    month_index = np.asarray(month_index)
+    return pd.to_datetime(
+        pd.DataFrame(
+            {"year": month_index // 12, "month": month_index % 12 + 1, "day": 1}
+        )
+    ).dt.date
+
+
+def _read_series(con: duckdb.DuckDBPyConnection) -> pd.DataFrame:
+    """Séries mensais dos modelos Silver que já existem no warehouse"""
+    existing = {
+        f"{schema}.{table}"
+        for schema, table in con.execute(
+            "SELECT schema_name, table_name FROM duckdb_tables()"
+        ).fetchall()
+    }
+    queries = [
+        f"SELECT fonte, uf, tipo, mes_referencia, valor FROM {model.name}"
+        for model in SERIES_MODELS
+        if model.name in existing
+    ]
+    if not queries:
+        return pd.DataFrame(columns=[*SERIES_KEY, "mes_referencia", "valor"])
+    return con.execute(" UNION ALL ".join(queries)).df()
+
+
+def _to_windows(series: pd.DataFrame) -> pd.DataFrame:
+    """
+    Uma linha por série: chave, último mês, valores mensais desde o primeiro
+    mês (meses sem valor no meio da série valem 0) e o hash desses valores
+    """
+    month_index = _month_index(series["mes_referencia"])
+    codes, keys = pd.factorize(pd.MultiIndex.from_frame(series[SERIES_KEY].astype(str)))
+    first = np.full(len(keys), np.iinfo(np.int64).max)
+    last = np.full(len(keys), -1)
+    np.minimum.at(first, codes, month_index)
+    np.maximum.at(last, codes, month_index)
+
+    # Matriz densa (séries x meses desde o primeiro mês de cada série)
+    lengths = last - first + 1
+    values = np.zeros((len(keys), lengths.max(initial=0)))
+    np.add.at(values, (codes, month_index - first[codes]), series["valor"])
+
+    windows = pd.DataFrame(list(keys), columns=SERIES_KEY)
+    windows["ultimo_mes"] = _month_date(last)
+    windows["valores"] = [
+        row[:length] for row, length in zip(values, lengths, strict=True)
+    ]
+    windows["data_hash"] = [
+        hashlib.sha256(f"{start}:".encode() + row.tobytes()).hexdigest()
+        for start, row in zip(first, windows["valores"], strict=True)
+    ]
+    return windows
+
+
+def _fit(windows: pd.DataFrame, max_workers: int | None) -> pd.DataFrame:
+    """Ajusta as séries em lotes de mesmo comprimento, em paralelo"""
+    batches = []
+    for _, group in windows.groupby(windows["valores"].map(len), sort=False):
+        for start in range(0, len(group), BATCH_SIZE):
+            batches.append(group.iloc[start : start + BATCH_SIZE])
+    matrices = [np.stack(batch["valores"].to_list()) for batch in batches]
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(batches))
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            fitted = list(executor.map(fit_batch, matrices))
+    else:
+        fitted = [fit_batch(matrix) for matrix in matrices]
+
+    frames = []
+    for batch, params in zip(batches, fitted, strict=True):
+        frame = batch[[*SERIES_KEY, "data_hash", "ultimo_mes"]].copy()
+        frame["modelo"] = params["modelo"]
+        frame["nivel"] = params["nivel"]
+        frame["inclinacao"] = params["inclinacao"]
+        frame["sazonal"] = list(params["sazonal"])
+        frame["mae"] = params["mae"]
+        frame["rmse"] = params["rmse"]
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _forecasts(params: pd.DataFrame) -> pd.DataFrame:
+    """Previsões de todas as séries a partir dos parâmetros (uma passada)"""
+    n_series = len(params)
+    predicted = forecast(
+        params["nivel"].to_numpy(),
+        params["inclinacao"].to_numpy(),
+        np.stack(params["sazonal"].map(np.asarray).to_list()),
+        HORIZON,
+    )
+    rows = np.repeat(np.arange(n_series), HORIZON)
+    steps = np.tile(np.arange(1, HORIZON + 1), n_series)
+    # Faixa de 95%: o erro da validação cresce com a raiz do horizonte
+    # (sem validação, rmse é nulo e a faixa também)
+    spread = INTERVAL_Z * params["rmse"].to_numpy()[rows] * np.sqrt(steps)
+
+    result = params[SERIES_KEY].iloc[rows].reset_index(drop=True)
+    result["mes_referencia"] = _month_date(
+        _month_index(params["ultimo_mes"])[rows] + steps
+    )
+    result["horizonte"] = steps.astype("int8")
+    result["previsao"] = predicted.ravel()
+    result["limite_inferior"] = result["previsao"] - spread
+    result["limite_superior"] = result["previsao"] + spread
+    result["modelo"] = params["modelo"].to_numpy()[rows]
+    result["mae"] = params["mae"].to_numpy()[rows]
+    return result
+
+
+def _export(con: duckdb.DuckDBPyConnection, gold_dir: Path) -> None:
+    """Exporta as previsões para a Gold (tmp + rename, como o ModelRunner)"""
+    gold_dir.mkdir(parents=True, exist_ok=True)
+    output_path = gold_dir / f"{FORECASTS_TABLE.split('.', 1)[1]}.parquet"
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    con.execute(f"COPY {FORECASTS_TABLE} TO '{tmp_path}' (FORMAT parquet)")
+    os.replace(tmp_path, output_path)
+
+
+def run_forecasts(
+    db_path: str | Path = DUCKDB_PATH,
+    gold_dir: str | Path = DATA_GOLD_DIR,
+    full_refresh: bool = False,
+    max_workers: int | None = None,
+) -> ForecastSummary:
+    """
+    Atualiza as previsões de 12 meses de todas as séries, reajustando só as
+    séries cujos dados mudaram desde o último ajuste
+    Args:
+        db_path (str | Path): Caminho do DuckDB (com as séries Silver)
+        gold_dir (str | Path): Diretório dos parquets da camada Gold
+        full_refresh (bool): Reajusta todas as séries
+        max_workers (int | None): Processos do ajuste (padrão: os.cpu_count())
+    Returns:
+        ForecastSummary: Séries, séries reajustadas, linhas e tempo
+    """
+    logger = get_logger()
+    start = time.perf_counter()
+    with duckdb.connect(str(db_path)) as con:
+        series = _read_series(con)
+        if series.empty:
+            logger.info("Nenhuma série mensal no warehouse: previsões ignoradas.")
+            return ForecastSummary()
+
+        windows = _to_windows(series)
+        con.execute("CREATE SCHEMA IF NOT EXISTS meta")
+        con.execute(
+            f"CREATE TABLE IF NOT EXISTS {PARAMS_TABLE} (fonte VARCHAR, "
+            "uf VARCHAR, tipo VARCHAR, data_hash VARCHAR, ultimo_mes DATE, "
+            "modelo VARCHAR, nivel DOUBLE, inclinacao DOUBLE, sazonal DOUBLE[], "
+            "mae DOUBLE, rmse DOUBLE, ajustado_em TIMESTAMP)"
+        )
+        cached = con.execute(f"SELECT * FROM {PARAMS_TABLE}").df()
+
+        # Mantém os parâmetros das séries cujos dados não mudaram (mesmo
+        # hash); as novas, alteradas ou todas (full_refresh) são reajustadas.
+        # Séries que sumiram da Silver saem do cache.
+        if full_refresh:
+            cached = cached.iloc[:0]
+        kept = cached.merge(windows[[*SERIES_KEY, "data_hash"]])
+        stale = windows.merge(
+            kept[[*SERIES_KEY, "data_hash"]], how="left", indicator=True
+        )
+        stale = windows[(stale["_merge"] == "left_only").to_numpy()]
+
+        with stage("forecast.fit") as current:
+            current.rows = len(stale)
+            refitted = cached.iloc[:0]
+            if len(stale):
+                refitted = _fit(stale, max_workers)
+                refitted["ajustado_em"] = pd.Timestamp.now()
+        params = pd.concat([kept, refitted], ignore_index=True)
+        forecasts = _forecasts(params)
+
+        con.register("forecast_params", params[cached.columns])
+        con.register("forecasts", forecasts)
+        con.execute("BEGIN TRANSACTION")
+        try:
+            con.execute(
+                f"CREATE OR REPLACE TABLE {PARAMS_TABLE} AS "
+                "SELECT * FROM forecast_params"
+            )
+            con.execute("CREATE SCHEMA IF NOT EXISTS gold")
+            con.execute(
+                f"CREATE OR REPLACE TABLE {FORECASTS_TABLE} AS "
+                "SELECT * FROM forecasts ORDER BY fonte, uf, tipo, mes_referencia"
+            )
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        _export(con, Path(gold_dir))
+
+    summary = ForecastSummary(
+        len(params), len(stale), len(forecasts), time.perf_counter() - start
+    )
+    logger.info(str(summary))
+    return summary
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Previsão de 12 meses dos repasses (séries Silver)."
+    )
+    parser.add_argument("--db", type=Path, default=DUCKDB_PATH, help="Warehouse")
+    parser.add_argument("--gold-dir", type=Path, default=DATA_GOLD_DIR)
+    parser.add_argument(
+        "--full-refresh", action="store_true", help="Reajusta todas as séries"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args()
+    init()
+    print(run_forecasts(args.db, args.gold_dir, args.full_refresh, args.workers))
+
+
+if __name__ == "__main__":
+    main()
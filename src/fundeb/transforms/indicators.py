@@ -0,0 +1,470 @@
+"""
+Indicadores legais do FUNDEB (Lei nº 14.113/2020), por UF e mês.
+
+Cada indicador é definido uma única vez, como uma composição de medidas:
+- Measure: agregação mensal de uma tabela do warehouse (ex: soma dos
+  créditos de gold.movimento_mensal_categoria fora da aplicação
+  automática), por UF e mês de referência;
+- DERIVED_MEASURES: expressões sobre outras medidas (ex: receita =
+  créditos + rendimentos);
+- Indicator: numerador / denominador (expressões sobre as medidas),
+  comparados a um limite.
+
+As medidas são acumuladas no exercício (janeiro até o mês), de modo que o
+indicador de dezembro é a apuração anual ('final') e os demais meses são
+parciais. Indicadores:
+- minimo_70_remuneracao: remuneração dos profissionais da educação paga
+  com o FUNDEB >= 70% da receita (art. 26);
+- aplicacao_90_exercicio: despesas >= 90% da receita no exercício
+  (art. 25, § 3º);
+- superavit_10: saldo não aplicado <= 10% da receita (art. 25, § 3º);
+- vaar_condicionalidades: complementação VAAR recebida, só repassada a
+  quem cumpre as condicionalidades (art. 14, § 1º). Vem das planilhas
+  E_COUN_VAAR e M_COUN_VAAR dos FUNDEB_*.xls (bronze.fnde_fundeb), com os
+  meses desempilhados em linhas no modelo silver.complementacao_vaar.
+
+Um indicador cuja tabela de origem não existe no warehouse fica com o
+status 'sem_dados' em todos os meses.
+
+Todos os indicadores de todos os períodos são calculados numa única
+consulta sobre as tabelas Gold (pequenas) e gravados em gold.indicadores
+com a linhagem de cada linha: fórmula, tabelas de origem, versão das
+fontes (última carga da Bronze vista pelos modelos) e o hash das entradas.
+Linhas cujas entradas não mudaram mantêm a versão e a data do cálculo;
+como as medidas são acumuladas do início do ano, um mês novo só acrescenta
+linhas. O app (app/pages/4_Indicadores.py) lê o parquet da Gold:
+
+    python -m fundeb.transforms.indicators [--full-refresh]
+"""
+
+import argparse
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import duckdb
+
+from fundeb.config.logger import get_logger
+from fundeb.config.settings import DATA_GOLD_DIR, DUCKDB_PATH, init
+from fundeb.transforms.consolidation import SWEEP_CATEGORIES
+from fundeb.transforms.runner import MODEL_RUNS_TABLE, Model
+
+INDICATORS_TABLE = "gold.indicadores"
+# Fontes de recurso da folha que pagam os profissionais da educação com o
+# FUNDEB (a parcela mínima de 70%)
+PROFESSIONALS_SOURCES = ("FUNDEB 70%",)
+
+# Colunas mensais das planilhas do FUNDEB_*.xls, na ordem do ano
+MONTH_COLUMNS = (
+    "JANEIRO FEVEREIRO MARÇO ABRIL MAIO JUNHO "
+    "JULHO AGOSTO SETEMBRO OUTUBRO NOVEMBRO DEZEMBRO"
+).split()
+
+_SWEEPS = ", ".join(f"'{category}'" for category in SWEEP_CATEGORIES)
+_PROFESSIONALS = ", ".join(f"'{source}'" for source in PROFESSIONALS_SOURCES)
+_MONTHS = ", ".join(f'"{month}"' for month in MONTH_COLUMNS)
+_IDENTIFIER = re.compile(r"\b[a-z_][a-z0-9_]*\b")
+
+# Complementação VAAR por UF, origem (E = estado, M = municípios) e mês. O
+# ano vem do nome da pasta de trabalho (FUNDEB_2025_11_03.xls); de cada ano
+# vale só a publicação mais recente, que substitui as anteriores. Meses
+# ainda sem valor (nulos) ficam de fora; zero é VAAR não recebido.
+VAAR_MODEL = Model(
+    "silver.complementacao_vaar",
+    f"""
+        SELECT
+            uf,
+            origem,
+            make_date(ano, list_position({MONTH_COLUMNS!r}, mes), 1)
+                AS mes_referencia,
+            valor
+        FROM (
+            UNPIVOT (
+                SELECT
+                    UF AS uf,
+                    left(sheet_name, 1) AS origem,
+                    regexp_extract(file_name, '(\\d{{4}})', 1)::INTEGER AS ano,
+                    {_MONTHS}
+                FROM bronze.fnde_fundeb
+                WHERE suffix(sheet_name, '_COUN_VAAR')
+                QUALIFY file_name = max(file_name) OVER (PARTITION BY ano)
+            )
+            ON {_MONTHS}
+            INTO NAME mes VALUE valor
+        )
+        ORDER BY ALL
+    """,
+)
+
+MODELS = [VAAR_MODEL]
+
+
+@dataclass(frozen=True)
+class Measure:
+    """Agregação mensal ('expression') de uma tabela, por UF e mês."""
+
+    name: str
+    table: str
+    expression: str
+    period: str = "mes_referencia"  # Coluna de data do mês
+    where: str = "TRUE"
+
+    @property
+    def sql(self) -> str:
+        return (
+            f"SELECT uf, date_trunc('month', {self.period})::DATE AS "
+            f"mes_referencia, '{self.name}' AS medida, {self.expression} AS valor "
+            f"FROM {self.table} WHERE {self.where} GROUP BY ALL"
+        )
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """Indicador: numerador / denominador (medidas) comparado a 'limit'."""
+
+    name: str
+    description: str
+    numerator: str
+    denominator: str | None = None  # None: o indicador é o próprio numerador
+    comparison: str = ">="
+    limit: float = 0.0
+
+    @property
+    def formula(self) -> str:
+        value = self.numerator
+        if self.denominator:
+            value = f"({self.numerator}) / ({self.denominator})"
+        return f"{value} {self.comparison} {self.limit:g}"
+
+
+MEASURES = [
+    # Entradas e saídas da conta do FUNDEB, sem a aplicação/resgate automático
+    Measure(
+        "creditos_fundeb",
+        "gold.movimento_mensal_categoria",
+        "sum(creditos)",
+        where=f"categoria NOT IN ({_SWEEPS})",
+    ),
+    Measure(
+        "debitos_fundeb",
+        "gold.movimento_mensal_categoria",
+        "sum(debitos)",
+        where=f"categoria NOT IN ({_SWEEPS})",
+    ),
+    # Rendimentos da aplicação (também são receita do FUNDEB)
+    Measure("rendimentos", "gold.cadeia_saldos_conta", "sum(rendimento)"),
+    Measure(
+        "remuneracao_profissionais",
+        "gold.folha_mensal_fonte",
+        "sum(proventos)",
+        period="competencia",
+        where=f"fonte_recurso IN ({_PROFESSIONALS})",
+    ),
+    # Complementação VAAR do estado e dos municípios da UF
+    Measure("vaar_recebido", VAAR_MODEL.name, "sum(valor)"),
+]
+
+DERIVED_MEASURES = {
+    "receita_fundeb": "creditos_fundeb + coalesce(rendimentos, 0)",
+}
+
+INDICATORS = [
+    Indicator(
+        "minimo_70_remuneracao",
+        "Remuneração dos profissionais da educação (mínimo de 70%)",
+        "remuneracao_profissionais",
+        "receita_fundeb",
+        ">=",
+        0.70,
+    ),
+    Indicator(
+        "aplicacao_90_exercicio",
+        "Aplicação no exercício (mínimo de 90%)",
+        "debitos_fundeb",
+        "receita_fundeb",
+        ">=",
+        0.90,
+    ),
+    Indicator(
+        "superavit_10",
+        "Superávit para o exercício seguinte (máximo de 10%)",
+        "receita_fundeb - debitos_fundeb",
+        "receita_fundeb",
+        "<=",
+        0.10,
+    ),
+    Indicator(
+        "vaar_condicionalidades",
+        "Complementação VAAR recebida (condicionalidades cumpridas)",
+        "vaar_recebido",
+        None,
+        ">",
+        0.0,
+    ),
+]
+
+
+def _measures(indicator: Indicator) -> list[Measure]:
+    """Medidas lidas por um indicador (inclui as das medidas derivadas)"""
+    measures = {measure.name: measure for measure in MEASURES}
+    pending = _IDENTIFIER.findall(f"{indicator.numerator} {indicator.denominator}")
+    found, seen = [], set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        if name in measures:
+            found.append(measures[name])
+        elif name in DERIVED_MEASURES:
+            pending.extend(_IDENTIFIER.findall(DERIVED_MEASURES[name]))
+    return found
+
+
+def sources(indicator: Indicator) -> list[str]:
+    """
+    Tabelas de origem de um indicador (inclui as das medidas derivadas)
+    Args:
+        indicator (Indicator): Indicador
+    Returns:
+        list[str]: Tabelas lidas, em ordem alfabética
+    """
+    return sorted({measure.table for measure in _measures(indicator)})
+
+
+def indicators_sql(measures: list[Measure]) -> str:
+    """
+    Consulta que calcula todos os indicadores, em todos os períodos
+    Args:
+        measures (list[Measure]): Medidas cujas tabelas existem no warehouse
+            (as demais ficam nulas e seus indicadores, 'sem_dados')
+    Returns:
+        str: SQL com uma linha por (uf, mes_referencia, indicador)
+    """
+    names = [measure.name for measure in MEASURES]
+    available = " UNION ALL ".join(measure.sql for measure in measures)
+    loaded = {measure.name for measure in measures}
+    wide = ", ".join(
+        f"sum(valor) FILTER (medida = '{name}') AS {name}" for name in names
+    )
+    derived = ", ".join(
+        f"{expression} AS {name}" for name, expression in DERIVED_MEASURES.items()
+    )
+    selects = []
+    for indicator in INDICATORS:
+        denominator = indicator.denominator or "NULL"
+        value = indicator.numerator
+        if indicator.denominator:
+            value = f"({indicator.numerator}) / nullif({indicator.denominator}, 0)"
+        # Sem a tabela de origem no warehouse: 'sem_dados' em todos os meses
+        where = "numerador IS NOT NULL OR denominador IS NOT NULL"
+        if any(measure.name not in loaded for measure in _measures(indicator)):
+            where = "TRUE"
+        selects.append(
+            f"""
+            SELECT
+                *,
+                CASE
+                    WHEN valor IS NULL THEN 'sem_dados'
+                    WHEN valor {indicator.comparison} limite THEN 'atendido'
+                    ELSE 'nao_atendido'
+                END AS status
+            FROM (
+                SELECT
+                    uf,
+                    year(mes_referencia) AS ano,
+                    mes_referencia,
+                    '{indicator.name}' AS indicador,
+                    '{indicator.description}' AS descricao,
+                    round({indicator.numerator}, 2) AS numerador,
+                    round({denominator}, 2)::DOUBLE AS denominador,
+                    ({value})::DOUBLE AS valor,
+                    {indicator.limit}::DOUBLE AS limite,
+                    '{indicator.formula}' AS formula,
+                    {sources(indicator)!r}::VARCHAR[] AS fontes
+                FROM medidas
+            )
+            WHERE {where}
+            """
+        )
+    return f"""
+        WITH mensal AS ({available}),
+        grade AS (
+            SELECT p.uf, p.mes_referencia, m.medida
+            FROM (SELECT DISTINCT uf, mes_referencia FROM mensal) AS p
+            CROSS JOIN (SELECT unnest({names!r}) AS medida) AS m
+        ),
+        acumulado AS (
+            SELECT
+                g.uf,
+                g.mes_referencia,
+                g.medida,
+                sum(v.valor) OVER (
+                    PARTITION BY g.uf, g.medida, year(g.mes_referencia)
+                    ORDER BY g.mes_referencia
+                ) AS valor
+            FROM grade AS g
+            LEFT JOIN mensal AS v USING (uf, mes_referencia, medida)
+        ),
+        medidas AS (
+            SELECT *, {derived}
+            FROM (SELECT uf, mes_referencia, {wide} FROM acumulado GROUP BY ALL)
+        ),
+        indicadores AS ({" UNION ALL ".join(selects)})
+        SELECT
+            *,
+            month(mes_referencia) = 12 AS final,
+            md5(concat_ws('|', formula, numerador, denominador)) AS hash_entradas
+        FROM indicadores
+    """
+
+
+@dataclass
+class IndicatorSummary:
+    """Resultado de uma execução de run_indicators."""
+
+    rows: int = 0
+    recalculated: int = 0
+    statuses: dict[str, int] | None = None
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        counts = ", ".join(
+            f"{count} {name}" for name, count in (self.statuses or {}).items()
+        )
+        return (
+            f"{INDICATORS_TABLE}: {self.rows} linhas ({self.recalculated} "
+            f"recalculadas; {counts or 'sem indicadores'}) em {self.seconds:.3f}s"
+        )
+
+
+def _export(con: duckdb.DuckDBPyConnection, gold_dir: Path) -> None:
+    """Exporta os indicadores para a Gold (tmp + rename, como o ModelRunner)"""
+    gold_dir.mkdir(parents=True, exist_ok=True)
+    output_path = gold_dir / f"{INDICATORS_TABLE.split('.', 1)[1]}.parquet"
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    con.execute(f"COPY {INDICATORS_TABLE} TO '{tmp_path}' (FORMAT parquet)")
+    os.replace(tmp_path, output_path)
+
+
+def _existing_tables(con: duckdb.DuckDBPyConnection) -> set[str]:
+    """Tabelas e views do warehouse (<schema>.<tabela>)"""
+    rows = con.execute(
+        "SELECT schema_name, table_name FROM duckdb_tables() "
+        "UNION ALL SELECT schema_name, view_name FROM duckdb_views() "
+        "WHERE NOT internal"
+    ).fetchall()
+    return {f"{schema}.{table}" for schema, table in rows}
+
+
+def run_indicators(
+    db_path: str | Path = DUCKDB_PATH,
+    gold_dir: str | Path = DATA_GOLD_DIR,
+    full_refresh: bool = False,
+) -> IndicatorSummary:
+    """
+    Calcula os indicadores de todos os períodos e atualiza gold.indicadores,
+    mantendo a linhagem das linhas cujas entradas não mudaram
+    Args:
+        db_path (str | Path): Caminho do DuckDB (com as tabelas Gold)
+        gold_dir (str | Path): Diretório dos parquets da camada Gold
+        full_refresh (bool): Recalcula (e recarimba) todas as linhas
+    Returns:
+        IndicatorSummary: Linhas, linhas recalculadas, status e tempo
+    """
+    logger = get_logger()
+    start = time.perf_counter()
+    with duckdb.connect(str(db_path)) as con:
+        existing = _existing_tables(con)
+        measures = [measure for measure in MEASURES if measure.table in existing]
+        if not measures:
+            logger.info("Nenhuma tabela de origem no warehouse: indicadores ignorados.")
+            return IndicatorSummary()
+
+        # Versão das fontes: última carga da Bronze vista pelos modelos
+        versions = {}
+        if MODEL_RUNS_TABLE in existing:
+            versions = dict(
+                con.execute(
+                    f"SELECT model, source_version FROM {MODEL_RUNS_TABLE}"
+                ).fetchall()
+            )
+        version_case = " ".join(
+            f"WHEN '{indicator.name}' THEN "
+            f"{max((versions.get(t, 0) for t in sources(indicator)), default=0)}"
+            for indicator in INDICATORS
+        )
+        query = indicators_sql(measures)
+
+        previous = "SELECT * FROM (VALUES (NULL, NULL, NULL, NULL, NULL, NULL))"
+        if INDICATORS_TABLE in existing and not full_refresh:
+            previous = (
+                "SELECT uf, mes_referencia, indicador, hash_entradas, "
+                f"versao_fontes, calculado_em FROM {INDICATORS_TABLE}"
+            )
+        con.execute("BEGIN TRANSACTION")
+        try:
+            con.execute("CREATE SCHEMA IF NOT EXISTS gold")
+            con.execute(
+                f"""
+                CREATE OR REPLACE TABLE {INDICATORS_TABLE} AS
+                WITH novo AS ({query}),
+                anterior AS (
+                    SELECT * FROM ({previous}) AS a(uf, mes_referencia,
+                        indicador, hash_entradas, versao_fontes, calculado_em)
+                )
+                SELECT
+                    n.*,
+                    a.hash_entradas IS NULL AS recalculado,
+                    coalesce(
+                        a.versao_fontes, CASE n.indicador {version_case} END
+                    )::BIGINT AS versao_fontes,
+                    coalesce(a.calculado_em, now()::TIMESTAMP) AS calculado_em
+                FROM novo AS n
+                LEFT JOIN anterior AS a
+                    ON a.uf = n.uf
+                    AND a.mes_referencia = n.mes_referencia
+                    AND a.indicador = n.indicador
+                    AND a.hash_entradas = n.hash_entradas
+                ORDER BY n.uf, n.mes_referencia, n.indicador
+                """
+            )
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        rows, recalculated = con.execute(
+            f"SELECT count(*), count(*) FILTER (recalculado) FROM {INDICATORS_TABLE}"
+        ).fetchone()
+        statuses = dict(
+            con.execute(
+                f"SELECT status, count(*) FROM {INDICATORS_TABLE} "
+                "GROUP BY ALL ORDER BY ALL"
+            ).fetchall()
+        )
+        _export(con, Path(gold_dir))
+
+    summary = IndicatorSummary(
+        rows, recalculated, statuses, time.perf_counter() - start
+    )
+    logger.info(str(summary))
+    return summary
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Indicadores legais do FUNDEB.")
+    parser.add_argument("--db", type=Path, default=DUCKDB_PATH, help="Warehouse")
+    parser.add_argument("--gold-dir", type=Path, default=DATA_GOLD_DIR)
+    parser.add_argument(
+        "--full-refresh", action="store_true", help="Recalcula todas as linhas"
+    )
+    args = parser.parse_args()
+    init()
+    print(run_indicators(args.db, args.gold_dir, args.full_refresh))
+
+
+if __name__ == "__main__":
+    main()
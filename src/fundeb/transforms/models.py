@@ -0,0 +1,83 @@
+"""
+Registro dos modelos Silver/Gold do warehouse, executados em processo pelo
+ModelRunner (fundeb.transforms.runner) ao fim do flow:
+
+    python -m fundeb.transforms.models            # só os desatualizados
+    python -m fundeb.transforms.models --full-refresh
+
+Novos modelos entram na lista MODELS; a ordem de execução sai das
+referências entre eles no SQL.
+"""
+
+import argparse
+from pathlib import Path
+
+from fundeb.config.settings import DATA_GOLD_DIR, DUCKDB_PATH, init
+from fundeb.transforms import (
+    bank_statements,
+    consolidation,
+    forecasting,
+    indicators,
+    payroll,
+    reconciliation,
+)
+from fundeb.transforms.runner import Model, ModelResult, ModelRunner
+
+MODELS: list[Model] = [
+    *bank_statements.MODELS,
+    *consolidation.MODELS,
+    *forecasting.SERIES_MODELS,
+    *indicators.MODELS,
+    *payroll.MODELS,
+    *reconciliation.MODELS,
+]
+
+
+def run_models(
+    db_path: str | Path = DUCKDB_PATH,
+    gold_dir: str | Path = DATA_GOLD_DIR,
+    full_refresh: bool = False,
+) -> list[ModelResult]:
+    """
+    Executa os modelos desatualizados do registro
+    Args:
+        db_path (str | Path): Caminho do DuckDB
+        gold_dir (str | Path): Diretório dos parquets da camada Gold
+        full_refresh (bool): Reexecuta todos os modelos
+    Returns:
+        list[ModelResult]: Status, linhas e tempo de cada modelo
+    """
+    return ModelRunner(MODELS, db_path, gold_dir).run(full_refresh)
+
+
+def format_timings(results: list[ModelResult]) -> str:
+    """Tabela de tempos por modelo (mais lentos primeiro) e o total"""
+    width = max((len(result.model) for result in results), default=0)
+    lines = [
+        f"{result.model:<{width}}  {result.status:<7}  {result.seconds:8.3f}s  "
+        f"{'' if result.rows is None else result.rows:>10}  {result.reason}"
+        for result in sorted(results, key=lambda result: -result.seconds)
+    ]
+    total = sum(result.seconds for result in results)
+    built = sum(result.status == "built" for result in results)
+    lines.append(f"{built}/{len(results)} modelos executados em {total:.3f}s")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Transformações Silver/Gold no DuckDB (em processo)."
+    )
+    parser.add_argument("--db", type=Path, default=DUCKDB_PATH, help="Warehouse")
+    parser.add_argument("--gold-dir", type=Path, default=DATA_GOLD_DIR)
+    parser.add_argument(
+        "--full-refresh", action="store_true", help="Reexecuta todos os modelos"
+    )
+    args = parser.parse_args()
+    init()
+    print(format_timings(run_models(args.db, args.gold_dir, args.full_refresh)))
+
+
+if __name__ == "__main__":
+    main()
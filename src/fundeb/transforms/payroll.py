@@ -0,0 +1,142 @@
+"""
+Modelos da folha de pagamento: servidor por competência (Silver) e
+agregados mensais por cargo, escola e fonte de recurso (Gold).
+
+Calculados ao fim do flow (ver fundeb.transforms.runner), a partir de
+bronze.folha (uma linha por rubrica). A Silver reduz as rubricas a uma
+linha por servidor, cargo, escola e fonte na competência, e os agregados
+Gold partem dela, sem reler as rubricas. Cada agregado vira um parquet
+pequeno em DATA_GOLD_DIR, lido diretamente pelo app
+(app/pages/3_Folha.py) e pelos indicadores (ex: mínimo de 70% do FUNDEB
+na remuneração dos profissionais):
+
+    python -m fundeb.transforms.payroll
+"""
+
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+from fundeb.config.settings import DATA_GOLD_DIR, DATA_SILVER_DIR, DUCKDB_PATH, init
+from fundeb.transforms.runner import Model, ModelRunner
+
+SOURCE_TABLE = "bronze.folha"
+
+# Proventos (P) e descontos (D) de cada servidor por competência. Um
+# servidor pago por mais de uma fonte (ou lotado em mais de uma escola) tem
+# uma linha por fonte (escola).
+EMPLOYEE_MONTH_MODEL = Model(
+    "silver.folha_servidor_mes",
+    f"""
+        SELECT
+            uf,
+            municipio,
+            competencia::DATE AS competencia,
+            matricula,
+            cargo,
+            vinculo,
+            escola,
+            nome_escola,
+            fonte_recurso,
+            coalesce(sum(valor) FILTER (tipo = 'P'), 0) AS proventos,
+            coalesce(sum(valor) FILTER (tipo = 'D'), 0) AS descontos,
+            count(*) AS rubricas
+        FROM {SOURCE_TABLE}
+        GROUP BY ALL
+    """,
+    # Partições de bronze.folha (extractors.yaml): uma folha nova só regrava
+    # as suas competências
+    partition_by={
+        "uf": "uf",
+        "ano": "year(competencia)",
+        "mes": "month(competencia)",
+    },
+)
+
+_TOTALS = f"""
+            count(DISTINCT matricula) AS servidores,
+            round(sum(proventos), 2) AS proventos,
+            round(sum(descontos), 2) AS descontos,
+            round(sum(proventos) - sum(descontos), 2) AS liquido
+        FROM {EMPLOYEE_MONTH_MODEL.name}
+        GROUP BY ALL
+        ORDER BY ALL
+"""
+
+# Totais mensais por dimensão: servidores distintos, proventos, descontos e
+# líquido
+MONTHLY_ROLLUPS = {
+    "folha_mensal_cargo": f"""
+        SELECT uf, municipio, competencia, cargo, vinculo, {_TOTALS}
+    """,
+    "folha_mensal_escola": f"""
+        SELECT uf, municipio, competencia, escola, nome_escola, {_TOTALS}
+    """,
+    "folha_mensal_fonte": f"""
+        SELECT uf, municipio, competencia, fonte_recurso, {_TOTALS}
+    """,
+}
+
+MODELS = [
+    EMPLOYEE_MONTH_MODEL,
+    *(
+        Model(f"gold.{name}", query, export=True)
+        for name, query in MONTHLY_ROLLUPS.items()
+    ),
+]
+
+
+def employee_history(
+    matricula: str, silver_dir: str | Path = DATA_SILVER_DIR
+) -> pd.DataFrame:
+    """
+    Rubricas de um servidor em todas as competências, lidas das partições
+    da Silver (ordenadas por matrícula: só os row groups do servidor)
+    Args:
+        matricula (str): Matrícula do servidor
+        silver_dir (str | Path): Diretório das partições hive
+    Returns:
+        pd.DataFrame: Uma linha por rubrica, por competência
+    """
+    pattern = str(Path(silver_dir) / "folha" / "**" / "*.parquet")
+    with duckdb.connect() as con:
+        return con.execute(
+            """
+            SELECT competencia, cargo, escola, fonte_recurso, rubrica,
+                descricao_rubrica, tipo, valor
+            FROM read_parquet(?, hive_partitioning = true)
+            WHERE matricula = ?
+            ORDER BY competencia, rubrica
+            """,
+            [pattern, matricula],
+        ).df()
+
+
+def materialize_payroll_rollups(
+    db_path: str | Path = DUCKDB_PATH,
+    gold_dir: str | Path = DATA_GOLD_DIR,
+    full_refresh: bool = False,
+) -> dict[str, int]:
+    """
+    Atualiza os agregados da folha no warehouse e exporta-os para a Gold
+    (só os desatualizados, salvo full_refresh)
+    Args:
+        db_path (str | Path): Caminho do DuckDB (com bronze.folha)
+        gold_dir (str | Path): Diretório dos parquets da camada Gold
+        full_refresh (bool): Recalcula todos os modelos
+    Returns:
+        dict[str, int]: Linhas por agregado (nome -> linhas)
+    """
+    results = ModelRunner(MODELS, db_path, gold_dir).run(full_refresh)
+    return {
+        result.model.removeprefix("gold."): result.rows
+        for result in results
+        if result.model.startswith("gold.") and result.rows is not None
+    }
+
+
+if __name__ == "__main__":
+    init()
+    for name, count in materialize_payroll_rollups(full_refresh=True).items():
+        print(f"gold.{name}: {count} linhas")
@@ -0,0 +1,476 @@
+"""
+Conciliação dos repasses do FNDE por decêndio com os lançamentos bancários.
+
+Os dois lados vêm de modelos Silver (executados pelo ModelRunner):
+- silver.repasses_decendio: transferências do FNDE (AJUSTES_REPASSES_*.csv)
+  com valor diferente de zero, com a janela de crédito de cada decêndio
+  (do 1º dia do decêndio até o último + CREDIT_LAG_DAYS). Só entram os
+  decêndios dentro do período coberto pelos extratos da UF;
+- silver.lancamentos_conciliaveis: lançamentos dos extratos das categorias
+  de RECONCILIATION_GROUPS (ex: FPE/FPM, RECEBIMENTODEICMS).
+Os valores são comparados com sinal e em centavos: ajustes negativos do
+FNDE casam com débitos.
+
+run_reconciliation() casa os dois lados por UF, grupo (ex: ICMS) e valor,
+dentro da janela do decêndio. Cada passada ordena os lados pela data e
+busca, para cada repasse, o primeiro lançamento da janela com a mesma
+chave (pd.merge_asof: índice ordenado + busca binária), em O(n log n):
+1. conciliado: mesmo valor (cada lançamento casa com um único repasse);
+2. duplicado: lançamento com o mesmo valor de um repasse já conciliado,
+   dentro da mesma janela;
+3. divergente: repasse sem par exato, casado com um lançamento do mesmo
+   grupo na janela (a diferença fica em 'diferenca');
+4. ausente: repasse sem lançamento na janela;
+5. nao_previsto: lançamento sem repasse, no período dos repasses da UF.
+
+O resultado vai para gold.conciliacao_repasses (uma linha por repasse ou
+lançamento, com arquivo e linha de origem) e o resumo por decêndio para
+gold.conciliacao_decendio, ambos também na Gold (parquet):
+
+    python -m fundeb.transforms.reconciliation
+"""
+
+import argparse
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from fundeb.config.logger import get_logger
+from fundeb.config.settings import DATA_GOLD_DIR, DUCKDB_PATH, init
+from fundeb.transforms.bank_statements import ENTRIES_MODEL
+from fundeb.transforms.runner import Model
+from fundeb.utils.metrics import stage
+
+# Dias, depois do fim do decêndio, em que o crédito ainda é aceito
+CREDIT_LAG_DAYS = 5
+
+# Grupo: (tipos de transferência do FNDE, prefixos da categoria no extrato).
+# O tipo é o fim do nome da transferência (ex: AJUSTE FUNDEB/ICME -> ICME).
+RECONCILIATION_GROUPS = {
+    "FPE/FPM": (("FPE", "FPM"), ("FPE/FPM",)),
+    "ICMS": (("ICME",), ("RECEBIMENTODEICMS",)),
+    "IPI": (("IPIE",), ("IPI/",)),
+    "IPVA": (("IPVA",), ("IPVA",)),
+    "ITCMD": (("ITCMD",), ("ITCMD",)),
+    "ITR": (("ITR",), ("ITR",)),
+}
+
+RESULTS_TABLE = "gold.conciliacao_repasses"
+SUMMARY_TABLE = "gold.conciliacao_decendio"
+STATUSES = ["conciliado", "divergente", "ausente", "duplicado", "nao_previsto"]
+DECENDIO_KEY = ["uf", "ano", "mes", "decendio"]
+
+
+def _group_case(column: str, side: int, condition: str) -> str:
+    """CASE do SQL que leva uma coluna ao seu grupo de conciliação"""
+    whens = [
+        f"WHEN {column} {condition.format(value=value)} THEN '{group}'"
+        for group, values in RECONCILIATION_GROUPS.items()
+        for value in values[side]
+    ]
+    return "CASE " + " ".join(whens) + " END"
+
+
+EXPECTED_GROUP = _group_case("split_part(transferencia, '/', -1)", 0, "= '{value}'")
+ENTRY_GROUP = _group_case("categoria", 1, "LIKE '{value}%'")
+
+MODELS = [
+    Model(
+        "silver.repasses_decendio",
+        f"""
+            WITH repasses AS (
+                SELECT
+                    uf,
+                    ano,
+                    mes,
+                    decendio,
+                    transferencia,
+                    {EXPECTED_GROUP} AS grupo,
+                    valor,
+                    make_date(ano, mes, (decendio - 1) * 10 + 1) AS inicio,
+                    CASE decendio
+                        WHEN 3 THEN last_day(make_date(ano, mes, 1))
+                        ELSE make_date(ano, mes, decendio * 10)
+                    END + {CREDIT_LAG_DAYS} AS fim,
+                    file_name,
+                    line_number
+                FROM bronze.fnde_repasses
+                WHERE valor <> 0
+            ),
+            cobertura AS (
+                SELECT uf, min(data_lancamento) AS de, max(data_lancamento) AS ate
+                FROM {ENTRIES_MODEL.name}
+                GROUP BY uf
+            )
+            SELECT
+                r.* EXCLUDE (file_name, line_number),
+                round(r.valor * 100)::BIGINT AS centavos,
+                r.file_name,
+                r.line_number
+            FROM repasses AS r
+            JOIN cobertura AS c ON r.uf = c.uf AND r.fim >= c.de AND r.inicio <= c.ate
+            WHERE r.grupo IS NOT NULL
+            ORDER BY ALL
+        """,
+    ),
+    Model(
+        "silver.lancamentos_conciliaveis",
+        f"""
+            SELECT * FROM (
+                SELECT
+                    uf,
+                    banco,
+                    agencia,
+                    conta,
+                    data_lancamento,
+                    categoria,
+                    {ENTRY_GROUP} AS grupo,
+                    valor_assinado AS valor,
+                    round(valor_assinado * 100)::BIGINT AS centavos,
+                    file_name,
+                    line_number
+                FROM {ENTRIES_MODEL.name}
+            )
+            WHERE grupo IS NOT NULL
+            ORDER BY ALL
+        """,
+    ),
+]
+
+
+def _match(
+    expected: pd.DataFrame, entries: pd.DataFrame, by: list[str]
+) -> pd.DataFrame:
+    """
+    Pares (id_previsto, id_lancamento) um a um: para cada repasse, o
+    primeiro lançamento com a mesma chave 'by' a partir do início da janela,
+    aceito se cair até o fim dela. Um lançamento disputado fica com o
+    repasse de janela mais antiga e os demais tentam de novo com o próximo
+    lançamento, até nenhum par novo aparecer.
+    """
+    pairs = []
+    expected = expected.sort_values("inicio")
+    entries = entries.sort_values("data_lancamento")
+    while len(expected) and len(entries):
+        matched = pd.merge_asof(
+            expected[[*by, "inicio", "fim", "id_previsto"]],
+            entries[[*by, "data_lancamento", "id_lancamento"]],
+            left_on="inicio",
+            right_on="data_lancamento",
+            by=by,
+            direction="forward",
+        )
+        matched = matched[matched["data_lancamento"] <= matched["fim"]]
+        matched = matched.drop_duplicates("id_lancamento")
+        if matched.empty:
+            break
+        pairs.append(matched[["id_previsto", "id_lancamento"]])
+        expected = expected[~expected["id_previsto"].isin(matched["id_previsto"])]
+        entries = entries[~entries["id_lancamento"].isin(matched["id_lancamento"])]
+    if not pairs:
+        return pd.DataFrame({"id_previsto": [], "id_lancamento": []}, dtype="int64")
+    return pd.concat(pairs, ignore_index=True)
+
+
+def _duplicates(
+    expected: pd.DataFrame, entries: pd.DataFrame, by: list[str]
+) -> pd.DataFrame:
+    """
+    Lançamentos com a chave de um repasse já conciliado, dentro da janela
+    dele: (id_previsto, id_lancamento), um repasse por lançamento
+    """
+    matched = pd.merge_asof(
+        entries.sort_values("data_lancamento")[
+            [*by, "data_lancamento", "id_lancamento"]
+        ],
+        expected.sort_values("inicio")[[*by, "inicio", "fim", "id_previsto"]],
+        left_on="data_lancamento",
+        right_on="inicio",
+        by=by,
+        direction="backward",
+    )
+    matched = matched[matched["data_lancamento"] <= matched["fim"]]
+    return matched[["id_previsto", "id_lancamento"]].astype("int64")
+
+
+def _decendio(dates: pd.Series) -> pd.DataFrame:
+    """Ano, mês e decêndio (1, 2 ou 3) de cada data"""
+    dates = pd.to_datetime(dates)
+    return pd.DataFrame(
+        {
+            "ano": dates.dt.year,
+            "mes": dates.dt.month,
+            "decendio": np.minimum((dates.dt.day - 1) // 10 + 1, 3),
+        },
+        index=dates.index,
+    )
+
+
+def reconcile(expected: pd.DataFrame, entries: pd.DataFrame) -> pd.DataFrame:
+    """
+    Concilia repasses previstos com lançamentos bancários
+    Args:
+        expected (pd.DataFrame): Repasses (colunas de silver.repasses_decendio)
+        entries (pd.DataFrame): Lançamentos (colunas de
+            silver.lancamentos_conciliaveis)
+    Returns:
+        pd.DataFrame: Uma linha por repasse (conciliado, divergente ou
+            ausente) e por lançamento sem repasse (duplicado ou
+            nao_previsto), com o decêndio, os dois valores e a diferença
+    """
+    expected = expected.reset_index(drop=True)
+    entries = entries.reset_index(drop=True)
+    # Índices das passadas: só inteiros e datas. UF e grupo viram um código
+    # comum aos dois lados (chave); o valor, centavos.
+    ufs = pd.concat([expected["uf"], entries["uf"]]).astype(str)
+    uf_codes, _ = pd.factorize(ufs)
+    codes, _ = pd.factorize(
+        ufs + "|" + pd.concat([expected["grupo"], entries["grupo"]]).astype(str)
+    )
+    planned = pd.DataFrame(
+        {
+            "uf": uf_codes[: len(expected)],
+            "chave": codes[: len(expected)],
+            "centavos": expected["centavos"].astype("int64"),
+            "inicio": pd.to_datetime(expected["inicio"]),
+            "fim": pd.to_datetime(expected["fim"]),
+            "id_previsto": np.arange(len(expected)),
+        }
+    )
+    posted = pd.DataFrame(
+        {
+            "uf": uf_codes[len(expected) :],
+            "chave": codes[len(expected) :],
+            "centavos": entries["centavos"].astype("int64"),
+            "data_lancamento": pd.to_datetime(entries["data_lancamento"]),
+            "id_lancamento": np.arange(len(entries)),
+        }
+    )
+    exact_key = ["chave", "centavos"]
+
+    # 1. Mesmo valor na janela
+    exact = _match(planned, posted, exact_key)
+    exact["status"] = "conciliado"
+    is_exact = planned["id_previsto"].isin(exact["id_previsto"])
+    planned_left = planned[~is_exact]
+    posted_left = posted[~posted["id_lancamento"].isin(exact["id_lancamento"])]
+
+    # 2. Lançamentos repetidos de um repasse já conciliado
+    duplicated = _duplicates(planned[is_exact], posted_left, exact_key)
+    duplicated["status"] = "duplicado"
+    posted_left = posted_left[
+        ~posted_left["id_lancamento"].isin(duplicated["id_lancamento"])
+    ]
+
+    # 3. Mesmo grupo e sinal na janela, valor diferente
+    planned_left = planned_left.assign(sinal=np.sign(planned_left["centavos"]))
+    posted_left = posted_left.assign(sinal=np.sign(posted_left["centavos"]))
+    mismatched = _match(planned_left, posted_left, ["chave", "sinal"])
+    mismatched["status"] = "divergente"
+    planned_left = planned_left[
+        ~planned_left["id_previsto"].isin(mismatched["id_previsto"])
+    ]
+    posted_left = posted_left[
+        ~posted_left["id_lancamento"].isin(mismatched["id_lancamento"])
+    ]
+
+    # 4. Repasses sem lançamento; 5. lançamentos sem repasse, no período dos
+    # repasses da UF (fora dele não há o que conciliar)
+    missing = pd.DataFrame(
+        {"id_previsto": planned_left["id_previsto"], "status": "ausente"}
+    )
+    period = planned.groupby("uf").agg(de=("inicio", "min"), ate=("fim", "max"))
+    unexpected = posted_left.join(period, on="uf")
+    unexpected = unexpected[
+        unexpected["data_lancamento"].between(unexpected["de"], unexpected["ate"])
+    ]
+    unexpected = pd.DataFrame(
+        {"id_lancamento": unexpected["id_lancamento"], "status": "nao_previsto"}
+    )
+
+    # Linhas do resultado: os dois lados de cada par, lidos pela posição
+    # (-1: sem par, vira nulo no reindex)
+    links = pd.concat(
+        [exact, duplicated, mismatched, missing, unexpected], ignore_index=True
+    )
+    links = links.fillna({"id_previsto": -1, "id_lancamento": -1})
+    planned_side = expected.rename(
+        columns={
+            "valor": "valor_previsto",
+            "file_name": "arquivo_fnde",
+            "line_number": "linha_fnde",
+        }
+    ).reindex(links["id_previsto"].astype("int64"))
+    posted_side = entries.rename(
+        columns={
+            "valor": "valor_lancado",
+            "file_name": "arquivo_extrato",
+            "line_number": "linha_extrato",
+        }
+    ).reindex(links["id_lancamento"].astype("int64"))
+    result = pd.concat(
+        [
+            planned_side.drop(columns=["inicio", "fim", "centavos"]).reset_index(
+                drop=True
+            ),
+            posted_side.drop(columns=["uf", "grupo", "centavos"]).reset_index(
+                drop=True
+            ),
+            links[["status"]],
+        ],
+        axis=1,
+    )
+
+    # UF, grupo e decêndio dos lançamentos sem repasse vêm do próprio
+    # lançamento (a data define o decêndio)
+    orphans = (links["id_previsto"] < 0).to_numpy()
+    if orphans.any():
+        result.loc[orphans, "uf"] = posted_side["uf"].to_numpy()[orphans]
+        result.loc[orphans, "grupo"] = posted_side["grupo"].to_numpy()[orphans]
+        decendios = _decendio(result.loc[orphans, "data_lancamento"])
+        for column in ("ano", "mes", "decendio"):
+            result.loc[orphans, column] = decendios[column].to_numpy()
+
+    result["diferenca"] = result["valor_lancado"].fillna(0) - result[
+        "valor_previsto"
+    ].fillna(0)
+    for column in ("ano", "mes", "decendio"):
+        result[column] = result[column].astype("int64")
+    for column in ("linha_fnde", "linha_extrato"):
+        result[column] = result[column].astype("Int64")
+    columns = [
+        *DECENDIO_KEY,
+        "grupo",
+        "transferencia",
+        "status",
+        "valor_previsto",
+        "valor_lancado",
+        "diferenca",
+        "data_lancamento",
+        "categoria",
+        "banco",
+        "agencia",
+        "conta",
+        "arquivo_fnde",
+        "linha_fnde",
+        "arquivo_extrato",
+        "linha_extrato",
+    ]
+    return result[columns].sort_values([*DECENDIO_KEY, "grupo", "status"])
+
+
+@dataclass
+class ReconciliationSummary:
+    """Resultado de uma execução de run_reconciliation."""
+
+    statuses: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        counts = ", ".join(f"{count} {name}" for name, count in self.statuses.items())
+        return f"{RESULTS_TABLE}: {counts or 'nada a conciliar'} em {self.seconds:.3f}s"
+
+
+def _export(con: duckdb.DuckDBPyConnection, table: str, gold_dir: Path) -> None:
+    """Exporta uma tabela para a Gold (tmp + rename, como o ModelRunner)"""
+    gold_dir.mkdir(parents=True, exist_ok=True)
+    output_path = gold_dir / f"{table.split('.', 1)[1]}.parquet"
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    con.execute(f"COPY {table} TO '{tmp_path}' (FORMAT parquet)")
+    os.replace(tmp_path, output_path)
+
+
+def run_reconciliation(
+    db_path: str | Path = DUCKDB_PATH,
+    gold_dir: str | Path = DATA_GOLD_DIR,
+) -> ReconciliationSummary:
+    """
+    Concilia todos os repasses do FNDE com os lançamentos dos extratos
+    Args:
+        db_path (str | Path): Caminho do DuckDB (com os modelos Silver)
+        gold_dir (str | Path): Diretório dos parquets da camada Gold
+    Returns:
+        ReconciliationSummary: Linhas por status e tempo
+    """
+    logger = get_logger()
+    start = time.perf_counter()
+    with duckdb.connect(str(db_path)) as con:
+        existing = {
+            f"{schema}.{table}"
+            for schema, table in con.execute(
+                "SELECT schema_name, table_name FROM duckdb_tables()"
+            ).fetchall()
+        }
+        if any(model.name not in existing for model in MODELS):
+            logger.info(
+                "Repasses ou extratos ausentes no warehouse: conciliação ignorada."
+            )
+            return ReconciliationSummary()
+
+        expected, entries = (
+            con.execute(f"SELECT * FROM {model.name}").df() for model in MODELS
+        )
+        with stage("reconciliation.match") as current:
+            current.rows = len(expected) + len(entries)
+            result = reconcile(expected, entries)
+
+        con.register("conciliacao", result)
+        status_counts = ", ".join(
+            f"count(*) FILTER (status = '{status}') AS {status}" for status in STATUSES
+        )
+        con.execute("BEGIN TRANSACTION")
+        try:
+            con.execute("CREATE SCHEMA IF NOT EXISTS gold")
+            con.execute(
+                f"CREATE OR REPLACE TABLE {RESULTS_TABLE} AS SELECT * REPLACE "
+                "(data_lancamento::DATE AS data_lancamento) FROM conciliacao"
+            )
+            con.execute(
+                f"""
+                CREATE OR REPLACE TABLE {SUMMARY_TABLE} AS
+                SELECT
+                    {", ".join(DECENDIO_KEY)},
+                    {status_counts},
+                    coalesce(sum(valor_previsto), 0) AS valor_previsto,
+                    coalesce(sum(valor_lancado), 0) AS valor_lancado,
+                    sum(diferenca) AS diferenca
+                FROM {RESULTS_TABLE}
+                GROUP BY ALL
+                ORDER BY ALL
+                """
+            )
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        for table in (RESULTS_TABLE, SUMMARY_TABLE):
+            _export(con, table, Path(gold_dir))
+
+    counts = result["status"].value_counts()
+    summary = ReconciliationSummary(
+        {status: int(counts.get(status, 0)) for status in STATUSES},
+        time.perf_counter() - start,
+    )
+    logger.info(str(summary))
+    return summary
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Conciliação dos repasses do FNDE com os extratos."
+    )
+    parser.add_argument("--db", type=Path, default=DUCKDB_PATH, help="Warehouse")
+    parser.add_argument("--gold-dir", type=Path, default=DATA_GOLD_DIR)
+    args = parser.parse_args()
+    init()
+    print(run_reconciliation(args.db, args.gold_dir))
+
+
+if __name__ == "__main__":
+    main()
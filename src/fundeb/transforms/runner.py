@@ -0,0 +1,377 @@
+"""
+Transformações Silver/Gold em processo, direto no DuckDB (substitui o dbt).
+
+Cada modelo é uma consulta SQL materializada como a tabela <schema>.<nome>
+do warehouse (DUCKDB_PATH). As dependências saem do próprio SQL: toda
+referência bronze.x, silver.x ou gold.x a outro modelo é uma aresta do
+grafo, e as demais (ex: bronze.conta_corrente) são fontes. Os modelos rodam
+em ordem topológica, e um modelo só é reexecutado quando:
+- a tabela não existe ou o SQL mudou;
+- uma fonte foi carregada depois da última execução (meta.loads);
+- um modelo do qual ele depende foi reexecutado nesta rodada.
+
+Um modelo lido direto de uma tabela particionada da Bronze pode declarar
+'partition_by' (coluna de partição da fonte -> expressão sobre as colunas do
+modelo). Quando só há cargas novas, ele não é recriado: as fatias
+(ex: uf/ano/mes) tocadas pelas cargas, registradas em meta.loads, são
+apagadas e reinseridas. Os demais modelos (e os que dependem de um modelo
+reexecutado) são recriados por inteiro: a granularidade é a tabela.
+
+O estado de cada modelo (hash do SQL, última carga vista, linhas e tempo)
+fica em meta.model_runs, e cada execução reporta o tempo por modelo.
+"""
+
+import graphlib
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+from fundeb.config.logger import get_logger
+from fundeb.config.settings import DATA_GOLD_DIR, DUCKDB_PATH
+from fundeb.loaders.duckdb_loader import LOADS_TABLE, partition_filter
+
+# Estado dos modelos: uma linha por modelo, da última execução
+MODEL_RUNS_TABLE = "meta.model_runs"
+
+# Referências a tabelas das camadas no SQL (ex: gold.saldo_mensal_conta)
+TABLE_REFERENCE = re.compile(
+    r'\b(bronze|silver|gold)\.("?)([A-Za-z_][A-Za-z0-9_]*)\2', re.IGNORECASE
+)
+
+
+@dataclass(frozen=True)
+class Model:
+    """Um modelo SQL: a tabela 'name' (<schema>.<tabela>) materializada."""
+
+    name: str
+    sql: str
+    export: bool = False  # Também grava <gold_dir>/<tabela>.parquet (app)
+    # Coluna de partição da fonte -> expressão sobre as colunas do modelo
+    # (ex: {'ano': 'year(mes_referencia)'}): atualização por fatias
+    partition_by: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def schema(self) -> str:
+        return self.name.split(".", 1)[0]
+
+    @property
+    def table(self) -> str:
+        return self.name.split(".", 1)[1]
+
+    @property
+    def references(self) -> set[str]:
+        """Tabelas lidas pelo SQL (<schema>.<tabela>, em minúsculas)"""
+        return {
+            f"{schema.lower()}.{table.lower()}"
+            for schema, _, table in TABLE_REFERENCE.findall(self.sql)
+        } - {self.name}
+
+    @property
+    def sql_hash(self) -> str:
+        normalized = " ".join(self.sql.split())
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+@dataclass
+class ModelResult:
+    """Resultado de um modelo numa execução."""
+
+    model: str
+    status: str  # built | fresh | skipped | error
+    rows: int | None = None
+    seconds: float = 0.0
+    reason: str = ""
+
+    def __str__(self) -> str:
+        rows = "" if self.rows is None else f", {self.rows} linhas"
+        return f"{self.model}: {self.status} em {self.seconds:.3f}s{rows} {self.reason}"
+
+
+class ModelGraph:
+    """Grafo de dependências dos modelos, a partir das referências no SQL."""
+
+    def __init__(self, models: list[Model]):
+        self.models = {model.name: model for model in models}
+        self.parents = {
+            name: model.references & self.models.keys()
+            for name, model in self.models.items()
+        }
+
+    def order(self) -> list[str]:
+        """
+        Modelos em ordem topológica (dependências antes)
+        Raises:
+            graphlib.CycleError: Dependência circular entre modelos
+        """
+        return list(graphlib.TopologicalSorter(self.parents).static_order())
+
+    def sources(self, name: str) -> set[str]:
+        """Fontes (tabelas que não são modelos) de um modelo, transitivamente"""
+        sources = self.models[name].references - self.models.keys()
+        for parent in self.parents[name]:
+            sources |= self.sources(parent)
+        return sources
+
+
+class ModelRunner:
+    """Executa os modelos no warehouse, reexecutando só os desatualizados."""
+
+    def __init__(
+        self,
+        models: list[Model],
+        db_path: str | Path = DUCKDB_PATH,
+        gold_dir: str | Path = DATA_GOLD_DIR,
+    ):
+        self.logger = get_logger()
+        self.graph = ModelGraph(models)
+        self.db_path = Path(db_path)
+        self.gold_dir = Path(gold_dir)
+
+    @staticmethod
+    def _existing_tables(con: duckdb.DuckDBPyConnection) -> set[str]:
+        """Tabelas e views do warehouse (<schema>.<tabela>, em minúsculas)"""
+        rows = con.execute(
+            "SELECT schema_name, table_name FROM duckdb_tables() "
+            "UNION ALL SELECT schema_name, view_name FROM duckdb_views() "
+            "WHERE NOT internal"
+        ).fetchall()
+        return {f"{schema.lower()}.{table.lower()}" for schema, table in rows}
+
+    @staticmethod
+    def _load_versions(
+        con: duckdb.DuckDBPyConnection, existing: set[str]
+    ) -> dict[str, int]:
+        """Última carga (load_id) de cada tabela da Bronze"""
+        if LOADS_TABLE not in existing:
+            return {}
+        rows = con.execute(
+            f"SELECT lower(table_name), max(load_id) FROM {LOADS_TABLE} GROUP BY 1"
+        ).fetchall()
+        return dict(rows)
+
+    def _touched_partitions(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        model: Model,
+        source: str,
+        last_version: int,
+    ) -> list[dict[str, Any]] | None:
+        """
+        Partições da fonte tocadas pelas cargas posteriores a 'last_version'
+        (None: alguma carga sem as partições do modelo, recria a tabela)
+        """
+        partitions: dict[tuple, dict[str, Any]] = {}
+        for (loaded,) in con.execute(
+            f"SELECT partitions FROM {LOADS_TABLE} "
+            "WHERE lower(table_name) = ? AND load_id > ?",
+            [source, last_version],
+        ).fetchall():
+            loaded = json.loads(loaded) if loaded else []
+            if not loaded:
+                return None
+            for partition in loaded:
+                if partition.keys() != model.partition_by.keys():
+                    return None
+                values = tuple(partition[name] for name in model.partition_by)
+                partitions[values] = dict(zip(model.partition_by, values, strict=True))
+        return list(partitions.values())
+
+    def _stale_reason(
+        self,
+        name: str,
+        state: dict[str, tuple[str, int, int]],
+        existing: set[str],
+        source_version: int,
+        rebuilt: set[str],
+    ) -> str:
+        """Motivo para reexecutar um modelo ('' = atualizado)"""
+        model = self.graph.models[name]
+        if name not in existing or name not in state:
+            return "(nova tabela)"
+        sql_hash, last_version, _ = state[name]
+        if sql_hash != model.sql_hash:
+            return "(SQL alterado)"
+        if source_version > last_version:
+            return "(novas cargas na Bronze)"
+        if self.graph.parents[name] & rebuilt:
+            return "(dependência reexecutada)"
+        return ""
+
+    def _build(self, con: duckdb.DuckDBPyConnection, model: Model) -> int:
+        """Materializa um modelo e devolve as linhas"""
+        con.execute(f"CREATE SCHEMA IF NOT EXISTS {model.schema}")
+        con.execute(f"CREATE OR REPLACE TABLE {model.name} AS {model.sql}")
+        return con.execute(f"SELECT count(*) FROM {model.name}").fetchone()[0]
+
+    def _refresh(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        model: Model,
+        partitions: list[dict[str, Any]],
+    ) -> int:
+        """Apaga e reinsere só as fatias das partições tocadas"""
+        condition, params = partition_filter(
+            list(model.partition_by.values()), partitions
+        )
+        con.execute(f"DELETE FROM {model.name} WHERE {condition}", params)
+        con.execute(
+            f"INSERT INTO {model.name} BY NAME "
+            f"SELECT * FROM ({model.sql}) WHERE {condition}",
+            params,
+        )
+        return con.execute(f"SELECT count(*) FROM {model.name}").fetchone()[0]
+
+    def _run_model(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        model: Model,
+        source_version: int,
+        partitions: list[dict[str, Any]] | None = None,
+    ) -> int:
+        """
+        Materializa um modelo (ou só as fatias de 'partitions') e registra o
+        estado numa única transação
+        """
+        start = time.perf_counter()
+        con.execute("BEGIN TRANSACTION")
+        try:
+            if partitions:
+                rows = self._refresh(con, model, partitions)
+            else:
+                rows = self._build(con, model)
+            con.execute(
+                f"INSERT OR REPLACE INTO {MODEL_RUNS_TABLE} "
+                "VALUES (?, ?, ?, ?, ?, now()::TIMESTAMP)",
+                [
+                    model.name,
+                    model.sql_hash,
+                    source_version,
+                    rows,
+                    time.perf_counter() - start,
+                ],
+            )
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        if model.export:
+            self._export(con, model)
+        return rows
+
+    def _export(self, con: duckdb.DuckDBPyConnection, model: Model) -> None:
+        """Exporta o modelo para a Gold (tmp + rename: leitura nunca parcial)"""
+        self.gold_dir.mkdir(parents=True, exist_ok=True)
+        output_path = self.gold_dir / f"{model.table}.parquet"
+        tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+        con.execute(f"COPY {model.name} TO '{tmp_path}' (FORMAT parquet)")
+        os.replace(tmp_path, output_path)
+
+    def run(self, full_refresh: bool = False) -> list[ModelResult]:
+        """
+        Executa os modelos desatualizados, em ordem topológica
+        Args:
+            full_refresh (bool): Reexecuta todos os modelos
+        Returns:
+            list[ModelResult]: Um resultado por modelo, na ordem de execução
+        Raises:
+            RuntimeError: Algum modelo falhou (os demais são executados)
+        """
+        results: list[ModelResult] = []
+        rebuilt: set[str] = set()
+        unavailable: set[str] = set()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with duckdb.connect(str(self.db_path)) as con:
+            con.execute("CREATE SCHEMA IF NOT EXISTS meta")
+            con.execute(
+                f"CREATE TABLE IF NOT EXISTS {MODEL_RUNS_TABLE} (model VARCHAR "
+                "PRIMARY KEY, sql_hash VARCHAR, source_version BIGINT, rows BIGINT, "
+                "seconds DOUBLE, ran_at TIMESTAMP)"
+            )
+            existing = self._existing_tables(con)
+            versions = self._load_versions(con, existing)
+            state = {
+                row[0]: row[1:]
+                for row in con.execute(
+                    f"SELECT model, sql_hash, source_version, rows "
+                    f"FROM {MODEL_RUNS_TABLE}"
+                ).fetchall()
+            }
+
+            for name in self.graph.order():
+                model = self.graph.models[name]
+                missing = sorted(
+                    (model.references - self.graph.models.keys()) - existing
+                )
+                if missing or self.graph.parents[name] & unavailable:
+                    unavailable.add(name)
+                    reason = f"(fonte ausente: {', '.join(missing) or 'dependência'})"
+                    results.append(ModelResult(name, "skipped", reason=reason))
+                    continue
+
+                source_version = max(
+                    (versions.get(source, 0) for source in self.graph.sources(name)),
+                    default=0,
+                )
+                reason = "(full refresh)" if full_refresh else ""
+                reason = reason or self._stale_reason(
+                    name, state, existing, source_version, rebuilt
+                )
+                if not reason:
+                    results.append(ModelResult(name, "fresh", rows=state[name][2]))
+                    continue
+
+                partitions = None
+                sources = self.graph.sources(name)
+                if (
+                    model.partition_by
+                    and reason == "(novas cargas na Bronze)"
+                    and not self.graph.parents[name]
+                    and len(sources) == 1
+                ):
+                    partitions = self._touched_partitions(
+                        con, model, sources.pop(), state[name][1]
+                    )
+                    if partitions:
+                        reason = (
+                            f"(novas cargas na Bronze: {len(partitions)} partições)"
+                        )
+
+                start = time.perf_counter()
+                try:
+                    rows = self._run_model(con, model, source_version, partitions)
+                except Exception as e:
+                    unavailable.add(name)
+                    self.logger.error(f"Modelo {name} falhou: {e}")
+                    results.append(
+                        ModelResult(
+                            name,
+                            "error",
+                            seconds=time.perf_counter() - start,
+                            reason=f"({e})",
+                        )
+                    )
+                    continue
+
+                rebuilt.add(name)
+                existing.add(name)
+                results.append(
+                    ModelResult(
+                        name, "built", rows, time.perf_counter() - start, reason
+                    )
+                )
+                self.logger.info(str(results[-1]))
+
+        errors = [result.model for result in results if result.status == "error"]
+        if errors:
+            msg = f"{len(errors)} modelo(s) falharam: {', '.join(errors)}"
+            self.logger.error(msg)
+            raise RuntimeError(msg)
+        return results
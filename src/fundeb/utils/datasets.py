@@ -0,0 +1,160 @@
+"""
+Datasets parquet da camada Bronze gravados em lote (ver
+ExtractionFactory.extract_many).
+
+Muitos arquivos pequenos do mesmo módulo (ex: centenas de extratos mensais
+de 60-90 linhas) são concatenados numa única tabela Arrow e gravados com um
+único COPY do DuckDB num dataset particionado estilo hive
+(<DATA_BRONZE_DIR>/<módulo>/UF=AP/ano=2025/mes=1/part_<uuid>.parquet), com
+as mesmas partições da chave 'warehouse' do extractors.yaml. As colunas de
+partição também ficam dentro dos arquivos, então o dataset pode ser lido
+com ou sem hive_partitioning.
+"""
+
+import os
+import uuid
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+
+
+def _quote(identifier: str) -> str:
+    """Identificador SQL entre aspas duplas"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def concat_tables(tables: list[pa.Table]) -> pa.Table:
+    """
+    Concatena tabelas extraídas de arquivos diferentes num schema comum
+    Args:
+        tables (list[pa.Table]): Uma tabela por arquivo
+    Returns:
+        pa.Table: Tabela única; colunas ausentes num arquivo ficam nulas e
+            colunas totalmente nulas assumem o tipo dos demais arquivos
+    """
+    types: dict[str, pa.DataType | None] = {}
+    for table in tables:
+        for field in table.schema:
+            column = table.column(field.name)
+            if types.get(field.name) is None and column.null_count < len(column):
+                types[field.name] = field.type
+            else:
+                types.setdefault(field.name, None)
+    schema = pa.schema(
+        (name, pa.string() if dtype is None else dtype) for name, dtype in types.items()
+    )
+
+    conformed = []
+    for table in tables:
+        columns = []
+        for field in schema:
+            if field.name not in table.column_names:
+                columns.append(pa.nulls(len(table), type=field.type))
+                continue
+            column = table.column(field.name)
+            if column.null_count == len(column):
+                column = pa.nulls(len(table), type=field.type)
+            elif column.type != field.type:
+                column = column.cast(field.type)
+            columns.append(column)
+        conformed.append(pa.Table.from_arrays(columns, schema=schema))
+    return pa.concat_tables(conformed)
+
+
+def remove_source_files(
+    con: duckdb.DuckDBPyConnection, dataset_dir: Path, file_names: list[str]
+) -> int:
+    """
+    Remove de um dataset as linhas de arquivos de origem que serão regravados
+    (reingestão), reescrevendo só os parquets que os contêm
+    Args:
+        con (duckdb.DuckDBPyConnection): Conexão DuckDB
+        dataset_dir (Path): Diretório do dataset
+        file_names (list[str]): Valores da coluna file_name a remover
+    Returns:
+        int: Número de parquets reescritos ou removidos
+    """
+    if not any(dataset_dir.rglob("*.parquet")):
+        return 0
+    # Só a coluna file_name é lida (projeção no parquet)
+    affected = [
+        row[0]
+        for row in con.execute(
+            "SELECT DISTINCT filename FROM read_parquet(?, filename = true, "
+            "hive_partitioning = false, union_by_name = true) "
+            "WHERE file_name IN (SELECT unnest(?))",
+            [f"{dataset_dir}/**/*.parquet", file_names],
+        ).fetchall()
+    ]
+    for part in affected:
+        remaining = con.execute(
+            "SELECT count(*) FROM read_parquet(?, hive_partitioning = false) "
+            "WHERE file_name NOT IN (SELECT unnest(?))",
+            [part, file_names],
+        ).fetchone()[0]
+        if remaining:
+            tmp_path = Path(part).with_name(f".{Path(part).name}.tmp")
+            con.execute(
+                "COPY (SELECT * FROM read_parquet(?, hive_partitioning = false) "
+                "WHERE file_name NOT IN (SELECT unnest(?))) "
+                f"TO '{tmp_path}' (FORMAT parquet)",
+                [part, file_names],
+            )
+            os.replace(tmp_path, part)
+        else:
+            os.remove(part)
+    return len(affected)
+
+
+def write_dataset(
+    table: pa.Table,
+    dataset_dir: str | Path,
+    partition_by: dict[str, str] | None = None,
+) -> list[str]:
+    """
+    Grava uma tabela num dataset parquet particionado, com um único COPY
+    Args:
+        table (pa.Table): Tabela com a coluna file_name
+        dataset_dir (str | Path): Diretório do dataset
+        partition_by (dict[str, str] | None): Colunas de partição
+            (nome -> expressão SQL sobre as colunas da tabela)
+    Returns:
+        list[str]: Parquets gravados
+    """
+    dataset_dir = Path(dataset_dir)
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    partition_by = partition_by or {}
+    file_names = table.column("file_name").unique().cast(pa.string()).to_pylist()
+
+    # Partições que já são colunas da tabela (ex: uf: UF) particionam pela
+    # própria coluna: identificadores no DuckDB não diferenciam maiúsculas
+    partition_columns = []
+    expressions = ""
+    for name, expression in partition_by.items():
+        if expression.lower() == name.lower():
+            partition_columns.append(expression)
+        else:
+            partition_columns.append(name)
+            expressions += f", {expression} AS {_quote(name)}"
+
+    select = f"SELECT *{expressions} FROM batch"
+    with duckdb.connect() as con:
+        con.register("batch", table)
+        remove_source_files(con, dataset_dir, file_names)
+        if not partition_columns:
+            # Sem partições: um único parquet (tmp + rename)
+            target = dataset_dir / f"part_{uuid.uuid4()}.parquet"
+            tmp_path = target.with_name(f".{target.name}.tmp")
+            con.execute(f"COPY ({select}) TO '{tmp_path}' (FORMAT parquet)")
+            os.replace(tmp_path, target)
+            return [str(target)]
+
+        columns = ", ".join(map(_quote, partition_columns))
+        written = con.execute(
+            f"COPY ({select}) TO '{dataset_dir}' (FORMAT parquet, "
+            f"PARTITION_BY ({columns}), WRITE_PARTITION_COLUMNS true, "
+            "OVERWRITE_OR_IGNORE true, FILENAME_PATTERN 'part_{uuid}', "
+            "RETURN_FILES true)"
+        ).fetchone()[1]
+    return list(written)
@@ -0,0 +1,184 @@
+"""
+Cache persistente em disco (parquet) para os carregadores do app.
+
+Diferente do @st.cache_data (memória de um único processo), o resultado é
+gravado em DATA_CACHE_DIR e reaproveitado por todas as páginas, por todos os
+workers do Streamlit no mesmo host e entre reinícios/deploys. A chave combina
+o nome da função, os seus parâmetros e a impressão digital dos arquivos de
+entrada (caminho, tamanho, mtime e hash do conteúdo): se uma entrada mudar,
+a chave muda. O tamanho total é limitado, removendo os menos usados (LRU).
+
+    @disk_cache(sources=["path"])
+    def load_statements(path, year=2025) -> pd.DataFrame: ...
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from fundeb.config.settings import DATA_CACHE_DIR, DISK_CACHE_MAX_MB
+from fundeb.utils.manifest import file_sha256
+
+# Hash do conteúdo por (caminho, tamanho, mtime_ns): cada arquivo é lido no
+# máximo uma vez por processo enquanto não mudar
+_sha256_memo: dict[tuple[str, int, int], str] = {}
+_memo_lock = threading.Lock()
+
+
+def _expand(value: Any) -> list[Path]:
+    """Caminho, lista de caminhos ou diretório -> arquivos, em ordem estável"""
+    if value is None:
+        return []
+    if isinstance(value, (str, os.PathLike)):
+        path = Path(value)
+        if path.is_dir():
+            return sorted(p for p in path.rglob("*") if p.is_file())
+        return [path]
+    return [file for item in value for file in _expand(item)]
+
+
+def fingerprint(paths: Iterable[str | Path]) -> list[list[Any]]:
+    """
+    Impressão digital dos arquivos de entrada
+    Args:
+        paths (Iterable[str | Path]): Arquivos (inexistentes entram como None)
+    Returns:
+        list[list[Any]]: [caminho, tamanho, mtime_ns, sha256] por arquivo
+    """
+    prints = []
+    for path in paths:
+        path = Path(path).resolve()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            prints.append([path.as_posix(), None, None, None])
+            continue
+        memo_key = (path.as_posix(), stat.st_size, stat.st_mtime_ns)
+        with _memo_lock:
+            sha256 = _sha256_memo.get(memo_key)
+        if sha256 is None:
+            sha256 = file_sha256(path)
+            with _memo_lock:
+                _sha256_memo[memo_key] = sha256
+        prints.append([*memo_key, sha256])
+    return prints
+
+
+class DiskCache:
+    """Diretório de resultados (um parquet por chave) com despejo LRU."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path = DATA_CACHE_DIR,
+        max_bytes: int = DISK_CACHE_MAX_MB * 1024 * 1024,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.parquet"
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Lê um resultado do cache (None se ausente) e marca-o como usado"""
+        path = self._path(key)
+        try:
+            df = pd.read_parquet(path)
+        except (FileNotFoundError, OSError):
+            return None
+        # O mtime registra o último uso: é a ordem do despejo LRU
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Grava um resultado (tmp + rename, seguro entre processos) e despeja"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove os resultados menos usados até o cache caber em max_bytes
+        Returns:
+            int: Número de resultados removidos
+        """
+        entries = []
+        for path in self.cache_dir.glob("*.parquet"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # removido por outro worker
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove todos os resultados do cache"""
+        for path in self.cache_dir.glob("*.parquet"):
+            path.unlink(missing_ok=True)
+
+
+def disk_cache(
+    sources: Iterable[str] = (), cache: DiskCache | None = None
+) -> Callable[[Callable[..., pd.DataFrame]], Callable[..., pd.DataFrame]]:
+    """
+    Decorador: guarda em disco o DataFrame devolvido pela função
+    Args:
+        sources (Iterable[str]): Parâmetros da função que são arquivos de
+            entrada (caminho, lista de caminhos ou diretório)
+        cache (DiskCache | None): Cache a usar (padrão: DATA_CACHE_DIR)
+    Returns:
+        Callable: A função decorada, com o atributo `cache`
+    """
+    sources = list(sources)
+
+    def decorator(func: Callable[..., pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__qualname__}"
+        store = cache or DiskCache()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> pd.DataFrame:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            inputs = [file for source in sources for file in _expand(params[source])]
+            payload = json.dumps(
+                [name, params, fingerprint(inputs)], sort_keys=True, default=str
+            )
+            key = hashlib.sha256(payload.encode()).hexdigest()
+
+            df = store.get(key)
+            if df is None:
+                df = func(*args, **kwargs)
+                store.put(key, df)
+            return df
+
+        wrapper.cache = store
+        return wrapper
+
+    return decorator
@@ -1,15 +1,49 @@
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
 
-import xlrd
 import pandas as pd
+import xlrd
+
+
+def list_sheet_names(file_path: str | Path) -> list[str]:
+    """
+    Retorna a lista de planilhas de uma pasta de trabalho sem ler as células.
+    (.xls: xlrd sob demanda; .xlsx: openpyxl somente leitura)
+    """
+    if Path(file_path).suffix.lower() == ".xls":
+        book = xlrd.open_workbook(file_path, on_demand=True)
+        try:
+            return book.sheet_names()
+        finally:
+            book.release_resources()
+
+    from openpyxl import load_workbook
+
+    book = load_workbook(file_path, read_only=True)
+    try:
+        return book.sheetnames
+    finally:
+        book.close()
 
 
-def list_sheet_names(file_path: str) -> list[str]:
+@contextmanager
+def open_workbook(file_path: str | Path) -> Iterator[pd.ExcelFile]:
     """
-    Localiza o arquivo do Fundeb e retorna o caminho e a lista de planilhas.
+    Abre uma pasta de trabalho UMA vez para várias leituras com pd.read_excel.
+    Em .xls as planilhas são carregadas sob demanda (só as que forem lidas).
     """
-    sheet_names = xlrd.open_workbook(file_path).sheet_names()
-    return sheet_names
+    if Path(file_path).suffix.lower() == ".xls":
+        book = xlrd.open_workbook(file_path, on_demand=True)
+        try:
+            with pd.ExcelFile(book, engine="xlrd") as excel_file:
+                yield excel_file
+        finally:
+            book.release_resources()
+    else:
+        with pd.ExcelFile(file_path) as excel_file:
+            yield excel_file
 
 
 def save_dataframe_to_excel(
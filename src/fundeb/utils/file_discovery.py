@@ -1,6 +1,45 @@
+"""
+Descoberta de arquivos brutos.
+
+O flow aplica cada regra de DISCOVERY_RULES (módulo + padrão do nome) sobre
+a mesma árvore de DATA_SOURCE_DIR. Em vez de um rglob por regra, um índice
+(DiscoveryIndex) percorre a árvore uma vez com os.scandir e guarda em
+memória o catálogo dos arquivos, com os campos lidos do caminho e do nome:
+
+    external/bb/conta_corrente/csv/EXTRATO_BANCARIO_CC_AP_MACAPA_2025_01.csv
+    -> módulo conta_corrente, banco bb, UF AP, município MACAPA, 2025-01
+
+Nas chamadas seguintes só são relidos os diretórios cujo mtime mudou (um
+arquivo criado, removido ou renomeado altera o mtime do diretório pai);
+os demais custam um stat.
+"""
+
+import fnmatch
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List
 
+from fundeb.config.settings import DISCOVERY_RULES
+
+UFS = (
+    "AC AL AM AP BA CE DF ES GO MA MG MS MT PA PB PE PI PR RJ RN RO RR RS SC SE SP TO"
+).split()
+
+# Campos no nome dos arquivos: <...>_<UF>_<MUNICIPIO>_<ANO>_<MES>[_<DIA>]
+# (ex: EXTRATO_BANCARIO_CC_AP_MACAPA_2025_01, AJUSTES_REPASSES_2025_10_30)
+FILE_NAME_FIELDS = re.compile(
+    rf"(?:_(?P<uf>{'|'.join(UFS)})_(?P<municipality>[A-Z][A-Z0-9_]*?))?"
+    r"_(?P<year>(?:19|20)\d{2})_(?P<month>0[1-9]|1[0-2])(?:_\d{2})?$"
+)
+
+# Diretórios alterados há menos que isto são relidos mesmo com o mtime igual:
+# um arquivo criado no mesmo tick do último scan não mudaria o mtime
+MTIME_GRANULARITY_NS = 1_000_000_000
+
 
 def get_file_size(filepath: Path) -> None:
     """Retorna tamanho do arquivo em formato legível"""
@@ -27,6 +66,245 @@ def recursive_list_file_paths(base_directory: Path, pattern: str = "*") -> List[
     return sorted(base_directory.rglob(pattern))
 
 
+@dataclass(frozen=True)
+class RawFile:
+    """Um arquivo do catálogo, com os campos lidos do caminho e do nome."""
+
+    path: Path
+    name: str
+    folders: tuple[str, ...]  # Pastas relativas à raiz do índice
+    module: str | None  # Módulo da primeira regra que casa
+    bank: str | None  # Origem: pasta acima da do módulo (ex: 'bb') ou 'folder'
+    uf: str | None
+    municipality: str | None
+    year: int | None
+    month: int | None
+
+
+@dataclass
+class _Directory:
+    """Entrada de um diretório lido: mtime, arquivos e subdiretórios."""
+
+    mtime_ns: int
+    scanned_ns: int
+    folders: tuple[str, ...]
+    files: list[RawFile]  # Ordenados pelo nome
+    subdirs: list[str]
+
+
+def rule_folder(rule: dict[str, str]) -> str:
+    """Pasta onde ficam os arquivos de uma regra ('folder' ou o módulo)"""
+    return rule.get("folder", rule["module_base"])
+
+
+def match_module(
+    folders: tuple[str, ...], file_name: str, rules: list[dict[str, str]]
+) -> str | None:
+    """
+    Módulo da primeira regra que casa com um arquivo: a pasta da regra no
+    caminho e o nome do arquivo no padrão da regra
+    Args:
+        folders (tuple[str, ...]): Pastas relativas à raiz da descoberta
+        file_name (str): Nome do arquivo
+        rules (list[dict]): Regras com 'module_base', 'pattern' e,
+            opcionalmente, 'folder' (padrão: o próprio módulo)
+    Returns:
+        str | None: Módulo (ex: 'conta_corrente') ou None se nenhuma casar
+    """
+    rule = _match_rule(folders, file_name, rules)
+    return rule["module_base"] if rule else None
+
+
+def _match_rule(
+    folders: tuple[str, ...], file_name: str, rules: list[dict[str, str]]
+) -> dict[str, str] | None:
+    for rule in rules:
+        if rule_folder(rule) in folders and fnmatch.fnmatchcase(
+            file_name, rule["pattern"]
+        ):
+            return rule
+    return None
+
+
+class DiscoveryIndex:
+    """
+    Catálogo em memória dos arquivos sob base_dir, atualizado de forma
+    incremental (refresh) pelo mtime de cada diretório.
+    """
+
+    def __init__(
+        self,
+        base_dir: str | Path,
+        rules: list[dict[str, str]] = DISCOVERY_RULES,
+    ):
+        self.base_dir = Path(base_dir)
+        self.rules = rules
+        self._directories: dict[str, _Directory] = {}
+        self._by_folder: dict[str, list[RawFile]] = {}
+        self._lock = threading.Lock()
+
+    def _parse(self, path: str, name: str, folders: tuple[str, ...]) -> RawFile:
+        """Campos de um arquivo a partir do caminho e do nome"""
+        rule = _match_rule(folders, name, self.rules)
+        module = bank = None
+        if rule is not None:
+            module = rule["module_base"]
+            position = folders.index(rule_folder(rule))
+            if "folder" in rule and position <= 1:
+                # Pasta da própria origem (ex: fnde/csv/AJUSTES_REPASSES_...)
+                bank = rule["folder"]
+            else:
+                # Pasta acima da do módulo (ex: bb/conta_investimento/pdf/...)
+                bank = folders[position - 1] if position else None
+        fields = FILE_NAME_FIELDS.search(os.path.splitext(name)[0])
+        if fields is None:
+            return RawFile(
+                Path(path), name, folders, module, bank, None, None, None, None
+            )
+        return RawFile(
+            Path(path),
+            name,
+            folders,
+            module,
+            bank,
+            fields["uf"],
+            fields["municipality"],
+            int(fields["year"]),
+            int(fields["month"]),
+        )
+
+    def _scan(self, directory: str, folders: tuple[str, ...], mtime_ns: int) -> None:
+        """Relê um diretório (só o próprio nível) com os.scandir"""
+        files, subdirs = [], []
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.is_file():
+                    files.append(self._parse(entry.path, entry.name, folders))
+        self._directories[directory] = _Directory(
+            mtime_ns, time.time_ns(), folders, files, subdirs
+        )
+
+    def refresh(self) -> int:
+        """
+        Atualiza o catálogo, relendo só os diretórios novos ou alterados
+        Returns:
+            int: Número de diretórios relidos (0 = catálogo inalterado)
+        """
+        with self._lock:
+            scanned = 0
+            seen = set()
+            stack = [(str(self.base_dir), ())] if self.base_dir.is_dir() else []
+            while stack:
+                directory, folders = stack.pop()
+                seen.add(directory)
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:  # removido durante a varredura
+                    continue
+                cached = self._directories.get(directory)
+                if (
+                    cached is None
+                    or cached.mtime_ns != mtime_ns
+                    or cached.scanned_ns - mtime_ns < MTIME_GRANULARITY_NS
+                ):
+                    self._scan(directory, folders, mtime_ns)
+                    scanned += 1
+                for name in self._directories[directory].subdirs:
+                    stack.append((os.path.join(directory, name), (*folders, name)))
+
+            removed = self._directories.keys() - seen
+            for directory in removed:
+                del self._directories[directory]
+            if scanned or removed or not self._by_folder:
+                self._rebuild()
+            return scanned
+
+    def _rebuild(self) -> None:
+        """Agrupa os arquivos por pasta (respostas de find sem varrer tudo)"""
+        by_folder: dict[str, list[RawFile]] = {}
+        # Diretórios pelas pastas e arquivos pelo nome = ordem dos caminhos
+        for directory in self._sorted_directories():
+            for folder in set(directory.folders):
+                by_folder.setdefault(folder, []).extend(directory.files)
+        self._by_folder = by_folder
+
+    def _sorted_directories(self) -> list[_Directory]:
+        """Diretórios do catálogo, ordenados pelas pastas"""
+        return sorted(self._directories.values(), key=lambda d: d.folders)
+
+    def files(self) -> list[RawFile]:
+        """Todos os arquivos do catálogo, ordenados pelo caminho"""
+        return [f for d in self._sorted_directories() for f in d.files]
+
+    def find(self, module_name: str, file_pattern: str) -> list[Path]:
+        """
+        Arquivos sob uma pasta 'module_name' cujo nome casa com o padrão
+        Args:
+            module_name (str): Nome da pasta do módulo (ex: 'conta_corrente')
+            file_pattern (str): Padrão glob do nome (ex: 'EXTRATO_*.csv')
+        Returns:
+            list[Path]: Arquivos encontrados, ordenados
+        """
+        regex = re.compile(fnmatch.translate(file_pattern))
+        return [
+            raw_file.path
+            for raw_file in self._by_folder.get(module_name, [])
+            if regex.match(raw_file.name)
+        ]
+
+    def discover(self) -> list[tuple[str, Path]]:
+        """
+        Aplica todas as regras ao catálogo (uma única varredura)
+        Returns:
+            list[tuple[str, Path]]: (módulo, arquivo), na ordem das regras;
+                cada arquivo aparece uma vez, na primeira regra que casa
+        """
+        self.refresh()
+        seen: set[Path] = set()
+        discovered = []
+        for rule in self.rules:
+            for path in self.find(rule_folder(rule), rule["pattern"]):
+                if path not in seen:
+                    seen.add(path)
+                    discovered.append((rule["module_base"], path))
+        return discovered
+
+
+_indexes: dict[Path, DiscoveryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_discovery_index(base_dir: str | Path) -> DiscoveryIndex:
+    """Índice (um por diretório raiz e por processo) de base_dir"""
+    key = Path(base_dir).resolve()
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = DiscoveryIndex(key)
+        return _indexes[key]
+
+
+def find_files_by_pattern(
+    base_dir: str | Path, module_name: str, file_pattern: str
+) -> list[Path]:
+    """
+    Arquivos sob uma pasta 'module_name' de base_dir (em qualquer nível)
+    cujo nome casa com file_pattern, a partir do índice de base_dir
+    Args:
+        base_dir (str | Path): Raiz da descoberta (ex: DATA_SOURCE_DIR)
+        module_name (str): Nome da pasta do módulo
+        file_pattern (str): Padrão glob do nome do arquivo
+    Returns:
+        list[Path]: Arquivos encontrados, ordenados ([] se a pasta não existir)
+    """
+    index = get_discovery_index(base_dir)
+    index.refresh()
+    return index.find(module_name, file_pattern)
+
+
 # --- BLOCO DE TESTE (SMOKE TEST) ---
 if __name__ == "__main__":
     import tempfile
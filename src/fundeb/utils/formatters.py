@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
 
+import pandas as pd
+
 def parse_date(date_str: str, fmt: str = "%d/%m/%Y") -> datetime:
     """
     Converte string para datetime.
@@ -32,3 +34,17 @@ def format_percentage(value: float, decimals: int = 2) -> str:
     Formata um número como porcentagem.
     """
     return f"{value:.{decimals}%}"
+
+def parse_currency(values: pd.Series, symbol: str = "R$") -> pd.Series:
+    """
+    Converte, de forma vetorizada, textos monetários no formato brasileiro
+    (ex: "-R$912.717,48") em float. Valores vazios viram NaN.
+    """
+    cleaned = (
+        values.astype("string")
+        .str.replace(symbol, "", regex=False)
+        .str.replace(".", "", regex=False)
+        .str.replace(",", ".", regex=False)
+        .str.strip()
+    )
+    return pd.to_numeric(cleaned, errors="raise").astype("float64")
@@ -0,0 +1,41 @@
+"""
+Leitura das tabelas Gold pelo app (app/pages).
+
+Os parquets da Gold são materializados ao fim do flow ELT (ver
+fundeb.transforms.models). Todas as páginas leem por load_gold, com o cache
+em disco de fundeb.utils.disk_cache: uma leitura serve a todas as páginas e
+a todos os workers do Streamlit, e uma nova materialização (conteúdo novo)
+muda a chave do cache.
+
+    balance = load_gold("saldo_mensal_uf")
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from fundeb.config.settings import DATA_GOLD_DIR
+from fundeb.utils.disk_cache import disk_cache
+
+
+@disk_cache(sources=["path"])
+def read_gold(path: str | Path) -> pd.DataFrame:
+    """Lê um parquet da Gold (resultado guardado no cache em disco)"""
+    return pd.read_parquet(path)
+
+
+def load_gold(name: str, gold_dir: str | Path = DATA_GOLD_DIR) -> pd.DataFrame:
+    """
+    Carrega uma tabela da Gold pelo nome
+    Args:
+        name (str): Tabela (ex: 'saldo_mensal_uf')
+        gold_dir (str | Path): Diretório dos parquets da camada Gold
+    Returns:
+        pd.DataFrame: Conteúdo do parquet <gold_dir>/<name>.parquet
+    Raises:
+        FileNotFoundError: A tabela ainda não foi materializada
+    """
+    path = Path(gold_dir) / f"{name}.parquet"
+    if not path.exists():
+        raise FileNotFoundError(f"Tabela {name} não encontrada")
+    return read_gold(path)
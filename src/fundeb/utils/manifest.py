@@ -0,0 +1,180 @@
+"""
+Manifesto de ingestão incremental da camada Bronze.
+
+Registra, para cada arquivo de origem já ingerido, o tamanho, a data de
+modificação, o hash do conteúdo, o número de linhas e o parquet gerado.
+O flow consulta o manifesto para processar apenas arquivos novos ou alterados.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """Registro de um arquivo de origem ingerido na camada Bronze."""
+
+    file_path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    rows: int
+    output_path: str
+    ingested_at: str
+
+
+def file_sha256(file_path: str | Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo, lendo em blocos
+    Args:
+        file_path (str | Path): Caminho do arquivo
+        chunk_size (int): Tamanho do bloco de leitura em bytes
+    Returns:
+        str: Hash hexadecimal do conteúdo
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestionManifest:
+    """Manifesto persistente (JSON) dos arquivos ingeridos na camada Bronze."""
+
+    def __init__(self, manifest_path: str | Path):
+        self.manifest_path = Path(manifest_path)
+        self.entries: dict[str, ManifestEntry] = {}
+        self._dirty = False
+        self.load()
+
+    @staticmethod
+    def _key(file_path: str | Path) -> str:
+        return Path(file_path).resolve().as_posix()
+
+    def load(self) -> None:
+        """Carrega o manifesto do disco (manifesto vazio se não existir)."""
+        if not self.manifest_path.exists():
+            self.entries = {}
+            return
+        with open(self.manifest_path, encoding="utf-8") as file:
+            raw = json.load(file)
+        self.entries = {key: ManifestEntry(**value) for key, value in raw.items()}
+
+    def save(self) -> None:
+        """Grava o manifesto de forma atômica (arquivo temporário + rename)."""
+        if not self._dirty:
+            return
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {key: asdict(entry) for key, entry in sorted(self.entries.items())},
+                file,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(tmp_path, self.manifest_path)
+        self._dirty = False
+
+    def get(self, file_path: str | Path) -> ManifestEntry | None:
+        """Retorna o registro de um arquivo, se existir."""
+        return self.entries.get(self._key(file_path))
+
+    def is_unchanged(self, file_path: str | Path) -> bool:
+        """
+        Verifica se o arquivo já foi ingerido e não mudou desde então
+        Args:
+            file_path (str | Path): Caminho do arquivo de origem
+        Returns:
+            bool: True se tamanho/mtime (ou, na dúvida, o hash) coincidem com o
+                manifesto e o parquet de saída ainda existe
+        """
+        entry = self.get(file_path)
+        if entry is None or not Path(entry.output_path).exists():
+            return False
+
+        stat = Path(file_path).stat()
+        if stat.st_size != entry.size:
+            return False
+        if stat.st_mtime_ns == entry.mtime_ns:
+            return True
+
+        # mtime mudou (ex: cópia ou "touch"): só o hash decide
+        if file_sha256(file_path) != entry.sha256:
+            return False
+        self.entries[self._key(file_path)] = ManifestEntry(
+            **{**asdict(entry), "mtime_ns": stat.st_mtime_ns}
+        )
+        self._dirty = True
+        return True
+
+    def filter_changed(self, file_paths: list[Path]) -> list[Path]:
+        """Retorna apenas os arquivos novos ou alterados em relação ao manifesto."""
+        return [path for path in file_paths if not self.is_unchanged(path)]
+
+    def record(
+        self,
+        file_path: str | Path,
+        size: int,
+        mtime_ns: int,
+        sha256: str,
+        rows: int,
+        output_path: str | Path,
+    ) -> ManifestEntry:
+        """
+        Registra (ou substitui) a ingestão de um arquivo no manifesto
+        Args:
+            file_path (str | Path): Caminho do arquivo de origem
+            size (int): Tamanho em bytes no momento da leitura
+            mtime_ns (int): Data de modificação (ns) no momento da leitura
+            sha256 (str): Hash do conteúdo lido
+            rows (int): Número de linhas gravadas
+            output_path (str | Path): Parquet gerado na camada Bronze
+        Returns:
+            ManifestEntry: Registro gravado
+        """
+        entry = ManifestEntry(
+            file_path=self._key(file_path),
+            size=size,
+            mtime_ns=mtime_ns,
+            sha256=sha256,
+            rows=rows,
+            output_path=Path(output_path).resolve().as_posix(),
+            ingested_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        self.entries[entry.file_path] = entry
+        self._dirty = True
+        return entry
+
+
+# --- BLOCO DE TESTE (SMOKE TEST) ---
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        source = tmp / "EXTRATO_BANCARIO_CC_01.csv"
+        source.write_text("A;B\n1;2\n", encoding="latin1")
+        output = tmp / "EXTRATO_BANCARIO_CC_01.parquet"
+        output.touch()
+
+        manifest = IngestionManifest(tmp / "_manifest.json")
+        assert manifest.filter_changed([source]) == [source]
+
+        stat = source.stat()
+        manifest.record(
+            source, stat.st_size, stat.st_mtime_ns, file_sha256(source), 1, output
+        )
+        manifest.save()
+
+        reloaded = IngestionManifest(tmp / "_manifest.json")
+        assert reloaded.filter_changed([source]) == []
+
+        source.write_text("A;B\n1;2\n3;4\n", encoding="latin1")
+        assert reloaded.filter_changed([source]) == [source]
+        print("--- SMOKE TEST CONCLUÍDO COM SUCESSO ---")
@@ -0,0 +1,447 @@
+"""
+Instrumentação leve das etapas do pipeline (extratores, fábrica e flow).
+
+Cada etapa cronometrada com stage() (ou com stage_parts(), quando a etapa
+roda em trechos, como bloco a bloco) gera:
+- uma linha JSON no logger 'fundeb.metrics' (logging.yaml: metrics.jsonl),
+  com tempo, linhas, bytes e pico de memória (RSS) do processo;
+- observações no registro do processo (get_metrics): histograma de duração
+  e contadores de linhas, bytes e erros por etapa e módulo.
+
+write_prometheus() grava o registro no formato textfile do node exporter
+(METRICS_TEXTFILE_PATH; aponte --collector.textfile.directory para
+LOGS_PROJECT_DIR). Nos pools de processos, cada worker devolve o seu
+registro com collect() e o processo principal o soma com merge().
+
+Com a variável de ambiente FUNDEB_PROFILE_THRESHOLD (segundos) definida,
+profile_file() perfila o processamento de cada arquivo e, quando ele passa
+do limite, grava o perfil em PROFILES_DIR: .prof + resumo em texto
+(cProfile) ou .html (pyinstrument, com FUNDEB_PROFILER=pyinstrument).
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+
+from fundeb.config.logger import get_logger
+from fundeb.config.settings import METRICS_TEXTFILE_PATH, PROFILES_DIR
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage
+    resource = None
+
+METRICS_LOGGER_NAME = "fundeb.metrics"
+
+# Limites (segundos) do histograma de duração das etapas
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0
+)  # fmt: skip
+
+PROFILE_THRESHOLD_ENV = "FUNDEB_PROFILE_THRESHOLD"
+PROFILER_ENV = "FUNDEB_PROFILER"  # cprofile (padrão) | pyinstrument
+
+
+def peak_rss_bytes() -> int | None:
+    """Pico de memória residente do processo até agora (None no Windows)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: KB no Linux, bytes no macOS
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+@dataclass
+class StageSeries:
+    """Observações acumuladas de uma etapa (por módulo)."""
+
+    buckets: list[int] = field(default_factory=lambda: [0] * len(DURATION_BUCKETS))
+    count: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+    errors: int = 0
+    peak_rss_bytes: int = 0
+
+    def observe(
+        self, seconds: float, rows: int, size: int, ok: bool, peak_rss: int
+    ) -> None:
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                break
+        self.count += 1
+        self.seconds += seconds
+        self.rows += rows
+        self.bytes += size
+        self.errors += not ok
+        self.peak_rss_bytes = max(self.peak_rss_bytes, peak_rss)
+
+    def add(self, other: "StageSeries") -> None:
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets, strict=True)]
+        self.count += other.count
+        self.seconds += other.seconds
+        self.rows += other.rows
+        self.bytes += other.bytes
+        self.errors += other.errors
+        self.peak_rss_bytes = max(self.peak_rss_bytes, other.peak_rss_bytes)
+
+
+class MetricsRegistry:
+    """Métricas das etapas no processo, por (etapa, módulo). Thread-safe."""
+
+    def __init__(self):
+        self._series: dict[tuple[str, str], StageSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        stage: str,
+        module: str,
+        seconds: float,
+        rows: int = 0,
+        size: int = 0,
+        ok: bool = True,
+        peak_rss: int = 0,
+    ) -> None:
+        """Registra uma execução de uma etapa"""
+        with self._lock:
+            series = self._series.setdefault((stage, module), StageSeries())
+            series.observe(seconds, rows, size, ok, peak_rss)
+
+    def collect(self, reset: bool = False) -> dict[tuple[str, str], StageSeries]:
+        """
+        Cópia das séries acumuladas
+        Args:
+            reset (bool): Zera o registro (ex: worker de um pool que devolve
+                as métricas a cada arquivo, sem contá-las duas vezes)
+        Returns:
+            dict: Séries por (etapa, módulo)
+        """
+        with self._lock:
+            series = self._series
+            if reset:
+                self._series = {}
+                return series
+            return {
+                key: replace(value, buckets=list(value.buckets))
+                for key, value in series.items()
+            }
+
+    def reset(self) -> None:
+        """Zera o registro"""
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def merge(self, series: dict[tuple[str, str], StageSeries]) -> None:
+        """Soma ao registro as séries de outro processo (ver collect)"""
+        with self._lock:
+            for key, other in series.items():
+                self._series.setdefault(key, StageSeries()).add(other)
+
+    def to_prometheus(self) -> str:
+        """Registro no formato de exposição do Prometheus (textfile)"""
+        series = sorted(self.collect().items())
+        lines = [
+            "# HELP fundeb_stage_duration_seconds Duração das etapas do pipeline.",
+            "# TYPE fundeb_stage_duration_seconds histogram",
+        ]
+        for (stage, module), values in series:
+            labels = f'stage="{_escape(stage)}",module="{_escape(module)}"'
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS, values.buckets, strict=True):
+                cumulative += count
+                lines.append(
+                    f'fundeb_stage_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines += [
+                f'fundeb_stage_duration_seconds_bucket{{{labels},le="+Inf"}} '
+                f"{values.count}",
+                f"fundeb_stage_duration_seconds_sum{{{labels}}} {values.seconds:.6f}",
+                f"fundeb_stage_duration_seconds_count{{{labels}}} {values.count}",
+            ]
+
+        for name, kind, help_text, attribute in (
+            ("fundeb_stage_rows_total", "counter", "Linhas processadas.", "rows"),
+            ("fundeb_stage_bytes_total", "counter", "Bytes processados.", "bytes"),
+            ("fundeb_stage_errors_total", "counter", "Execuções com erro.", "errors"),
+            (
+                "fundeb_stage_peak_rss_bytes",
+                "gauge",
+                "Pico de RSS do processo ao fim da etapa.",
+                "peak_rss_bytes",
+            ),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for (stage, module), values in series:
+                labels = f'stage="{_escape(stage)}",module="{_escape(module)}"'
+                lines.append(f"{name}{{{labels}}} {getattr(values, attribute)}")
+
+        lines += [
+            "# HELP fundeb_metrics_timestamp_seconds Momento da exportação.",
+            "# TYPE fundeb_metrics_timestamp_seconds gauge",
+            f"fundeb_metrics_timestamp_seconds {time.time():.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_registry = MetricsRegistry()
+# Processos filhos (fork) não herdam as observações do pai: sem isso, as
+# métricas devolvidas por um worker seriam somadas duas vezes no pai
+if hasattr(os, "register_at_fork"):  # Windows: só spawn
+    os.register_at_fork(after_in_child=_registry.reset)
+
+
+def get_metrics() -> MetricsRegistry:
+    """Registro de métricas do processo"""
+    return _registry
+
+
+@dataclass
+class Stage:
+    """Etapa em execução: quem a cronometra preenche linhas e bytes."""
+
+    name: str
+    module: str = ""
+    file: str | None = None
+    rows: int = 0
+    bytes: int = 0
+
+
+@contextmanager
+def stage(
+    name: str, module: str | None = None, file_path: str | Path | None = None
+) -> Iterator[Stage]:
+    """
+    Cronometra uma etapa, registra a observação e loga uma linha JSON
+    Args:
+        name (str): Etapa (ex: 'extract', 'factory.extract_many')
+        module (str | None): Módulo do extractors.yaml (rótulo da métrica)
+        file_path (str | Path | None): Arquivo processado (só no log JSON)
+    Yields:
+        Stage: Preencha rows e bytes dentro do bloco
+
+    Exemplo:
+        with stage("extract", "conta_corrente", path) as current:
+            df = extractor.extract(path)
+            current.rows = len(df)
+    """
+    current = Stage(name, module or "", Path(file_path).name if file_path else None)
+    ok = True
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        _record(current, time.perf_counter() - start, ok)
+
+
+class StageParts:
+    """
+    Etapa executada em trechos (ex: bloco a bloco): soma o tempo de cada
+    trecho e é registrada uma única vez, ao fim (ver stage_parts).
+    """
+
+    def __init__(self, current: Stage):
+        self.current = current
+        self.seconds = 0.0
+        self.ok = True
+        self.ran = False
+
+    @contextmanager
+    def part(self) -> Iterator[Stage]:
+        """Cronometra um trecho da etapa (preencha rows e bytes no bloco)"""
+        self.ran = True
+        start = time.perf_counter()
+        try:
+            yield self.current
+        except BaseException:
+            self.ok = False
+            raise
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def merge(self, other: "StageParts") -> None:
+        """Soma os trechos da mesma etapa cronometrados em outro processo"""
+        self.seconds += other.seconds
+        self.ok = self.ok and other.ok
+        self.ran = self.ran or other.ran
+        self.current.rows += other.current.rows
+        self.current.bytes += other.current.bytes
+
+
+@contextmanager
+def stage_parts(
+    names: list[str], module: str | None = None, file_path: str | Path | None = None
+) -> Iterator[dict[str, StageParts]]:
+    """
+    Cronometra etapas intercaladas num laço (ex: extract, validate_schema e
+    save de cada bloco de um arquivo). Cada etapa que rodou gera uma única
+    observação, com a soma dos tempos dos seus trechos
+    Args:
+        names (list[str]): Etapas (ex: ['extract', 'save'])
+        module (str | None): Módulo do extractors.yaml (rótulo da métrica)
+        file_path (str | Path | None): Arquivo processado (só no log JSON)
+    Yields:
+        dict[str, StageParts]: Etapas por nome
+
+    Exemplo:
+        with stage_parts(["extract", "save"], "conta_corrente", path) as stages:
+            for chunk in chunks:
+                with stages["save"].part() as current:
+                    writer.write_table(chunk)
+                    current.rows += len(chunk)
+    """
+    file_name = Path(file_path).name if file_path else None
+    stages = {name: StageParts(Stage(name, module or "", file_name)) for name in names}
+    try:
+        yield stages
+    finally:
+        for parts in stages.values():
+            if parts.ran:
+                _record(parts.current, parts.seconds, parts.ok)
+
+
+def _record(current: Stage, seconds: float, ok: bool) -> None:
+    """Registra uma execução de etapa no registro e no log JSON"""
+    peak_rss = peak_rss_bytes() or 0
+    _registry.observe(
+        current.name,
+        current.module,
+        seconds,
+        rows=current.rows,
+        size=current.bytes,
+        ok=ok,
+        peak_rss=peak_rss,
+    )
+    get_logger(METRICS_LOGGER_NAME).info(
+        "stage",
+        extra={
+            "metrics": {
+                "stage": current.name,
+                "module": current.module,
+                "file": current.file,
+                "status": "success" if ok else "error",
+                "seconds": round(seconds, 6),
+                "rows": current.rows,
+                "bytes": current.bytes,
+                "peak_rss_mb": round(peak_rss / (1024 * 1024), 1),
+                "pid": os.getpid(),
+            }
+        },
+    )
+
+
+def write_prometheus(path: str | Path = METRICS_TEXTFILE_PATH) -> Path:
+    """
+    Grava o registro do processo no formato textfile do node exporter
+    (tmp + rename: o coletor nunca lê um arquivo pela metade)
+    Args:
+        path (str | Path): Arquivo .prom de destino
+    Returns:
+        Path: Caminho gravado
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(_registry.to_prometheus(), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def profile_threshold() -> float | None:
+    """Limite (segundos) de FUNDEB_PROFILE_THRESHOLD, ou None se desligado"""
+    value = os.environ.get(PROFILE_THRESHOLD_ENV, "").strip()
+    return float(value) if value else None
+
+
+@contextmanager
+def profile_file(
+    file_path: str | Path,
+    module: str | None = None,
+    profiles_dir: str | Path = PROFILES_DIR,
+) -> Iterator[None]:
+    """
+    Perfila o bloco (processamento de um arquivo) se FUNDEB_PROFILE_THRESHOLD
+    estiver definido, e grava o perfil só quando o bloco passa do limite.
+    Sem a variável, não faz nada (sem custo).
+    Args:
+        file_path (str | Path): Arquivo processado (nome do perfil)
+        module (str | None): Módulo do extractors.yaml (nome do perfil)
+        profiles_dir (str | Path): Diretório dos perfis
+    """
+    threshold = profile_threshold()
+    if threshold is None:
+        yield
+        return
+
+    logger = get_logger()
+    use_pyinstrument = os.environ.get(PROFILER_ENV, "").lower() == "pyinstrument"
+    if use_pyinstrument:
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("pyinstrument não instalado; usando cProfile.")
+            use_pyinstrument = False
+    profiler = Profiler() if use_pyinstrument else cProfile.Profile()
+    try:
+        if use_pyinstrument:
+            profiler.start()
+        else:
+            profiler.enable()
+    except (RuntimeError, ValueError):
+        # Outro perfilador já ativo (ex: arquivos aninhados ou em threads)
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if use_pyinstrument:
+            profiler.stop()
+        else:
+            profiler.disable()
+        seconds = time.perf_counter() - start
+        if seconds >= threshold:
+            output_path = _profile_path(profiles_dir, file_path, module)
+            if use_pyinstrument:
+                output_path = output_path.with_suffix(".html")
+                output_path.write_text(profiler.output_html(), encoding="utf-8")
+            else:
+                profiler.dump_stats(output_path)
+                summary = io.StringIO()
+                stats = pstats.Stats(profiler, stream=summary)
+                stats.sort_stats("cumulative").print_stats(30)
+                output_path.with_suffix(".txt").write_text(
+                    summary.getvalue(), encoding="utf-8"
+                )
+            logger.warning(
+                f"{Path(file_path).name} levou {seconds:.2f}s "
+                f"(limite {threshold:.2f}s): perfil em {output_path}"
+            )
+
+
+def _profile_path(
+    profiles_dir: str | Path, file_path: str | Path, module: str | None
+) -> Path:
+    profiles_dir = Path(profiles_dir)
+    profiles_dir.mkdir(parents=True, exist_ok=True)
+    name = re.sub(r"[^\w.-]", "_", f"{module or 'arquivo'}_{Path(file_path).stem}")
+    return profiles_dir / f"{name}_{datetime.now():%Y%m%d_%H%M%S_%f}.prof"
@@ -0,0 +1,137 @@
+"""
+Publicação de PDFs (ex: RREO do SIOPE) pelo servidor de arquivos estáticos
+do Streamlit (server.enableStaticServing).
+
+Em vez de embutir o PDF em base64 no HTML a cada rerun, o arquivo é
+publicado uma única vez em APP_STATIC_DIR (link físico, sem cópia quando
+possível) e servido em app/static/...: o Tornado responde com ETag e
+Last-Modified (304 nas revisitas) e aceita requisições Range, então o leitor
+de PDF do navegador baixa só as páginas exibidas. As miniaturas de cada
+página são renderizadas uma vez e reaproveitadas por todos os usuários.
+
+Cada publicação se chama <origem>_<versão>.pdf: uma nova versão do mesmo
+PDF (outro tamanho ou mtime) substitui as anteriores, que são removidas com
+as suas miniaturas.
+"""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from urllib.parse import quote
+
+from fundeb.config.settings import APP_STATIC_DIR
+
+# URL base do servidor estático do Streamlit (relativa à página)
+STATIC_URL_PREFIX = "app/static"
+
+
+def _source_key(pdf_path: Path) -> str:
+    """Chave do PDF de origem (caminho), a mesma em todas as versões"""
+    return hashlib.sha256(pdf_path.resolve().as_posix().encode()).hexdigest()[:16]
+
+
+def _publication_key(pdf_path: Path) -> str:
+    """Chave estável enquanto o arquivo não mudar (origem, tamanho, mtime)"""
+    stat = pdf_path.stat()
+    version = f"{stat.st_size}|{stat.st_mtime_ns}"
+    version_key = hashlib.sha256(version.encode()).hexdigest()[:16]
+    return f"{_source_key(pdf_path)}_{version_key}"
+
+
+def static_url(path: str | Path, static_dir: str | Path = APP_STATIC_DIR) -> str:
+    """
+    URL de um arquivo publicado em APP_STATIC_DIR
+    Args:
+        path (str | Path): Arquivo dentro de static_dir
+        static_dir (str | Path): Diretório servido pelo Streamlit
+    Returns:
+        str: URL relativa (ex: 'app/static/siope/3f2a.pdf')
+    """
+    relative = Path(path).resolve().relative_to(Path(static_dir).resolve())
+    return f"{STATIC_URL_PREFIX}/{quote(relative.as_posix())}"
+
+
+def publish_pdf(
+    pdf_path: str | Path,
+    static_dir: str | Path = APP_STATIC_DIR,
+    subdir: str = "pdf",
+) -> Path:
+    """
+    Publica um PDF no diretório estático (apenas na primeira chamada) e
+    remove as publicações de versões anteriores do mesmo PDF
+    Args:
+        pdf_path (str | Path): PDF de origem
+        static_dir (str | Path): Diretório servido pelo Streamlit
+        subdir (str): Subdiretório de publicação
+    Returns:
+        Path: Caminho do PDF publicado
+    Raises:
+        FileNotFoundError: PDF de origem não encontrado
+    """
+    pdf_path = Path(pdf_path)
+    target_dir = Path(static_dir) / subdir
+    target = target_dir / f"{_publication_key(pdf_path)}.pdf"
+    if target.exists():
+        return target
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        try:
+            # Link físico: nenhum byte copiado (mesmo sistema de arquivos)
+            os.link(pdf_path, tmp_path)
+        except OSError:
+            shutil.copyfile(pdf_path, tmp_path)
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    # Versões anteriores do mesmo PDF (e as suas miniaturas)
+    for previous in target_dir.glob(f"{_source_key(pdf_path)}_*.pdf"):
+        if previous != target:
+            previous.unlink(missing_ok=True)
+            shutil.rmtree(previous.with_suffix(""), ignore_errors=True)
+    return target
+
+
+def render_thumbnails(published_pdf: str | Path, width: int = 160) -> list[Path]:
+    """
+    Renderiza (uma única vez) uma miniatura PNG por página do PDF publicado
+    Args:
+        published_pdf (str | Path): PDF devolvido por publish_pdf
+        width (int): Largura das miniaturas em pixels
+    Returns:
+        list[Path]: Miniaturas, na ordem das páginas ([] sem o pypdfium2)
+    """
+    published_pdf = Path(published_pdf)
+    thumbs_dir = published_pdf.with_suffix("")
+    done_marker = thumbs_dir / f".done_{width}"
+    if done_marker.exists():
+        return sorted(thumbs_dir.glob(f"page_*_{width}.png"))
+
+    try:
+        # Dependência do camelot-py; opcional para esta função
+        import pypdfium2 as pdfium
+    except ImportError:
+        return []
+
+    thumbs_dir.mkdir(parents=True, exist_ok=True)
+    thumbnails = []
+    pdf = pdfium.PdfDocument(str(published_pdf))
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            thumbnail = thumbs_dir / f"page_{index + 1:04d}_{width}.png"
+            if not thumbnail.exists():
+                image = page.render(scale=width / page.get_width()).to_pil()
+                tmp_path = thumbnail.with_name(f".{thumbnail.name}.{os.getpid()}")
+                image.save(tmp_path, format="PNG", optimize=True)
+                os.replace(tmp_path, thumbnail)
+            page.close()
+            thumbnails.append(thumbnail)
+    finally:
+        pdf.close()
+
+    done_marker.touch()
+    return thumbnails
@@ -0,0 +1,228 @@
+"""
+Validação declarativa de schema, vetorizada (sem loops por linha).
+
+O schema de cada módulo fica no extractors.yaml (chave 'schema') e é
+avaliado com operações de coluna do pandas/NumPy sobre o DataFrame inteiro
+(ou bloco a bloco, no modo streaming). O resultado é um relatório compacto
+com uma entrada por regra violada: contagem e algumas linhas de exemplo.
+
+    schema:
+      on_violation: raise          # raise | warn
+      columns:
+        D_C: {dtype: string, nullable: false, isin: [C, D]}
+        VALOR: {dtype: float, nullable: false, gt: 0}
+        DT_LANCAMENTO: {dtype: datetime, between: [DATA_INICIO, DATA_FIM]}
+      balance:                     # saldo inicial + lançamentos = saldo final
+        group_by: [BANCO, AGENCIA, CONTA, DATA_INICIO]
+        opening: SALDO_ANTERIOR_CC
+        closing: SALDO_ATUAL_CC
+        amount: VALOR
+        sign: D_C                  # C soma, D subtrai
+        tolerance: 0.01
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from pandas.api import types
+
+# dtype declarado no YAML -> verificação do dtype do pandas (inclui ArrowDtype)
+DTYPE_CHECKS = {
+    "string": lambda dtype: (
+        types.is_string_dtype(dtype) or types.is_object_dtype(dtype)
+    ),
+    "float": types.is_float_dtype,
+    "int": types.is_integer_dtype,
+    "numeric": types.is_numeric_dtype,
+    "datetime": types.is_datetime64_any_dtype,
+    "bool": types.is_bool_dtype,
+}
+
+# Linhas de exemplo guardadas por violação
+MAX_EXAMPLES = 5
+
+
+@dataclass
+class Violation:
+    """Uma regra violada: quantas linhas e alguns exemplos (índices)."""
+
+    rule: str
+    column: str
+    count: int
+    examples: list[Any] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return f"{self.column}: {self.rule} ({self.count} linhas, ex: {self.examples})"
+
+
+@dataclass
+class ValidationReport:
+    """Relatório compacto de uma validação."""
+
+    rows: int = 0
+    violations: list[Violation] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def __str__(self) -> str:
+        if self.ok:
+            return f"Schema válido ({self.rows} linhas)."
+        lines = "".join(f"\n  {violation}" for violation in self.violations)
+        return (
+            f"{len(self.violations)} regra(s) violada(s) em {self.rows} linhas:{lines}"
+        )
+
+
+class SchemaValidator:
+    """
+    Avalia o schema declarado de um módulo. Para validar em blocos:
+    begin(), check(bloco) para cada bloco e end(), que devolve o relatório
+    (a regra de saldo só é avaliada no fim, com todos os blocos somados).
+    """
+
+    def __init__(self, schema: dict[str, Any]):
+        self.columns: dict[str, dict[str, Any]] = schema.get("columns", {})
+        self.balance: dict[str, Any] | None = schema.get("balance")
+        self.on_violation: str = schema.get("on_violation", "raise")
+        self.begin()
+
+    def begin(self) -> None:
+        """Reinicia o estado para validar um novo arquivo"""
+        self.report = ValidationReport()
+        self._balance_parts: list[pd.DataFrame] = []
+
+    def _add(self, rule: str, column: str, mask: np.ndarray, index: pd.Index) -> None:
+        """Registra (ou acumula) uma violação a partir de uma máscara booleana"""
+        count = int(mask.sum())
+        if not count:
+            return
+        examples = index[mask][:MAX_EXAMPLES].tolist()
+        for violation in self.report.violations:
+            if violation.rule == rule and violation.column == column:
+                violation.count += count
+                room = MAX_EXAMPLES - len(violation.examples)
+                violation.examples.extend(examples[:room])
+                return
+        self.report.violations.append(Violation(rule, column, count, examples))
+
+    def _add_column_rule(self, rule: str, column: str) -> None:
+        """Registra uma violação da coluna inteira (ausente, dtype)"""
+        self._add(rule, column, np.ones(1, bool), pd.Index([column]))
+
+    def check(self, df: pd.DataFrame) -> None:
+        """
+        Avalia as regras de coluna num DataFrame (ou bloco) inteiro
+        Args:
+            df (pd.DataFrame): Dados extraídos (antes dos metadados)
+        """
+        self.report.rows += len(df)
+        for column, rules in self.columns.items():
+            if column not in df.columns:
+                if rules.get("required", True):
+                    self._add_column_rule("coluna ausente", column)
+                continue
+            series = df[column]
+
+            dtype = rules.get("dtype")
+            if dtype and not DTYPE_CHECKS[dtype](series.dtype):
+                self._add_column_rule(f"dtype {series.dtype} != {dtype}", column)
+
+            null = series.isna().to_numpy()
+            if not rules.get("nullable", True):
+                self._add("nulo", column, null, df.index)
+            self._check_values(df, column, rules, valid=~null)
+
+        if self.balance:
+            self._accumulate_balance(df)
+
+    def _check_values(
+        self, df: pd.DataFrame, column: str, rules: dict[str, Any], valid: np.ndarray
+    ) -> None:
+        """Regras de valor de uma coluna (ignoram nulos, cobertos por 'nullable')"""
+        series = df[column]
+        if "isin" in rules:
+            allowed = series.isin(rules["isin"]).to_numpy()
+            self._add(f"fora de {rules['isin']}", column, valid & ~allowed, df.index)
+        if "gt" in rules:
+            above = (series > rules["gt"]).fillna(False).to_numpy(bool)
+            self._add(f"<= {rules['gt']}", column, valid & ~above, df.index)
+        if "ge" in rules:
+            above = (series >= rules["ge"]).fillna(False).to_numpy(bool)
+            self._add(f"< {rules['ge']}", column, valid & ~above, df.index)
+        if "between" in rules:
+            low, high = (df[bound] for bound in rules["between"])
+            inside = ((series >= low) & (series <= high)).fillna(False)
+            self._add(
+                f"fora de [{', '.join(rules['between'])}]",
+                column,
+                valid & ~inside.to_numpy(bool),
+                df.index,
+            )
+
+    def _accumulate_balance(self, df: pd.DataFrame) -> None:
+        """
+        Soma parcial dos lançamentos (com sinal) por grupo do bloco. Os grupos
+        são códigos inteiros (factorize) e as somas saem de um np.bincount:
+        bem mais barato que um groupby sobre colunas de texto.
+        """
+        rules = self.balance
+        keys = list(rules["group_by"])
+        # Em lote (vários arquivos concatenados), cada arquivo é um extrato
+        if "file_name" in df.columns and "file_name" not in keys:
+            keys.append("file_name")
+        combined = np.zeros(len(df), dtype=np.int64)
+        for key in keys:
+            codes, uniques = pd.factorize(df[key], use_na_sentinel=False)
+            combined = combined * len(uniques) + codes
+        group_codes, groups = pd.factorize(combined)
+
+        signs = np.where(df[rules["sign"]].to_numpy() == "D", -1.0, 1.0)
+        amounts = df[rules["amount"]].to_numpy(dtype="float64") * signs
+        # Índice da 1ª linha de cada grupo (a última atribuição vence)
+        first = np.empty(len(groups), dtype=np.int64)
+        first[group_codes[::-1]] = np.arange(len(df))[::-1]
+
+        part = df[keys].iloc[first].reset_index(drop=True)
+        part["_movement"] = np.bincount(
+            group_codes, weights=amounts, minlength=len(groups)
+        )
+        part["_opening"] = df[rules["opening"]].to_numpy()[first]
+        part["_closing"] = df[rules["closing"]].to_numpy()[first]
+        self._balance_parts.append(part)
+
+    def end(self) -> ValidationReport:
+        """
+        Conclui a validação (regra de saldo) e devolve o relatório
+        Returns:
+            ValidationReport: Violações encontradas em todos os blocos
+        """
+        if self._balance_parts:
+            rules = self.balance
+            parts = pd.concat(self._balance_parts)
+            keys = [column for column in parts.columns if not column.startswith("_")]
+            # Junta os grupos de todos os blocos (poucas linhas por arquivo)
+            totals = parts.groupby(keys, sort=False, dropna=False, observed=True).agg(
+                _movement=("_movement", "sum"),
+                _opening=("_opening", "first"),
+                _closing=("_closing", "first"),
+            )
+            difference = totals["_opening"] + totals["_movement"] - totals["_closing"]
+            mismatch = (difference.abs() > rules.get("tolerance", 0.01)).to_numpy()
+            self._add(
+                f"{rules['opening']} + lançamentos != {rules['closing']}",
+                rules["amount"],
+                mismatch,
+                totals.index,
+            )
+            self._balance_parts = []
+        return self.report
+
+    def validate(self, df: pd.DataFrame) -> ValidationReport:
+        """Valida um DataFrame completo em uma chamada (begin + check + end)"""
+        self.begin()
+        self.check(df)
+        return self.end()
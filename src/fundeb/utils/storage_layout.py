@@ -0,0 +1,141 @@
+"""
+Layout de armazenamento compacto: dimensão do extrato + fatos estreitos.
+
+Em extratos como os do Banco do Brasil, cada linha repete os dados da conta
+(endereço, titular, responsável) e os saldos do período, e add_metadata
+acrescenta os metadados do arquivo como colunas inteiras. Com a chave
+'layout' do módulo no extractors.yaml, essas colunas vão para uma dimensão
+(uma linha por extrato) e a Bronze guarda só os lançamentos com a chave do
+extrato. As colunas de baixa cardinalidade viram categóricas em memória e
+colunas de dicionário (índices int32) no parquet:
+
+    layout:
+      dimension: conta_corrente_extratos   # bronze.<dimension> no warehouse
+      key: [UF, BANCO, AGENCIA, CONTA, DATA_INICIO]
+      columns: [ENDERECO_AGENCIA, NOME_TITURAL, SALDO_ATUAL_TOTAL, ...]
+      categorical: [BANCO, AGENCIA, CONTA, UF, HISTORICO_FINALIDADE, D_C]
+"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Metadados constantes por arquivo (add_metadata): vão para a dimensão.
+# 'file_name' fica nas duas tabelas (chave da recarga no warehouse).
+FILE_METADATA_COLUMNS = ["file_mb_size", "last_modified_time", "processing_time"]
+
+# Tipo das colunas de dicionário: o mesmo em todos os blocos de um parquet
+DICTIONARY_INDEX_TYPE = pa.int32()
+
+
+class StorageLayout:
+    """Separa dimensão e fatos e codifica as colunas categóricas."""
+
+    def __init__(self, layout: dict[str, Any]):
+        self.dimension: str = layout["dimension"]
+        self.key: list[str] = list(layout["key"])
+        self.columns: list[str] = list(layout.get("columns", []))
+        self.categorical: list[str] = list(layout.get("categorical", []))
+
+    def dimension_path(self, output_path: str | Path) -> Path:
+        """
+        Parquet da dimensão correspondente a um parquet de fatos
+        Args:
+            output_path (str | Path): Parquet de fatos (ex: bronze/x.parquet)
+        Returns:
+            Path: Ex: bronze/conta_corrente_extratos/x.parquet
+        """
+        output_path = Path(output_path)
+        return output_path.parent / self.dimension / output_path.name
+
+    def split(self, df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Separa um bloco (já com metadados) em fatos e dimensão
+        Args:
+            df (pd.DataFrame): Bloco extraído, no layout original
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame]: (fatos, dimensão do bloco)
+        """
+        key = [column for column in ["file_name", *self.key] if column in df.columns]
+        moved = [
+            column
+            for column in [*self.columns, *FILE_METADATA_COLUMNS]
+            if column in df.columns and column not in key
+        ]
+        dimension = df[key + moved].drop_duplicates(subset=key, ignore_index=True)
+        facts = df.drop(columns=moved)
+        return facts, dimension
+
+    def write_dimension(
+        self, parts: list[pd.DataFrame], dimension_path: str | Path
+    ) -> int:
+        """
+        Grava a dimensão de um arquivo (uma linha por chave) em parquet
+        Args:
+            parts (list[pd.DataFrame]): Dimensões dos blocos (ver split)
+            dimension_path (str | Path): Parquet de destino
+        Returns:
+            int: Número de linhas da dimensão
+        """
+        key = [column for column in ["file_name", *self.key] if column in parts[0]]
+        dimension = pd.concat(parts, ignore_index=True).drop_duplicates(
+            subset=key, ignore_index=True
+        )
+        table = self.encode(pa.Table.from_pandas(dimension, preserve_index=False))
+
+        dimension_path = Path(dimension_path)
+        dimension_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dimension_path.with_name(f".{dimension_path.name}.tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, dimension_path)
+        return len(dimension)
+
+    def categorize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converte as colunas categóricas (e as de texto da dimensão) de um
+        DataFrame em memória para o dtype 'category'
+        Args:
+            df (pd.DataFrame): DataFrame extraído
+        Returns:
+            pd.DataFrame: O mesmo DataFrame, com as colunas convertidas
+        """
+        text_columns = [
+            column
+            for column in self.columns
+            if column in df.columns
+            and (
+                pd.api.types.is_string_dtype(df[column])
+                or pd.api.types.is_object_dtype(df[column])
+            )
+        ]
+        for column in dict.fromkeys([*self.categorical, *text_columns, "file_name"]):
+            if column in df.columns:
+                df[column] = df[column].astype("category")
+        return df
+
+    def encode(self, table: pa.Table) -> pa.Table:
+        """
+        Codifica como dicionário as colunas categóricas de um bloco Arrow
+        Args:
+            table (pa.Table): Bloco a gravar no parquet
+        Returns:
+            pa.Table: Bloco com colunas dictionary<int32, valor>
+        """
+        for column in dict.fromkeys([*self.categorical, "file_name"]):
+            index = table.schema.get_field_index(column)
+            if index < 0:
+                continue
+            array = table.column(index)
+            if pa.types.is_dictionary(array.type):
+                array = array.cast(
+                    pa.dictionary(DICTIONARY_INDEX_TYPE, array.type.value_type)
+                )
+            else:
+                array = pc.dictionary_encode(array)
+            table = table.set_column(index, column, array)
+        return table
@@ -0,0 +1,41 @@
+"""
+Orçamento de importação (cold import) de settings, logger e factory.
+
+Cada módulo é importado num interpretador novo (ver
+benchmarks/bench_import_time.py, que define os orçamentos e a medição).
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+BENCH_PATH = Path(__file__).resolve().parents[1] / "benchmarks" / "bench_import_time.py"
+REPEAT = 3
+
+
+def _load_bench():
+    spec = importlib.util.spec_from_file_location("bench_import_time", BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = _load_bench()
+
+
+@pytest.mark.parametrize("module", list(bench.BUDGETS_MS))
+def test_cold_import_within_budget(module):
+    runs = [bench.measure(module) for _ in range(REPEAT)]
+    budget = bench.BUDGETS_MS[module]
+
+    assert min(run["total"] for run in runs) <= budget["total"]
+    assert min(run["own"] for run in runs) <= budget["own"]
+
+
+@pytest.mark.parametrize("module", list(bench.BUDGETS_MS))
+def test_import_has_no_side_effects(module):
+    run = bench.measure(module)
+
+    assert run["handlers"] == 0, "a importação configurou o logging"
+    assert run["created_dirs"] == [], "a importação criou diretórios de dados"